@@ -0,0 +1,237 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr
+
+from bootstrap import intervalo_bootstrap, media as est_media, mediana as est_mediana, iqr as est_iqr, pearson
+from contingencia import TabelaContingencia
+from correlacao import MatrizCorrelacao
+from descricao import descrever_colunas
+from compacto import para_float64
+from entrada import ler_excel
+from influencia import influencia
+from momentos import Momentos
+from monte_carlo import qui_quadrado_monte_carlo
+from quantis import Quantis
+
+# --- Análises como Funções ---
+# As análises de c3e12, c3e13, c4e10, c4e15 e c4e16 divididas em três partes,
+# para que um processo de longa duração (servico.py) reaproveite o trabalho:
+#   ler(caminho)                 DataFrame do arquivo, com a mesma leitura do script
+#   resumir(df)                  o cálculo caro, que só depende dos dados
+#                                (momentos e quantis, tabela e Qui-Quadrado,
+#                                matriz de correlação, tabela de influência)
+#   responder(resumo, df, ...)   a resposta para os parâmetros da consulta
+#                                (alpha, pares, outlier removido, ...), barata
+# As respostas são dicionários com números e listas simples (serializáveis em JSON).
+
+Analise = namedtuple('Analise', 'arquivo ler resumir responder')
+
+
+def _intervalo(dados, estatistica, reamostras, nivel, semente):
+    ic = intervalo_bootstrap(dados, estatistica, reamostras=reamostras, nivel=nivel, semente=semente)
+    return {'inferior': ic.inferior, 'superior': ic.superior, 'metodo': ic.metodo, 'reamostras': ic.reamostras}
+
+
+# --- c3e12: tempos de desidratação ---
+
+def ler_desidratacao(caminho):
+    return ler_excel(caminho, colunas=[0], numericas=[0], dropna=[0])
+
+
+def resumir_desidratacao(df):
+    # Sem conversão: no modo compacto (ver entrada.py) os valores continuam float32
+    valores = df.iloc[:, 0].to_numpy()
+    if valores.size == 0:
+        raise ValueError("Nenhum dado numérico foi encontrado na coluna principal.")
+    modas = pd.Series(valores).mode()
+    return {
+        'valores': valores,
+        'momentos': Momentos.de_array(valores),
+        'quantis': Quantis(valores),
+        'moda': para_float64(modas).tolist() if len(modas) < valores.size else [],
+    }
+
+
+def desidratacao(resumo, df, quantis=(0.10, 0.90, 0.30, 0.60), fator_iqr=1.5, reamostras=0, nivel=0.95, semente=0):
+    """Medidas de posição, dispersão e forma; `reamostras` > 0 inclui ICs bootstrap BCa."""
+    valores, momentos = resumo['valores'], resumo['momentos']
+    q1, q3, iqr, limite_inferior, limite_superior = resumo['quantis'].cercas(fator_iqr)
+    media = momentos.media
+    resposta = {
+        'n': momentos.n,
+        'media': media,
+        'mediana': resumo['quantis'].mediana(),
+        'moda': resumo['moda'],
+        'q1': q1, 'q3': q3, 'iqr': iqr,
+        'limite_inferior': limite_inferior, 'limite_superior': limite_superior,
+        'outliers': para_float64(np.sort(valores[(valores < limite_inferior) | (valores > limite_superior)])).tolist(),
+        'quantis': dict(zip(map(str, quantis), resumo['quantis'].quantil(list(quantis)))),
+        'amplitude': momentos.amplitude,
+        'desvio_medio_abs': np.abs(para_float64(valores) - media).mean(),
+        'variancia': momentos.variancia(ddof=1),
+        'desvio_padrao': momentos.desvio_padrao(ddof=1),
+        'erro_padrao': momentos.erro_padrao(ddof=1),
+        'coef_variacao': momentos.coef_variacao(ddof=1),
+        'assimetria': momentos.assimetria(),
+        'curtose': momentos.curtose(),
+    }
+    if reamostras:
+        resposta['intervalos'] = {nome: _intervalo(valores, estatistica, reamostras, nivel, semente)
+                                  for nome, estatistica in (('media', est_media), ('mediana', est_mediana),
+                                                            ('iqr', est_iqr))}
+    return resposta
+
+
+# --- c3e13: tempos de atendimento por serviço ---
+
+def ler_servicos(caminho):
+    return ler_excel(caminho, numericas=True, dropna=True)
+
+
+def resumir_servicos(df):
+    return descrever_colunas(df)
+
+
+def servicos(resumo, df, servicos=None, fator_iqr=1.5, reamostras=0, nivel=0.95, semente=0):
+    """Resumo por serviço (todos, ou os listados); `reamostras` > 0 inclui o IC da média."""
+    if fator_iqr != 1.5:
+        resumo = descrever_colunas(df, fator_iqr)
+    nomes = list(resumo.index) if servicos is None else list(servicos)
+    desconhecidos = [nome for nome in nomes if nome not in resumo.index]
+    if desconhecidos:
+        raise ValueError(f"Serviço(s) inexistente(s): {', '.join(map(str, desconhecidos))}.")
+    resposta = {}
+    for nome in nomes:
+        linha = resumo.loc[nome].to_dict()
+        dados = df[nome].to_numpy()
+        fora = (dados < linha['limite_inferior']) | (dados > linha['limite_superior'])
+        linha['outliers'] = para_float64(dados[fora]).tolist()
+        if reamostras:
+            linha['ic_media'] = _intervalo(dados, est_media, reamostras, nivel, semente)
+        resposta[str(nome)] = linha
+    return resposta
+
+
+# --- c4e10: faixa etária x inadimplência ---
+
+MAPA_IDADE = {1: 'Até 20 anos', 2: '21 a 30 anos', 3: '31 a 40 anos', 4: '41 a 50 anos', 5: '51 a 60 anos',
+              6: 'Acima de 60 anos'}
+MAPA_INADIMPLENCIA = {1: 'Não tem dívidas', 2: 'Pouco Endividado', 3: 'Mais ou menos Endividado',
+                      4: 'Muito Endividado'}
+
+
+def ler_inadimplencia(caminho):
+    df = ler_excel(caminho, colunas=[0, 1], numericas=[0, 1], dropna=[0, 1], tipos={0: 'int8', 1: 'int8'})
+    df.columns = ['Faixa_Etaria_Num', 'Inadimplencia_Num']
+    return df
+
+
+def resumir_inadimplencia(df):
+    tabela = TabelaContingencia.de_codigos(
+        df['Faixa_Etaria_Num'].to_numpy(), df['Inadimplencia_Num'].to_numpy(), list(MAPA_IDADE),
+        list(MAPA_INADIMPLENCIA), rotulos_linha=list(MAPA_IDADE.values()),
+        rotulos_coluna=list(MAPA_INADIMPLENCIA.values()), nome_linhas='Faixa Etária', nome_colunas='Inadimplência',
+    )
+    return {'tabela': tabela, 'qui_quadrado': tabela.qui_quadrado()}
+
+
+def inadimplencia(resumo, df, alpha=0.05, tabelas=False, replicas=0, semente=0):
+    """Teste Qui-Quadrado e V de Cramér; `tabelas` inclui as tabelas conjuntas, `replicas` o p de Monte Carlo."""
+    tabela = resumo['tabela']
+    chi2, p_valor, dof, esperadas = resumo['qui_quadrado']
+    resposta = {
+        'n': int(tabela.total),
+        'qui_quadrado': chi2,
+        'dof': dof,
+        'p_valor': p_valor,
+        'alpha': alpha,
+        'rejeita_h0': bool(p_valor < alpha),
+        'v_cramer': float(np.sqrt(chi2 / (tabela.total * (min(tabela.observadas.shape) - 1)))),
+    }
+    if tabelas:
+        resposta['tabelas'] = {nome: tabela.quadro(matriz).to_dict(orient='index') for nome, matriz in (
+            ('observadas', tabela.observadas), ('rel_total', tabela.rel_total), ('rel_linha', tabela.rel_linha),
+            ('rel_coluna', tabela.rel_coluna), ('esperadas', esperadas))}
+    if replicas:
+        monte_carlo = qui_quadrado_monte_carlo(tabela.observadas, replicas=replicas, semente=semente)
+        resposta['monte_carlo'] = {'p_valor': monte_carlo.p_valor, 'erro_padrao': monte_carlo.erro_padrao,
+                                   'replicas': monte_carlo.replicas}
+    return resposta
+
+
+# --- c4e15: correlação entre as notas das disciplinas ---
+
+DISCIPLINAS = ['Pesquisa Operacional', 'Estatística', 'Gestão de Operações', 'Finanças']
+
+
+def ler_notas(caminho):
+    df = ler_excel(caminho, colunas=[0, 1, 2, 3, 4], numericas=[1, 2, 3, 4], dropna=[1, 2, 3, 4],
+                   tipos={1: 'float32', 2: 'float32', 3: 'float32', 4: 'float32'}, engine="calamine")
+    df.columns = ['Nome'] + DISCIPLINAS
+    return df
+
+
+def resumir_notas(df):
+    return MatrizCorrelacao(df[DISCIPLINAS])
+
+
+def notas(resumo, df, alpha=0.05, pares=None, reamostras=0, nivel=0.95, semente=0):
+    """Correlação de Pearson de todos os pares (ou dos `pares` [[x, y], ...]) com p-valor e interpretação."""
+    tabela = resumo.pares(alpha=alpha)
+    if pares is not None:
+        pedidos = {frozenset(par) for par in pares}
+        tabela = tabela[[frozenset((x, y)) in pedidos for x, y in zip(tabela['var_x'], tabela['var_y'])]]
+    resposta = tabela.to_dict(orient='records')
+    if reamostras:
+        for par in resposta:
+            dados = (df[par['var_x']].to_numpy(np.float64), df[par['var_y']].to_numpy(np.float64))
+            par['ic_r'] = _intervalo(dados, pearson, reamostras, nivel, semente)
+    return resposta
+
+
+# --- c4e16: faturamento x número de lojas dos supermercados ---
+
+def ler_supermercados(caminho):
+    return ler_excel(caminho, colunas=['Empresa', 'Faturamento', 'Lojas'], tipos={'Lojas': 'int32'},
+                     engine="calamine", limpar_nomes=True,
+                     numericas=['Faturamento', 'Lojas'], dropna=['Faturamento', 'Lojas'])
+
+
+def resumir_supermercados(df):
+    r, p_valor = pearsonr(df['Faturamento'], df['Lojas'])
+    tabela = influencia(df['Lojas'], df['Faturamento'], rotulos=df['Empresa'].to_numpy())
+    return {'r': r, 'p_valor': p_valor, 'influencia': tabela}
+
+
+def supermercados(resumo, df, remover=None, k=3):
+    """Correlação com todos os dados e sem um supermercado (padrão: o mais influente, ver influencia.py)."""
+    tabela = resumo['influencia']
+    posicao = 0
+    if remover is not None:
+        posicoes = np.flatnonzero(tabela.index == remover)
+        if posicoes.size == 0:
+            raise ValueError(f"Empresa '{remover}' não encontrada.")
+        if posicoes.size > 1:
+            raise ValueError(f"Há {posicoes.size} linhas da empresa '{remover}'; o nome não identifica uma só.")
+        posicao = posicoes[0]
+    return {
+        'r': resumo['r'],
+        'p_valor': resumo['p_valor'],
+        'removido': tabela.index[posicao],
+        'r_sem': tabela['r_sem'].iloc[posicao],
+        'mais_influentes': tabela.head(k).reset_index(names='Empresa').to_dict(orient='records'),
+    }
+
+
+ANALISES = {
+    'c3e12': Analise('/Users/plgandini/Coding/UFABC/EASG/Desidratação.xls', ler_desidratacao,
+                     resumir_desidratacao, desidratacao),
+    'c3e13': Analise('/Users/plgandini/Coding/UFABC/EASG/Serviços.xls', ler_servicos, resumir_servicos, servicos),
+    'c4e10': Analise('/Users/plgandini/Coding/UFABC/EASG/Inadimplência.xlsx', ler_inadimplencia,
+                     resumir_inadimplencia, inadimplencia),
+    'c4e15': Analise('/Users/plgandini/Coding/UFABC/EASG/Avaliação_Alunos.xlsx', ler_notas, resumir_notas, notas),
+    'c4e16': Analise('/Users/plgandini/Coding/UFABC/EASG/Supermercados_Brasileiros.xlsx', ler_supermercados,
+                     resumir_supermercados, supermercados),
+}
@@ -0,0 +1,197 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [DIRETORIO, os.path.dirname(DIRETORIO)]
+
+from instrumentacao import pico_rss_mb, zerar_pico_rss  # noqa: E402
+from nucleos import NUCLEOS  # noqa: E402
+
+# --- Suíte de Medição dos Núcleos de Análise ---
+# Cada combinação (núcleo, tamanho) roda num processo Python novo, para que o
+# pico de memória de uma não contamine a outra. Por etapa são medidos:
+#   segundos      tempo de relógio (perf_counter)
+#   pico_rss_mb   pico de memória residente do processo durante a etapa
+#                 (VmHWM, zerado antes da etapa via /proc/self/clear_refs;
+#                 sem isso, ru_maxrss, que é o pico desde o início do processo)
+#   alocado_mb    pico de memória alocada pela etapa (tracemalloc; NumPy e
+#                 pandas registram suas alocações nele)
+#
+# Uso:
+#   python benchmarks/executar.py                          # tamanhos 10^3..10^6
+#   python benchmarks/executar.py --tamanhos 1e3 1e8 --nucleos frequencias,contingencia
+#   python benchmarks/executar.py --referencia             # inclui pandas/SciPy
+#   python benchmarks/executar.py --base benchmarks/base.json   # compara com a base
+#   python benchmarks/executar.py --gravar-base benchmarks/base.json
+#
+# O rastreamento do tracemalloc deixa as etapas mais lentas; use --sem-alocacoes
+# para medir só o tempo e o pico de RSS.
+
+TAMANHOS_PADRAO = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+TOLERANCIA = 1.5
+TEMPO_MINIMO = 0.005  # etapas mais rápidas que isso não entram na comparação (ruído)
+
+
+# --- Medição dentro do processo ---
+
+class Medidor:
+    """Mede as etapas de um núcleo; `etapa(nome)` é passado ao núcleo."""
+
+    def __init__(self, alocacoes=True):
+        self.alocacoes = alocacoes
+        self.etapas = []
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        zerado = zerar_pico_rss()
+        if self.alocacoes:
+            tracemalloc.reset_peak()
+            alocado_antes = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            registro = {'etapa': nome, 'segundos': segundos, 'pico_rss_mb': pico_rss_mb(), 'rss_zerado': zerado}
+            if self.alocacoes:
+                registro['alocado_mb'] = (tracemalloc.get_traced_memory()[1] - alocado_antes) / 2 ** 20
+            self.etapas.append(registro)
+
+
+def medir(nome, n, semente=0, referencia=False, alocacoes=True):
+    """Roda um núcleo (ou a sua referência) neste processo e devolve as medidas de cada etapa."""
+    nucleo = NUCLEOS[nome]
+    executar = nucleo.referencia if referencia else nucleo.executar
+    medidor = Medidor(alocacoes)
+    if alocacoes:
+        tracemalloc.start()
+    try:
+        executar(n, semente, medidor.etapa)
+    finally:
+        if alocacoes:
+            tracemalloc.stop()
+    return medidor.etapas
+
+
+# --- Orquestração (um subprocesso por medição) ---
+
+def _medir_em_subprocesso(nome, n, semente, referencia, alocacoes):
+    comando = [sys.executable, os.path.abspath(__file__), '--interno', nome, str(n), '--semente', str(semente)]
+    if referencia:
+        comando.append('--referencia')
+    if not alocacoes:
+        comando.append('--sem-alocacoes')
+    processo = subprocess.run(comando, capture_output=True, text=True)
+    if processo.returncode != 0:
+        erro = processo.stderr.strip().splitlines()
+        return None, erro[-1] if erro else f'código de saída {processo.returncode}'
+    return json.loads(processo.stdout.strip().splitlines()[-1]), None
+
+
+def _tamanho(texto):
+    return int(float(texto))
+
+
+def maquina():
+    return {'python': platform.python_version(), 'sistema': platform.platform(),
+            'processador': platform.processor() or platform.machine(), 'cpus': os.cpu_count()}
+
+
+def executar_suite(nomes, tamanhos, semente=0, referencia=False, alocacoes=True):
+    """Mede cada núcleo em cada tamanho (respeitando os limites); devolve uma lista de registros."""
+    resultados = []
+    implementacoes = [('projeto', False)] + ([('referencia', True)] if referencia else [])
+    for nome in nomes:
+        nucleo = NUCLEOS[nome]
+        for n in tamanhos:
+            for implementacao, e_referencia in implementacoes:
+                limite = nucleo.limite_referencia if e_referencia else nucleo.limite
+                if n > limite:
+                    continue
+                etapas, erro = _medir_em_subprocesso(nome, n, semente, e_referencia, alocacoes)
+                if erro:
+                    print(f"{nome:>18} {n:>11,} {implementacao:>10}  FALHOU: {erro}", file=sys.stderr)
+                    continue
+                for registro in etapas:
+                    registro.update(nucleo=nome, script=nucleo.script, n=n, implementacao=implementacao)
+                    resultados.append(registro)
+                    _imprimir(registro)
+    return resultados
+
+
+def _imprimir(registro):
+    alocado = f"{registro['alocado_mb']:10.1f}" if 'alocado_mb' in registro else f"{'-':>10}"
+    print(f"{registro['nucleo']:>18} {registro['n']:>11,} {registro['implementacao']:>10} "
+          f"{registro['etapa']:>13} {registro['segundos']:10.4f} {registro['pico_rss_mb']:10.1f} {alocado}")
+
+
+def _chave(registro):
+    return registro['nucleo'], registro['n'], registro['implementacao'], registro['etapa']
+
+
+def comparar(resultados, base, tolerancia=TOLERANCIA):
+    """Etapas que ficaram mais de `tolerancia` vezes mais lentas que a base: (chave, base, atual, razão)."""
+    anteriores = {_chave(registro): registro for registro in base['resultados']}
+    regressoes = []
+    for registro in resultados:
+        anterior = anteriores.get(_chave(registro))
+        if anterior is None or anterior['segundos'] < TEMPO_MINIMO:
+            continue
+        razao = registro['segundos'] / anterior['segundos']
+        if razao > tolerancia:
+            regressoes.append((_chave(registro), anterior['segundos'], registro['segundos'], razao))
+    return regressoes
+
+
+def main(argumentos=None):
+    leitor = argparse.ArgumentParser(description='Mede os núcleos de análise sobre dados sintéticos.')
+    leitor.add_argument('--tamanhos', nargs='+', type=_tamanho, default=TAMANHOS_PADRAO,
+                        help='números de registros (aceita 1e6)')
+    leitor.add_argument('--nucleos', default=','.join(NUCLEOS), help='lista separada por vírgulas')
+    leitor.add_argument('--semente', type=int, default=0)
+    leitor.add_argument('--referencia', action='store_true', help='mede também a implementação pandas/SciPy')
+    leitor.add_argument('--sem-alocacoes', action='store_true', help='não usa tracemalloc')
+    leitor.add_argument('--saida', help='grava os resultados em JSON')
+    leitor.add_argument('--gravar-base', metavar='ARQUIVO', help='grava os resultados como nova base')
+    leitor.add_argument('--base', metavar='ARQUIVO', help='compara com uma base gravada')
+    leitor.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    leitor.add_argument('--interno', nargs=2, metavar=('NUCLEO', 'N'), help=argparse.SUPPRESS)
+    opcoes = leitor.parse_args(argumentos)
+    alocacoes = not opcoes.sem_alocacoes
+
+    if opcoes.interno:
+        nome, n = opcoes.interno
+        print(json.dumps(medir(nome, int(n), opcoes.semente, opcoes.referencia, alocacoes)))
+        return 0
+
+    nomes = [nome.strip() for nome in opcoes.nucleos.split(',') if nome.strip()]
+    desconhecidos = [nome for nome in nomes if nome not in NUCLEOS]
+    if desconhecidos:
+        leitor.error(f"núcleo(s) desconhecido(s): {', '.join(desconhecidos)}. Use: {', '.join(NUCLEOS)}.")
+
+    print(f"{'núcleo':>18} {'n':>11} {'versão':>10} {'etapa':>13} {'segundos':>10} {'pico RSS':>10} {'alocado':>10}")
+    resultados = executar_suite(nomes, opcoes.tamanhos, opcoes.semente, opcoes.referencia, alocacoes)
+    documento = {'maquina': maquina(), 'semente': opcoes.semente, 'resultados': resultados}
+    for caminho in filter(None, [opcoes.saida, opcoes.gravar_base]):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(documento, arquivo, indent=1, ensure_ascii=False)
+
+    if opcoes.base:
+        with open(opcoes.base, encoding='utf-8') as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo), opcoes.tolerancia)
+        for (nome, n, implementacao, etapa), anterior, atual, razao in regressoes:
+            print(f"REGRESSÃO: {nome} n={n:,} {implementacao} {etapa}: {anterior:.4f} s -> {atual:.4f} s ({razao:.1f}x)")
+        print(f"\n{len(regressoes)} etapa(s) acima de {opcoes.tolerancia:g}x a base")
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# --- Geradores de Dados Sintéticos ---
+# Um gerador por esquema de script, sempre em blocos: cada bloco tem sua
+# semente derivada (SeedSequence), então os dados de um tamanho não dependem
+# do tamanho do bloco de leitura e o uso de memória do gerador é limitado.
+# `materializar` junta os blocos quando o núcleo precisa dos dados inteiros.
+
+TAMANHO_BLOCO = 1 << 20
+
+
+def _blocos(n, semente, gerar_bloco, tamanho_bloco=TAMANHO_BLOCO):
+    n_blocos = -(-n // tamanho_bloco)
+    for i, semente_bloco in enumerate(np.random.SeedSequence(semente).spawn(n_blocos)):
+        tamanho = min(tamanho_bloco, n - i * tamanho_bloco)
+        yield gerar_bloco(np.random.default_rng(semente_bloco), tamanho)
+
+
+def _vendas(rng, m):
+    # c3e9: vendas diárias inteiras entre 5 e 11
+    return rng.integers(5, 12, m)
+
+
+def _pesos(rng, m):
+    # c3e10: pesos de pacientes (kg), uma casa decimal
+    return np.round(rng.normal(78, 10, m), 1)
+
+
+def _tempos(rng, m):
+    # c3e12: tempos de desidratação (s), assimétricos à direita
+    return np.round(rng.gamma(4.5, 4.3, m), 1)
+
+
+def _servicos(rng, m):
+    # c3e13: tempos de atendimento (min) de três serviços
+    return np.column_stack([rng.gamma(4, 4.5, m), rng.gamma(30, 1.0, m), rng.gamma(1.5, 9.5, m)]).round(1)
+
+
+def _codigos(rng, m):
+    # c4e10/c4e12: pares de códigos int8 (6 linhas x 4 colunas) com associação moderada
+    linhas = rng.integers(1, 7, m, dtype=np.int8)
+    deslocamento = rng.integers(-1, 2, m)
+    colunas = np.clip((linhas + 1) // 2 + deslocamento, 1, 4).astype(np.int8)
+    sorteio = rng.random(m) < 0.5
+    colunas[sorteio] = rng.integers(1, 5, int(sorteio.sum()), dtype=np.int8)
+    return np.column_stack([linhas, colunas])
+
+
+def _tabelas(rng, m):
+    # c4e14: pilha de m tabelas 4 x 3 (porte x estado)
+    esperadas = np.array([[15, 10, 15], [25, 20, 10], [40, 12, 8], [30, 8, 7]], dtype=np.float64)
+    return rng.poisson(esperadas, size=(m, 4, 3))
+
+
+def _notas(rng, m):
+    # c4e15: quatro notas (0 a 10) correlacionadas, float32
+    correlacoes = np.array([[1.0, 0.7, -0.1, 0.1],
+                            [0.7, 1.0, 0.0, 0.1],
+                            [-0.1, 0.0, 1.0, 0.3],
+                            [0.1, 0.1, 0.3, 1.0]])
+    z = rng.standard_normal((m, 4)) @ np.linalg.cholesky(correlacoes).T
+    return np.clip(6.5 + 1.8 * z, 0, 10).astype(np.float32)
+
+
+def _supermercados(rng, m):
+    # c4e16: lojas (int32) e faturamento aproximadamente proporcional
+    lojas = np.maximum(1, rng.lognormal(4.5, 1.0, m)).astype(np.int32)
+    faturamento = lojas * rng.normal(25, 6, m) + rng.normal(0, 300, m)
+    return np.column_stack([lojas, faturamento])
+
+
+ESQUEMAS = {
+    'vendas': _vendas,
+    'pesos': _pesos,
+    'tempos': _tempos,
+    'servicos': _servicos,
+    'codigos': _codigos,
+    'tabelas': _tabelas,
+    'notas': _notas,
+    'supermercados': _supermercados,
+}
+
+COLUNAS = {
+    'servicos': ['Serviço A', 'Serviço B', 'Serviço C'],
+    'notas': ['Pesquisa Operacional', 'Estatística', 'Gestão de Operações', 'Finanças'],
+    'supermercados': ['Lojas', 'Faturamento'],
+}
+
+
+def gerar_blocos(esquema, n, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera os n registros do esquema em blocos (arrays NumPy)."""
+    return _blocos(n, semente, ESQUEMAS[esquema], tamanho_bloco)
+
+
+def materializar(esquema, n, semente=0):
+    """Os n registros do esquema num único array (ou DataFrame, nos esquemas com colunas nomeadas)."""
+    dados = np.concatenate(list(gerar_blocos(esquema, n, semente)))
+    if esquema in COLUNAS:
+        return pd.DataFrame(dados, columns=COLUNAS[esquema]).astype(
+            {'Lojas': 'int32'} if esquema == 'supermercados' else {})
+    return dados
@@ -0,0 +1,225 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency, pearsonr
+
+from classes import blocos_de_array, classes_em_blocos, tabela_classes
+from contingencia import TabelaContingencia, qui_quadrado_lote
+from correlacao import MatrizCorrelacao
+from descricao import descrever_colunas
+from frequencias import ContadorFrequencias
+from geradores import TAMANHO_BLOCO, gerar_blocos, materializar
+from influencia import influencia
+from momentos import Momentos
+from quantis import Quantis, SketchQuantis
+
+# --- Núcleos de Análise Medidos ---
+# Cada núcleo reproduz o cálculo de um script sobre dados sintéticos do mesmo
+# esquema, dividido em etapas (`etapa(nome)` é um gerenciador de contexto que
+# mede cada uma). A referência faz o mesmo cálculo do jeito que os scripts
+# faziam antes, com pandas/SciPy, para comparação.
+#
+# Até LIMITE_MEMORIA registros os dados são gerados antes (etapa 'gerar') e
+# lidos em blocos do array; acima disso os núcleos que trabalham em blocos
+# recebem os blocos gerados sob demanda, e o tempo de geração entra nas etapas.
+
+Nucleo = namedtuple('Nucleo', 'script executar referencia limite limite_referencia')
+
+LIMITE_MEMORIA = 10 ** 7
+
+
+def _fonte(esquema, n, semente, etapa):
+    # Função que abre um novo iterável de blocos a cada chamada
+    if n <= LIMITE_MEMORIA:
+        with etapa('gerar'):
+            dados = materializar(esquema, n, semente)
+        return lambda: blocos_de_array(dados, TAMANHO_BLOCO)
+    return lambda: gerar_blocos(esquema, n, semente)
+
+
+def _dados(esquema, n, semente, etapa):
+    with etapa('gerar'):
+        return materializar(esquema, n, semente)
+
+
+# --- c3e9: tabela de frequências ---
+
+def frequencias(n, semente, etapa):
+    abrir = _fonte('vendas', n, semente, etapa)
+    with etapa('contar'):
+        contador = ContadorFrequencias().atualizar_blocos(abrir())
+    with etapa('tabela'):
+        absolutas = contador.contagens()
+        tabela = pd.DataFrame({'fi': absolutas, 'fri': absolutas / contador.total, 'Fi': absolutas.cumsum()})
+    return tabela
+
+
+def frequencias_referencia(n, semente, etapa):
+    dados = _dados('vendas', n, semente, etapa)
+    with etapa('contar'):
+        absolutas = pd.Series(dados).value_counts().sort_index()
+    with etapa('tabela'):
+        tabela = pd.DataFrame({'fi': absolutas, 'fri': absolutas / absolutas.sum(), 'Fi': absolutas.cumsum()})
+    return tabela
+
+
+# --- c3e10: distribuição em classes ---
+
+def classes(n, semente, etapa):
+    abrir = _fonte('pesos', n, semente, etapa)
+    with etapa('classes'):
+        bins, contagens, total = classes_em_blocos(abrir, 'sturges')
+    with etapa('tabela'):
+        return tabela_classes(bins, contagens, total)
+
+
+def classes_referencia(n, semente, etapa):
+    dados = pd.Series(_dados('pesos', n, semente, etapa))
+    with etapa('classes'):
+        k = int(1 + 3.322 * np.log10(len(dados)))
+        largura = np.ceil((dados.max() - dados.min()) / k)
+        bins = [int(dados.min()) + i * largura for i in range(k + 1)]
+        contagens = pd.cut(dados, bins=bins, include_lowest=True, right=False).value_counts(sort=False)
+    with etapa('tabela'):
+        return pd.DataFrame({'fi': contagens, 'fri': contagens / len(dados) * 100, 'Fi': contagens.cumsum()})
+
+
+# --- c3e12: estatísticas descritivas de uma coluna ---
+
+def descritivas(n, semente, etapa):
+    abrir = _fonte('tempos', n, semente, etapa)
+    with etapa('momentos'):
+        momentos = Momentos.de_blocos(abrir())
+        resumo = (momentos.media, momentos.variancia(), momentos.assimetria(), momentos.curtose())
+    with etapa('quantis'):
+        if n <= LIMITE_MEMORIA:
+            quantis = Quantis(np.concatenate(list(abrir())))
+        else:
+            quantis = SketchQuantis(semente=semente)
+            for bloco in abrir():
+                quantis.atualizar(bloco)
+        return resumo, quantis.quantil([0.10, 0.25, 0.30, 0.50, 0.60, 0.75, 0.90])
+
+
+def descritivas_referencia(n, semente, etapa):
+    tempos = pd.Series(_dados('tempos', n, semente, etapa))
+    with etapa('momentos'):
+        resumo = (tempos.mean(), tempos.var(), tempos.skew(), tempos.kurt())
+    with etapa('quantis'):
+        return resumo, [tempos.quantile(p) for p in (0.10, 0.25, 0.30, 0.50, 0.60, 0.75, 0.90)]
+
+
+# --- c3e13: resumo de várias colunas ---
+
+def colunas(n, semente, etapa):
+    df = _dados('servicos', n, semente, etapa)
+    with etapa('descrever'):
+        return descrever_colunas(df)
+
+
+def colunas_referencia(n, semente, etapa):
+    df = _dados('servicos', n, semente, etapa)
+    with etapa('descrever'):
+        linhas = {}
+        for coluna in df.columns:
+            dados = df[coluna]
+            q1, q3 = dados.quantile(0.25), dados.quantile(0.75)
+            linhas[coluna] = {
+                'media': dados.mean(), 'mediana': dados.median(), 'moda': dados.mode().tolist(),
+                'variancia': dados.var(), 'desvio_padrao': dados.std(), 'erro_padrao': dados.sem(),
+                'q1': q1, 'q3': q3, 'assimetria': dados.skew(), 'curtose': dados.kurt(),
+                'n_outliers': int(((dados < q1 - 1.5 * (q3 - q1)) | (dados > q3 + 1.5 * (q3 - q1))).sum()),
+            }
+        return pd.DataFrame(linhas).T
+
+
+# --- c4e10/c4e12: tabela de contingência e Qui-Quadrado ---
+
+def contingencia(n, semente, etapa):
+    abrir = _fonte('codigos', n, semente, etapa)
+    with etapa('tabela'):
+        tabela = TabelaContingencia.vazia([1, 2, 3, 4, 5, 6], [1, 2, 3, 4])
+        for bloco in abrir():
+            tabela.acumular(bloco[:, 0], bloco[:, 1])
+    with etapa('qui_quadrado'):
+        return tabela.qui_quadrado(), tabela.rel_linha, tabela.rel_coluna
+
+
+def contingencia_referencia(n, semente, etapa):
+    codigos = _dados('codigos', n, semente, etapa)
+    with etapa('tabela'):
+        tabela = pd.crosstab(codigos[:, 0], codigos[:, 1])
+    with etapa('qui_quadrado'):
+        relativas = (pd.crosstab(codigos[:, 0], codigos[:, 1], normalize='index'),
+                     pd.crosstab(codigos[:, 0], codigos[:, 1], normalize='columns'))
+        return chi2_contingency(tabela), relativas
+
+
+# --- c4e14: Qui-Quadrado de muitas tabelas ---
+
+def qui_quadrado_tabelas(n, semente, etapa):
+    tabelas = _dados('tabelas', n, semente, etapa)
+    with etapa('qui_quadrado'):
+        return qui_quadrado_lote(tabelas)
+
+
+def qui_quadrado_tabelas_referencia(n, semente, etapa):
+    tabelas = _dados('tabelas', n, semente, etapa)
+    with etapa('qui_quadrado'):
+        resultados = []
+        for tabela in tabelas:
+            try:
+                resultados.append(chi2_contingency(tabela)[:3])
+            except ValueError:
+                resultados.append((np.nan, np.nan, 6))
+        return resultados
+
+
+# --- c4e15: correlação de todos os pares ---
+
+def correlacao(n, semente, etapa):
+    notas = _dados('notas', n, semente, etapa)
+    with etapa('matriz'):
+        return MatrizCorrelacao(notas).pares()
+
+
+def correlacao_referencia(n, semente, etapa):
+    notas = _dados('notas', n, semente, etapa)
+    with etapa('matriz'):
+        colunas = list(notas.columns)
+        return [pearsonr(notas[x], notas[y]) for i, x in enumerate(colunas) for y in colunas[i + 1:]]
+
+
+# --- c4e16: influência de cada observação ---
+
+def influencia_lojas(n, semente, etapa):
+    dados = _dados('supermercados', n, semente, etapa)
+    with etapa('influencia'):
+        return influencia(dados['Lojas'], dados['Faturamento'])
+
+
+def influencia_lojas_referencia(n, semente, etapa):
+    # Ajuste de novo a cada observação removida (como faria um laço com pearsonr)
+    dados = _dados('supermercados', n, semente, etapa)
+    x, y = dados['Lojas'].to_numpy(np.float64), dados['Faturamento'].to_numpy(np.float64)
+    with etapa('influencia'):
+        mascara = np.ones(x.size, dtype=bool)
+        r_sem = np.empty(x.size)
+        for i in range(x.size):
+            mascara[i] = False
+            r_sem[i] = pearsonr(x[mascara], y[mascara])[0]
+            mascara[i] = True
+        return r_sem
+
+
+NUCLEOS = {
+    'frequencias': Nucleo('c3e9', frequencias, frequencias_referencia, 10 ** 8, 10 ** 8),
+    'classes': Nucleo('c3e10', classes, classes_referencia, 10 ** 8, 10 ** 7),
+    'descritivas': Nucleo('c3e12', descritivas, descritivas_referencia, 10 ** 8, 10 ** 7),
+    'colunas': Nucleo('c3e13', colunas, colunas_referencia, 10 ** 7, 10 ** 7),
+    'contingencia': Nucleo('c4e10/c4e12', contingencia, contingencia_referencia, 10 ** 8, 10 ** 7),
+    'qui_quadrado_lote': Nucleo('c4e14', qui_quadrado_tabelas, qui_quadrado_tabelas_referencia, 10 ** 7, 10 ** 4),
+    'correlacao': Nucleo('c4e15', correlacao, correlacao_referencia, 10 ** 7, 10 ** 7),
+    'influencia': Nucleo('c4e16', influencia_lojas, influencia_lojas_referencia, 10 ** 7, 10 ** 4),
+}
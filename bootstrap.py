@@ -0,0 +1,209 @@
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+from scipy.stats import norm
+
+from compacto import para_float64
+from contingencia import posicoes_codigos, qui_quadrado_lote
+from paralelo import mapear
+
+# --- Intervalos de Confiança por Bootstrap ---
+# As reamostras são geradas como matrizes de índices (reamostras x n) e a
+# estatística é avaliada em lote, linha a linha da matriz, de forma vetorizada.
+# O tamanho de cada lote respeita um orçamento de memória, e os lotes são
+# divididos em tarefas de tamanho fixo, cada uma com sua semente derivada
+# (SeedSequence), distribuídas entre processos: o resultado não depende do
+# número de processos. Intervalos por percentil ou BCa (com aceleração
+# estimada por jackknife, agrupado quando n é grande: as observações vão para
+# os grupos ao acaso, para que dados ordenados não viesem a aceleração, e os
+# grupos são avaliados em lotes, como as reamostras).
+# Em estatísticas limitadas em zero e muito viesadas na reamostragem, como o
+# V de Cramér perto da independência, a correção de viés do BCa pode deixar a
+# estimativa perto (ou fora) de um dos extremos do intervalo. Para o V, use a
+# versão corrigida de viés (`v_cramer(..., corrigido=True)`, de Bergsma) com
+# o intervalo por percentil.
+#
+# Uma estatística recebe uma matriz (reamostras x n) para cada vetor de dados
+# e devolve um valor por linha. As estatísticas deste módulo são funções de
+# módulo, para poderem ser enviadas aos processos.
+#
+# O orçamento de memória é aproximado: conta os índices, os dados reamostrados
+# e os temporários da estatística, declarados em `bytes_por_elemento` (bytes
+# por elemento da matriz; estatísticas sem a declaração contam TRABALHO_PADRAO).
+
+IntervaloBootstrap = namedtuple('IntervaloBootstrap', 'estimativa inferior superior erro_padrao metodo reamostras')
+
+REAMOSTRAS_POR_TAREFA = 1_000
+MEMORIA_MAXIMA = 128 * 1024 ** 2  # bytes por lote de reamostras (aproximado)
+TRABALHO_PADRAO = 32  # bytes de temporários por elemento: quatro cópias float64
+
+
+# --- Estatísticas vetorizadas ---
+
+def media(x):
+    return x.mean(axis=1)
+
+
+def mediana(x):
+    return np.median(x, axis=1)
+
+
+def iqr(x):
+    q1, q3 = np.quantile(x, [0.25, 0.75], axis=1)
+    return q3 - q1
+
+
+def pearson(x, y):
+    x = x - x.mean(axis=1, keepdims=True)
+    y = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (x * y).sum(axis=1) / np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1))
+
+
+# Temporários por elemento da matriz: a mediana e os quantis ordenam uma cópia
+# float64; Pearson centra x e y e forma os produtos (até três float64 vivos)
+media.bytes_por_elemento = 0
+mediana.bytes_por_elemento = 8
+iqr.bytes_por_elemento = 8
+pearson.bytes_por_elemento = 24
+
+
+def _v_cramer(pos_linha, pos_coluna, n_linhas, n_colunas, corrigido=False):
+    # Uma tabela por reamostra, todas contadas com um único bincount;
+    # pares fora das listas de códigos vão para uma célula extra, descartada
+    reamostras = pos_linha.shape[0]
+    n_celulas = n_linhas * n_colunas
+    validos = (pos_linha >= 0) & (pos_coluna >= 0)
+    celulas = np.where(validos, pos_linha * n_colunas + pos_coluna, n_celulas)
+    celulas = celulas + (np.arange(reamostras) * (n_celulas + 1))[:, None]
+    tabelas = np.bincount(celulas.ravel(), minlength=reamostras * (n_celulas + 1))
+    tabelas = tabelas.reshape(reamostras, n_celulas + 1)[:, :n_celulas].reshape(reamostras, n_linhas, n_colunas)
+    chi2 = qui_quadrado_lote(tabelas, correcao=False).estatistica
+    n = tabelas.sum(axis=(1, 2))
+    if not corrigido:
+        return np.sqrt(chi2 / (n * (min(n_linhas, n_colunas) - 1)))
+    # Correção de viés de Bergsma: desconta de phi² o seu valor esperado sob
+    # independência e ajusta o número efetivo de linhas e colunas
+    with np.errstate(invalid='ignore', divide='ignore'):
+        phi2 = np.maximum(0.0, chi2 / n - (n_linhas - 1) * (n_colunas - 1) / (n - 1))
+        linhas = n_linhas - (n_linhas - 1) ** 2 / (n - 1)
+        colunas = n_colunas - (n_colunas - 1) ** 2 / (n - 1)
+        return np.sqrt(phi2 / (np.minimum(linhas, colunas) - 1))
+
+
+def v_cramer(codigos_linha, codigos_coluna, corrigido=False):
+    """Estatística V de Cramér para dados em posições de código (ver `posicoes_v_cramer`).
+
+    `corrigido=True` usa a versão com correção de viés (Bergsma), indicada para intervalos por percentil.
+    """
+    estatistica = partial(_v_cramer, n_linhas=len(codigos_linha), n_colunas=len(codigos_coluna), corrigido=corrigido)
+    # Máscara bool, células int64 (np.where, deslocamento por reamostra) e a cópia do ravel
+    estatistica.bytes_por_elemento = 1 + 3 * 8
+    return estatistica
+
+
+def posicoes_v_cramer(linhas, colunas, codigos_linha, codigos_coluna):
+    """Converte os códigos brutos nas posições usadas por `v_cramer`."""
+    return posicoes_codigos(linhas, codigos_linha), posicoes_codigos(colunas, codigos_coluna)
+
+
+# --- Reamostragem ---
+
+def _avaliar(estatistica, dados, indices):
+    return estatistica(*(vetor[indices] for vetor in dados))
+
+
+def _tipo_indices(n):
+    # Índices int32 ocupam metade da memória enquanto couberem
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def _bytes_por_linha(estatistica, dados, n):
+    # Índices + dados reamostrados + temporários da estatística, por linha da matriz
+    trabalho = getattr(estatistica, 'bytes_por_elemento', TRABALHO_PADRAO)
+    return n * (np.dtype(_tipo_indices(n)).itemsize + sum(vetor.itemsize for vetor in dados) + trabalho)
+
+
+def _tarefa(tarefa, dados, estatistica, lote):
+    semente, reamostras = tarefa
+    rng = np.random.default_rng(semente)
+    n = dados[0].shape[0]
+    valores = []
+    for inicio in range(0, reamostras, lote):
+        indices = rng.integers(0, n, size=(min(lote, reamostras - inicio), n), dtype=_tipo_indices(n))
+        valores.append(_avaliar(estatistica, dados, indices))
+    return np.concatenate(valores)
+
+
+def _jackknife(estatistica, dados, grupos, rng, lote):
+    # Jackknife agrupado: remove um grupo de observações por vez. Com menos
+    # observações que grupos, é o jackknife exato (uma observação por grupo);
+    # senão as observações são sorteadas para os grupos. Grupos de mesmo
+    # tamanho s viram linhas de uma matriz de índices, avaliada em lotes:
+    # a linha do grupo que começa em `inicio` mantém ordem[j + s * (j >= inicio)].
+    n = dados[0].shape[0]
+    grupos = min(n, grupos)
+    ordem = np.arange(n) if grupos == n else rng.permutation(n)
+    tamanhos = np.full(grupos, n // grupos)
+    tamanhos[:n % grupos] += 1
+    inicios = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+    valores = np.empty(grupos)
+    for tamanho in np.unique(tamanhos):
+        selecionados = np.flatnonzero(tamanhos == tamanho)
+        j = np.arange(n - tamanho)
+        for parte in range(0, selecionados.size, lote):
+            ks = selecionados[parte:parte + lote]
+            posicoes = j + tamanho * (j >= inicios[ks, None])
+            valores[ks] = _avaliar(estatistica, dados, ordem[posicoes].astype(_tipo_indices(n)))
+    return valores
+
+
+def intervalo_bootstrap(dados, estatistica, reamostras=10_000, nivel=0.95, metodo='bca', semente=None,
+                        processos=None, memoria_maxima=MEMORIA_MAXIMA, grupos_jackknife=1_000):
+    """Intervalo de confiança bootstrap ('percentil' ou 'bca') de uma estatística vetorizada.
+
+    `dados` é um vetor ou uma tupla de vetores do mesmo tamanho (reamostrados
+    juntos, linha a linha, como em pares x/y). `memoria_maxima` limita, de forma
+    aproximada, a memória de cada lote de reamostras (ver `bytes_por_elemento`).
+    """
+    if metodo not in ('percentil', 'bca'):
+        raise ValueError("O método deve ser 'percentil' ou 'bca'.")
+    dados = tuple(np.asarray(vetor) for vetor in (dados if isinstance(dados, tuple) else (dados,)))
+    # Dados float32 (modo compacto) voltam aos decimais originais: reamostras e
+    # estatísticas em float64, com os mesmos resultados dos dados sem compactação
+    dados = tuple(para_float64(vetor) if vetor.dtype == np.float32 else vetor for vetor in dados)
+    n = dados[0].shape[0]
+    estimativa = _avaliar(estatistica, dados, np.arange(n)[None, :])[0]
+
+    lote = int(max(1, min(REAMOSTRAS_POR_TAREFA, memoria_maxima // _bytes_por_linha(estatistica, dados, n))))
+    tamanhos = [REAMOSTRAS_POR_TAREFA] * (reamostras // REAMOSTRAS_POR_TAREFA)
+    if reamostras % REAMOSTRAS_POR_TAREFA:
+        tamanhos.append(reamostras % REAMOSTRAS_POR_TAREFA)
+    sequencia = np.random.SeedSequence(semente)
+    sementes = sequencia.spawn(len(tamanhos))
+
+    # Os dados seguem com cada tarefa (uma cópia por tarefa de REAMOSTRAS_POR_TAREFA
+    # reamostras, desprezível diante delas): funciona com qualquer pool e em chamadas simultâneas
+    tarefa = partial(_tarefa, dados=dados, estatistica=estatistica, lote=lote)
+    valores = np.concatenate(mapear(tarefa, list(zip(sementes, tamanhos)), processos if len(tamanhos) > 1 else 1))
+    valores = valores[~np.isnan(valores)]
+    if valores.size == 0:
+        # Estatística indefinida em todas as reamostras (ex.: tabela com uma linha zerada): sem intervalo
+        return IntervaloBootstrap(estimativa, np.nan, np.nan, np.nan, metodo, 0)
+
+    alpha = (1 - nivel) / 2
+    probabilidades = np.array([alpha, 1 - alpha])
+    if metodo == 'bca':
+        # Viés (z0) pela fração de reamostras abaixo da estimativa; aceleração pelo jackknife
+        proporcao = (np.sum(valores < estimativa) + 0.5 * np.sum(valores == estimativa)) / valores.size
+        z0 = norm.ppf(np.clip(proporcao, 1e-10, 1 - 1e-10))
+        # Semente própria para os grupos, derivada depois das sementes das tarefas
+        jack = _jackknife(estatistica, dados, grupos_jackknife, np.random.default_rng(sequencia.spawn(1)[0]), lote)
+        desvios = jack.mean() - jack
+        denominador = 6 * np.sum(desvios ** 2) ** 1.5
+        aceleracao = np.sum(desvios ** 3) / denominador if denominador > 0 else 0.0
+        z = norm.ppf(probabilidades)
+        probabilidades = norm.cdf(z0 + (z0 + z) / (1 - aceleracao * (z0 + z)))
+    inferior, superior = np.quantile(valores, probabilidades)
+    return IntervaloBootstrap(estimativa, inferior, superior, valores.std(ddof=1), metodo, valores.size)
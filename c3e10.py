@@ -1,7 +1,12 @@
-import pandas as pd
 import numpy as np
+from classes import blocos_de_array, classes_de_array, classes_em_blocos, tabela_classes
+from entrada import caminho_entrada, parametro
+from frequencias import ler_blocos
+from instrumentacao import concluir, contar_linhas, passo
+from saida import escrever_tabela, fixo, formato_do_arquivo
 
 # --- PASSO 1: Inserir e preparar os dados da Tabela 43 ---
+passo('carregar')
 # Os dados foram fornecidos diretamente na questão.
 pesos_pacientes = [
     60.4, 78.9, 65.7, 82.1, 80.9, 92.3, 85.7, 86.6, 90.3, 93.2,
@@ -11,66 +16,52 @@ pesos_pacientes = [
     69.3, 80.2, 90.0, 76.9, 54.7, 78.4, 55.2, 75.5, 99.3, 66.7
 ]
 
-# Converter a lista para uma Série do Pandas para facilitar a manipulação
-dados = pd.Series(pesos_pacientes)
-
-# --- PASSO 2: Determinar as Classes (Intervalos) ---
-# Usando a Regra de Sturges para definir o número de classes (k)
-n = len(dados)
-k = int(1 + 3.322 * np.log10(n))
-
-# Calcular a amplitude e a largura da classe
-amplitude = dados.max() - dados.min()
-largura_classe = np.ceil(amplitude / k)
-
-# Definir os limites das classes
-limite_inferior = int(dados.min())
-bins = [limite_inferior + i * largura_classe for i in range(k + 1)]
-
-# --- PASSO 3: Construir a Tabela de Distribuição de Frequências ---
-
-# Agrupar os dados nas classes definidas
-classes_dados = pd.cut(dados, bins=bins, include_lowest=True, right=False)
-
-# Criar os rótulos para as classes
-rotulos_classes = [f'{bins[i]:.1f} |-- {bins[i+1]:.1f}' for i in range(len(bins)-1)]
-
-# Calcular a frequência absoluta
-freq_abs = classes_dados.value_counts(sort=False)
-
-# Criar a tabela final
-tabela_freq = pd.DataFrame({
-    'Classes de Peso (kg)': rotulos_classes,
-    'Frequência Absoluta (fi)': freq_abs.values
-})
-
-# Calcular o Ponto Médio (xi)
-tabela_freq['Ponto Médio (xi)'] = [(bins[i] + bins[i+1]) / 2 for i in range(len(bins)-1)]
-
-# Calcular Frequência Relativa (fri)
-tabela_freq['Frequência Relativa (fri) %'] = (tabela_freq['Frequência Absoluta (fi)'] / n) * 100
-
-# Calcular Frequências Acumuladas
-tabela_freq['Frequência Acumulada (Fi)'] = tabela_freq['Frequência Absoluta (fi)'].cumsum()
-tabela_freq['Freq. Rel. Acumulada (Fri) %'] = tabela_freq['Frequência Relativa (fri) %'].cumsum()
-
-# Reordenar colunas para melhor visualização
-tabela_freq = tabela_freq[['Classes de Peso (kg)', 'Ponto Médio (xi)', 'Frequência Absoluta (fi)', 'Frequência Relativa (fri) %', 'Frequência Acumulada (Fi)', 'Freq. Rel. Acumulada (Fri) %']]
-
-# Adicionar linha de Total
+# Regra para o número de classes: 'sturges', 'raiz', 'scott' ou 'freedman-diaconis'
+regra_classes = parametro('regra_classes', 'sturges')
+
+# Para volumes grandes, informe um arquivo .npy (lido com memory-map), CSV ou Parquet;
+# ele é percorrido em blocos, em duas passagens (mínimo/máximo e depois contagens)
+arquivo_pesos = caminho_entrada(None)
+
+# --- PASSO 2 e 3: Determinar as Classes e Construir a Tabela de Distribuição ---
+passo('calcular')
+# O número de classes vem da regra escolhida; cada peso é atribuído à sua classe por floor((x - limite_inferior) / largura)
+if arquivo_pesos is None:
+    bins, freq_abs, n = classes_de_array(pesos_pacientes, regra_classes)
+elif arquivo_pesos.endswith('.npy'):
+    pesos_mmap = np.load(arquivo_pesos, mmap_mode='r')
+    bins, freq_abs, n = classes_em_blocos(lambda: blocos_de_array(pesos_mmap), regra_classes)
+else:
+    bins, freq_abs, n = classes_em_blocos(lambda: ler_blocos(arquivo_pesos), regra_classes)
+contar_linhas(n)
+
+# Criar a tabela final (ponto médio, frequências relativas e acumuladas)
+tabela_freq = tabela_classes(bins, freq_abs, n, nome_classes='Classes de Peso (kg)')
+
+# Linha de Total, guardada à parte: os '---' só aparecem na saída e as colunas continuam numéricas
 total_row = {
     'Classes de Peso (kg)': 'Total',
-    'Ponto Médio (xi)': '---',
     'Frequência Absoluta (fi)': tabela_freq['Frequência Absoluta (fi)'].sum(),
     'Frequência Relativa (fri) %': tabela_freq['Frequência Relativa (fri) %'].sum(),
-    'Frequência Acumulada (Fi)': '---',
-    'Freq. Rel. Acumulada (Fri) %': '---'
 }
-# Usar pd.concat para adicionar a linha de total
-tabela_freq = pd.concat([tabela_freq, pd.DataFrame([total_row])], ignore_index=True)
+formatos = {
+    'Ponto Médio (xi)': lambda valores: fixo(valores, 1),
+    'Frequência Relativa (fri) %': fixo,
+    'Freq. Rel. Acumulada (Fri) %': fixo,
+}
 
 
 # --- PASSO 4: Exibir a Tabela Final ---
-print("--- Tabela de Distribuição de Frequências para o Peso dos Pacientes ---")
-# Formatar a saída para melhor leitura, convertendo para string
-print(tabela_freq.to_string(index=False))
\ No newline at end of file
+passo('relatorio')
+# Com 'arquivo_tabela' (ex.: tabela.csv, .md, .json) a tabela é gravada no arquivo, no formato da extensão
+arquivo_tabela = parametro('arquivo_tabela')
+if arquivo_tabela:
+    escrever_tabela(tabela_freq, arquivo_tabela, formato_do_arquivo(arquivo_tabela), formatos, total_row,
+                    indice=False, vazio='---')
+    print(f"Tabela de distribuição gravada em {arquivo_tabela}")
+else:
+    print("--- Tabela de Distribuição de Frequências para o Peso dos Pacientes ---")
+    # Cada coluna é formatada de uma vez e as linhas são escritas em blocos (ver saida.py)
+    escrever_tabela(tabela_freq, formatos=formatos, total=total_row, indice=False, vazio='---')
+
+concluir()
@@ -1,15 +1,22 @@
-import pandas as pd
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
-import seaborn as sns
-import stemgraphic
+from momentos import Momentos
+from quantis import Quantis
+from ramo_folhas import RamoFolhas
+from compacto import para_float64
+from entrada import caminho_entrada, ler_excel, parametro
+from renderizacao import FilaGraficos, grafico
+import graficos
+from bootstrap import intervalo_bootstrap, media as est_media, mediana as est_mediana, iqr as est_iqr
+from instrumentacao import concluir, contar_linhas, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Carregar os Dados do Arquivo ---
 # Garante que o arquivo seja encontrado e lido corretamente.
+passo('carregar')
 try:
-    file_path = '/Users/plgandini/Coding/UFABC/EASG/Desidratação.xls'
-    df = pd.read_excel(file_path)
+    file_path = caminho_entrada('/Users/plgandini/Coding/UFABC/EASG/Desidratação.xls')
+    # A conversão numérica e a remoção de vazios da primeira coluna ficam no cache da planilha
+    df = ler_excel(file_path, colunas=[0], numericas=[0], dropna=[0])
 
 except FileNotFoundError:
     print(f"Erro: O arquivo '{file_path}' não foi encontrado. Verifique o nome e o local do arquivo.")
@@ -18,50 +25,66 @@ except Exception as e:
     print(f"Ocorreu um erro ao ler o arquivo: {e}")
     exit()
 
-# Extrai os dados da primeira coluna e converte para formato numérico
+contar_linhas(len(df))
+
+# Extrai os dados da primeira coluna (já numérica e sem valores nulos)
+passo('preparar', linhas=len(df))
 column_name = df.columns[0]
-tempos = pd.to_numeric(df[column_name], errors='coerce').dropna()
+tempos = df[column_name]
 
 if tempos.empty:
     print("Nenhum dado numérico foi encontrado na coluna principal. Verifique o formato do arquivo.")
     exit()
 
+# Ramos e folhas contados por aritmética de dígitos (ver ramo_folhas.py)
+try:
+    ramo_folhas = RamoFolhas.de_array(tempos.to_numpy(), escala=10)
+except Exception as e:
+    ramo_folhas = None
+    print(f"\nNão foi possível montar o diagrama Ramo-e-Folhas: {e}")
+
+# Os gráficos só dependem dos dados: são enviados já e desenhados em paralelo
+# (ver renderizacao.py) enquanto as estatísticas são calculadas e exibidas
+fila_graficos = FilaGraficos()
+fila_graficos.enviar(grafico('analise_grafica_real.png', graficos.histograma_boxplot, tempos,
+                             'Análise Gráfica dos Tempos de Desidratação', 'Tempo (s)', tamanho=(12, 5)))
+if ramo_folhas is not None:
+    fila_graficos.enviar(grafico('ramo_e_folhas_real.png', graficos.ramo_folhas, ramo_folhas,
+                                 'Ramo-e-Folhas dos Tempos de Desidratação', 's',
+                                 tamanho=(8, max(3, 0.4 * (len(ramo_folhas.linhas()) + 3)))))
+
 
 # --- PASSO 2: Realizar todos os Cálculos Estatísticos ---
-# (Esta seção permanece inalterada)
+passo('calcular', linhas=len(tempos))
+# Os momentos (n, média, M2, M3, M4, mín. e máx.) são obtidos numa única passagem
+# sobre os dados; média, dispersão, assimetria e curtose derivam deles.
+momentos = Momentos.de_array(tempos.to_numpy())
+# Quartis, percentis, decis e mediana são consultas sobre uma única ordenação
+quantis = Quantis(tempos.to_numpy())
 
 # a) Medidas de Posição
-media = tempos.mean()
-mediana = tempos.median()
+media = momentos.media
+mediana = quantis.mediana()
 moda_series = tempos.mode()
-moda = moda_series.tolist() if not moda_series.empty and len(moda_series) < len(tempos) else "Nenhuma moda clara"
+moda = para_float64(moda_series).tolist() if not moda_series.empty and len(moda_series) < len(tempos) else "Nenhuma moda clara"
 
 # b) Quartis e verificação de Outliers
-q1 = tempos.quantile(0.25)
-q3 = tempos.quantile(0.75)
-iqr = q3 - q1
-limite_inferior = q1 - 1.5 * iqr
-limite_superior = q3 + 1.5 * iqr
+q1, q3, iqr, limite_inferior, limite_superior = quantis.cercas(1.5)
 outliers = tempos[(tempos < limite_inferior) | (tempos > limite_superior)]
 
-# c) Percentis de ordem 10 e 90
-p10 = tempos.quantile(0.10)
-p90 = tempos.quantile(0.90)
-
-# d) Decis de ordem 3 e 6
-d3 = tempos.quantile(0.30)
-d6 = tempos.quantile(0.60)
+# c) Percentis de ordem 10 e 90 e d) Decis de ordem 3 e 6
+p10, p90, d3, d6 = quantis.quantil([0.10, 0.90, 0.30, 0.60])
 
 # e) Medidas de Dispersão
-amplitude = tempos.max() - tempos.min()
-desvio_medio_abs = (tempos - media).abs().mean()
-variancia = tempos.var(ddof=1)
-desvio_padrao = tempos.std(ddof=1)
-erro_padrao = tempos.sem(ddof=1)
-coef_variacao = (desvio_padrao / media) * 100 if media != 0 else 0
+amplitude = momentos.amplitude
+desvio_medio_abs = np.abs(para_float64(tempos.to_numpy()) - media).mean()
+variancia = momentos.variancia(ddof=1)
+desvio_padrao = momentos.desvio_padrao(ddof=1)
+erro_padrao = momentos.erro_padrao(ddof=1)
+coef_variacao = momentos.coef_variacao(ddof=1)
 
 # f) Verificação da Simetria (Assimetria)
-assimetria = tempos.skew()
+assimetria = momentos.assimetria()
 if assimetria > 0.5:
     tipo_assimetria = "Assimétrica Positiva (cauda à direita)"
 elif assimetria < -0.5:
@@ -70,7 +93,7 @@ else:
     tipo_assimetria = "Aproximadamente Simétrica"
 
 # g) Cálculo da Curtose (Achatamento)
-curtose = tempos.kurtosis() # Curtose em excesso (padrão de Fisher)
+curtose = momentos.curtose() # Curtose em excesso (padrão de Fisher)
 if curtose > 0.5:
     tipo_curtose = "Leptocúrtica (mais pontuda, caudas pesadas)"
 elif curtose < -0.5:
@@ -78,7 +101,18 @@ elif curtose < -0.5:
 else:
     tipo_curtose = "Mesocúrtica (similar à distribuição Normal)"
 
+# h) Intervalos de Confiança (95%) por Bootstrap BCa para média, mediana e IQR
+# (lidos do cache de resultados quando os dados não mudaram; ver memoizacao.py)
+# (EASG_PARAMETROS {"reamostras": N} muda o número de reamostras; 0 pula os intervalos)
+reamostras = parametro('reamostras', 10_000)
+amostra = tempos.to_numpy()
+if reamostras:
+    ic_media = memoizar(intervalo_bootstrap, amostra, est_media, reamostras=reamostras, semente=0)
+    ic_mediana = memoizar(intervalo_bootstrap, amostra, est_mediana, reamostras=reamostras, semente=0)
+    ic_iqr = memoizar(intervalo_bootstrap, amostra, est_iqr, reamostras=reamostras, semente=0)
+
 # --- PASSO 3: Exibir Resultados no Console com 4 CASAS DECIMAIS ---
+passo('relatorio')
 
 print("--- ANÁLISE ESTATÍSTICA DO TEMPO DE DESIDRATAÇÃO ---")
 print("\na) Medidas de Posição:")
@@ -92,7 +126,7 @@ print(f"   - Terceiro Quartil (Q3): {q3:.4f} s")
 print(f"   - Intervalo Interquartil (IQR): {iqr:.4f} s")
 print(f"   - Limites para Outliers: Inferior < {limite_inferior:.4f} s | Superior > {limite_superior:.4f} s")
 if not outliers.empty:
-    print(f"   - Indícios de Outliers Encontrados: {sorted(outliers.round(4).tolist())}")
+    print(f"   - Indícios de Outliers Encontrados: {sorted(para_float64(outliers).round(4).tolist())}")
 else:
     print("   - Não há indícios de outliers.")
 
@@ -120,33 +154,27 @@ print("\ng) Análise de Curtose (Achatamento):")
 print(f"   - Coeficiente de Curtose (Excesso): {curtose:.4f}")
 print(f"   - Classificação: {tipo_curtose}")
 
-# --- PASSO 4: Gerar e Salvar os Gráficos ---
-# (Esta seção permanece inalterada)
-
-sns.set_style("whitegrid")
-fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-fig.suptitle('Análise Gráfica dos Tempos de Desidratação', fontsize=16)
-
-# Histograma
-sns.histplot(tempos, kde=True, color='royalblue', ax=axes[0])
-axes[0].set_title('Histograma')
-axes[0].set_xlabel('Tempo (s)')
-axes[0].set_ylabel('Frequência')
-
-# Boxplot
-sns.boxplot(y=tempos, color='mediumseagreen', ax=axes[1])
-axes[1].set_title('Boxplot')
-axes[1].set_ylabel('Tempo (s)')
+if reamostras:
+    print("\nh) Intervalos de Confiança de 95% (Bootstrap BCa):")
+    print(f"   - Média: [{ic_media.inferior:.4f} ; {ic_media.superior:.4f}] s")
+    print(f"   - Mediana: [{ic_mediana.inferior:.4f} ; {ic_mediana.superior:.4f}] s")
+    print(f"   - IQR: [{ic_iqr.inferior:.4f} ; {ic_iqr.superior:.4f}] s")
 
-plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-plt.savefig('analise_grafica_real.png')
+if ramo_folhas is not None:
+    print("\ni) Diagrama de Ramo-e-Folhas:")
+    print(ramo_folhas.texto('s'))
 
-# Gráfico Ramo-e-Folhas (salvo em arquivo separado)
+# --- PASSO 4: Gerar e Salvar os Gráficos ---
+# Histograma/boxplot e Ramo-e-Folhas já foram enviados à fila de gráficos no PASSO 1
+passo('graficos')
 try:
-    fig_ramo, ax_ramo = stemgraphic.stem_graphic(tempos, scale=10)
-    plt.savefig('ramo_e_folhas_real.png')
+    arquivos = fila_graficos.esperar()
+except Exception as e:
+    arquivos = []
+    print(f"\nNão foi possível gerar os gráficos: {e}")
+concluir()
+if arquivos:
     print("\n--- GRÁFICOS GERADOS ---")
     print("1. 'analise_grafica_real.png' (Histograma e Boxplot)")
-    print("2. 'ramo_e_folhas_real.png' (Ramo-e-Folhas)")
-except Exception as e:
-    print(f"\nNão foi possível gerar o gráfico Ramo-e-Folhas: {e}")
\ No newline at end of file
+    if ramo_folhas is not None:
+        print("2. 'ramo_e_folhas_real.png' (Ramo-e-Folhas)")
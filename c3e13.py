@@ -1,12 +1,19 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from descricao import descrever_colunas
+from compacto import para_float64
+from entrada import caminho_entrada, ler_excel, parametro
+from bootstrap import intervalo_bootstrap, media as est_media
+from renderizacao import FilaGraficos, grafico
+import graficos
+from instrumentacao import concluir, contar_linhas, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Carregar os Dados do Arquivo Real ---
+passo('carregar')
 try:
-    file_path = '/Users/plgandini/Coding/UFABC/EASG/Serviços.xls'
-    df_servicos = pd.read_excel(file_path)
+    file_path = caminho_entrada('/Users/plgandini/Coding/UFABC/EASG/Serviços.xls')
+    # Converte todas as colunas para numérico e remove linhas com valores nulos
+    # (feito uma única vez, ao gerar o cache da planilha)
+    df_servicos = ler_excel(file_path, numericas=True, dropna=True)
 
 except FileNotFoundError:
     print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
@@ -14,108 +21,66 @@ except FileNotFoundError:
 except Exception as e:
     print(f"Ocorreu um erro ao ler o arquivo: {e}")
     exit()
-
-# Converte todas as colunas para numérico, tratando possíveis erros
-for col in df_servicos.columns:
-    df_servicos[col] = pd.to_numeric(df_servicos[col], errors='coerce')
-
-# Remove linhas que possam ter ficado com valores nulos após a conversão
-df_servicos.dropna(inplace=True)
+contar_linhas(len(df_servicos))
 
 
 # --- PASSO 2: Cálculos e Exibição dos Resultados ---
+passo('calcular', linhas=len(df_servicos))
+
+# Calcula as métricas de todos os serviços de uma vez (uma linha por serviço);
+# com os mesmos dados, o resumo e os intervalos vêm do cache de resultados (ver memoizacao.py)
+resumo = memoizar(descrever_colunas, df_servicos)
+
+# Os gráficos dependem só dos dados e do resumo: são enviados já e desenhados em
+# paralelo (ver renderizacao.py) enquanto os resultados são calculados e exibidos
+fila_graficos = FilaGraficos()
+cores = ['lightcoral', 'mediumseagreen', 'cornflowerblue']
+fila_graficos.enviar(grafico('grafico_barras_comparativo.png', graficos.barras, resumo['media'].sort_values(),
+                             'Tempo Médio de Atendimento por Serviço', 'Tipo de Serviço', 'Tempo Médio (minutos)',
+                             cores=cores))
+fila_graficos.enviar(grafico('boxplot_comparativo.png', graficos.boxplot, df_servicos,
+                             'Boxplot Comparativo dos Tempos de Atendimento', 'Serviços', 'Tempo (minutos)',
+                             tamanho=(10, 7)))
+fila_graficos.enviar(grafico('histogramas_individuais.png', graficos.histogramas, df_servicos,
+                             'Histograma de Frequência por Serviço', 'Tempo (minutos)', 'Frequência', cores,
+                             tamanho=(18, 5)))
+
+# Intervalo de confiança de 95% da média de cada serviço (Bootstrap BCa)
+# (EASG_PARAMETROS {"reamostras": N} muda o número de reamostras; 0 pula os intervalos)
+reamostras = parametro('reamostras', 10_000)
+intervalos = {servico: memoizar(intervalo_bootstrap, df_servicos[servico].to_numpy(), est_media,
+                                reamostras=reamostras, semente=0)
+              for servico in resumo.index} if reamostras else {}
+
+# Exibição dos resultados, serviço a serviço, a partir da tabela de resumo
+passo('relatorio')
+for servico, linha in resumo.iterrows():
+    dados_servico = df_servicos[servico].to_numpy()
+    outliers = dados_servico[(dados_servico < linha['limite_inferior']) | (dados_servico > linha['limite_superior'])]
+    moda = linha['moda']
 
-# Itera sobre cada coluna (serviço) do DataFrame para calcular as métricas
-for servico in df_servicos.columns:
-    dados_servico = df_servicos[servico]
-
-    # a) Medidas de Posição
-    media = dados_servico.mean()
-    mediana = dados_servico.median()
-    moda = dados_servico.mode().tolist()
-
-    # b) Medidas de Dispersão
-    variancia = dados_servico.var(ddof=1)
-    desvio_padrao = dados_servico.std(ddof=1)
-    erro_padrao = dados_servico.sem(ddof=1)
-
-    # c) Quartis e Outliers
-    q1 = dados_servico.quantile(0.25)
-    q3 = dados_servico.quantile(0.75)
-    iqr = q3 - q1
-    limite_inferior = q1 - 1.5 * iqr
-    limite_superior = q3 + 1.5 * iqr
-    outliers = dados_servico[(dados_servico < limite_inferior) | (dados_servico > limite_superior)]
-
-    # d) Assimetria e Curtose de Fisher
-    assimetria_g1 = dados_servico.skew()
-    curtose_g2 = dados_servico.kurtosis()
-
-    if assimetria_g1 > 0.5:
-        tipo_assimetria = "Assimétrica Positiva"
-    elif assimetria_g1 < -0.5:
-        tipo_assimetria = "Assimétrica Negativa"
-    else:
-        tipo_assimetria = "Aproximadamente Simétrica"
-
-    if curtose_g2 > 0.5:
-        tipo_curtose = "Leptocúrtica (mais 'pontuda' que a Normal)"
-    elif curtose_g2 < -0.5:
-        tipo_curtose = "Platicúrtica (mais 'achatada' que a Normal)"
-    else:
-        tipo_curtose = "Mesocúrtica (similar à Normal)"
-
-    # Exibição dos resultados para o serviço atual
     print(f"\n--- ANÁLISE DO '{servico}' ---")
     print("\nMedidas de Posição:")
-    print(f"  - Média: {media:.2f} min | Mediana: {mediana:.2f} min | Moda: {moda if len(moda) < 5 else 'Nenhuma moda clara'}")
+    print(f"  - Média: {linha['media']:.2f} min | Mediana: {linha['mediana']:.2f} min | Moda: {moda if len(moda) < 5 else 'Nenhuma moda clara'}")
+    if servico in intervalos:
+        print(f"  - IC 95% da Média (Bootstrap BCa): [{intervalos[servico].inferior:.2f} ; {intervalos[servico].superior:.2f}] min")
     print("\nMedidas de Dispersão:")
-    print(f"  - Variância: {variancia:.2f} min² | Desvio Padrão: {desvio_padrao:.2f} min | Erro Padrão: {erro_padrao:.2f} min")
+    print(f"  - Variância: {linha['variancia']:.2f} min² | Desvio Padrão: {linha['desvio_padrao']:.2f} min | Erro Padrão: {linha['erro_padrao']:.2f} min")
     print("\nQuartis e Outliers:")
-    print(f"  - Q1: {q1:.2f} min | Q3: {q3:.2f} min")
-    if not outliers.empty:
-        print(f"  - Indícios de Outliers: {outliers.round(2).tolist()}")
+    print(f"  - Q1: {linha['q1']:.2f} min | Q3: {linha['q3']:.2f} min")
+    if linha['n_outliers'] > 0:
+        print(f"  - Indícios de Outliers: {para_float64(outliers).round(2).tolist()}")
     else:
         print("  - Não há indícios de outliers.")
     print("\nSimetria e Curtose:")
-    print(f"  - Assimetria (g1): {assimetria_g1:.2f} ({tipo_assimetria})")
-    print(f"  - Curtose (g2): {curtose_g2:.2f} ({tipo_curtose})")
+    print(f"  - Assimetria (g1): {linha['assimetria']:.2f} ({linha['tipo_assimetria']})")
+    print(f"  - Curtose (g2): {linha['curtose']:.2f} ({linha['tipo_curtose']})")
     print("-" * 50)
 
-# --- PASSO 3: Geração dos Gráficos ---
-
-# Gráfico de Barras para comparar as médias
-plt.figure(figsize=(8, 6))
-df_servicos.mean().sort_values().plot(kind='bar', color=['lightcoral', 'mediumseagreen', 'cornflowerblue'], edgecolor='black')
-plt.title('Tempo Médio de Atendimento por Serviço', fontsize=16)
-plt.ylabel('Tempo Médio (minutos)')
-plt.xlabel('Tipo de Serviço')
-plt.xticks(rotation=0)
-plt.grid(axis='y', linestyle='--')
-plt.savefig('grafico_barras_comparativo.png')
-plt.close()
-
-# Boxplot comparativo
-plt.figure(figsize=(10, 7))
-sns.boxplot(data=df_servicos)
-plt.title('Boxplot Comparativo dos Tempos de Atendimento', fontsize=16)
-plt.ylabel('Tempo (minutos)')
-plt.xlabel('Serviços')
-plt.savefig('boxplot_comparativo.png')
-plt.close()
-
-# Histogramas individuais
-fig, axes = plt.subplots(1, 3, figsize=(18, 5), sharey=True)
-fig.suptitle('Histograma de Frequência por Serviço', fontsize=18)
-colors = ['lightcoral', 'mediumseagreen', 'cornflowerblue']
-for i, servico in enumerate(df_servicos.columns):
-    sns.histplot(df_servicos[servico], ax=axes[i], kde=True, bins=12, color=colors[i])
-    axes[i].set_title(servico)
-    axes[i].set_xlabel("Tempo (minutos)")
-axes[0].set_ylabel("Frequência")
-plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-plt.savefig('histogramas_individuais.png')
-plt.close()
+# --- PASSO 3: Aguardar os Gráficos ---
+passo('graficos')
+fila_graficos.esperar()
+concluir()
 
 print("\n\n--- GRÁFICOS GERADOS ---")
 print("1. 'grafico_barras_comparativo.png' (Comparação das médias)")
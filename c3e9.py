@@ -1,4 +1,8 @@
 import pandas as pd
+from entrada import caminho_entrada, parametro
+from frequencias import ContadorFrequencias, ler_blocos
+from instrumentacao import concluir, contar_linhas, passo
+from saida import escrever_tabela, formato_do_arquivo, percentual
 
 # 1. Dados da Tabela 42
 dados_vendas = [
@@ -7,12 +11,21 @@ dados_vendas = [
     8, 5, 6, 8, 6, 7, 6, 5, 10, 8
 ]
 
-# 2. Criar uma Série pandas com os dados
-s_vendas = pd.Series(dados_vendas)
+# Para históricos grandes (CSV/Parquet), informe o arquivo: ele é lido em blocos
+# e a memória usada depende só do número de valores distintos
+arquivo_vendas = caminho_entrada(None)
 
-# 3. Construir a tabela de frequências
-# Contar a frequência absoluta de cada valor
-freq_abs = s_vendas.value_counts().sort_index()
+passo('carregar')
+
+# 2. Obter os dados em blocos (a lista acima é um único bloco)
+blocos_vendas = ler_blocos(arquivo_vendas) if arquivo_vendas else [dados_vendas]
+
+# 3. Construir a tabela de frequências (os blocos do arquivo são lidos durante a contagem)
+passo('calcular')
+# Contar a frequência absoluta de cada valor, somando as contagens de cada bloco
+contador = ContadorFrequencias().atualizar_blocos(blocos_vendas)
+freq_abs = contador.contagens()
+contar_linhas(contador.total)
 
 # Criar o DataFrame da tabela final
 tabela_freq = pd.DataFrame(freq_abs)
@@ -20,7 +33,7 @@ tabela_freq.columns = ['Frequência Absoluta (fi)']
 tabela_freq.index.name = 'Vendas Diárias (xi)'
 
 # Calcular a Frequência Relativa (em decimal)
-total_obs = len(dados_vendas)
+total_obs = contador.total
 tabela_freq['Frequência Relativa (fri)'] = tabela_freq['Frequência Absoluta (fi)'] / total_obs
 
 # Calcular a Frequência Acumulada
@@ -29,20 +42,29 @@ tabela_freq['Frequência Acumulada (Fi)'] = tabela_freq['Frequência Absoluta (f
 # Calcular a Frequência Relativa Acumulada
 tabela_freq['Frequência Relativa Acumulada (Fri)'] = tabela_freq['Frequência Relativa (fri)'].cumsum()
 
-# Adicionar uma linha de Total
+# Linha de Total, guardada à parte: a tabela continua só com colunas numéricas
 total_row = {
     'Frequência Absoluta (fi)': tabela_freq['Frequência Absoluta (fi)'].sum(),
     'Frequência Relativa (fri)': tabela_freq['Frequência Relativa (fri)'].sum(),
-    'Frequência Acumulada (Fi)': '',  # Não se aplica
-    'Frequência Relativa Acumulada (Fri)': '' # Não se aplica
+    # As acumuladas não se aplicam ao Total e ficam em branco
 }
-tabela_freq.loc['Total'] = total_row
 
-# Exibir a tabela formatada (opcional: converter para porcentagem para melhor visualização)
-tabela_freq_view = tabela_freq.copy()
-tabela_freq_view['Frequência Relativa (fri)'] = (tabela_freq_view['Frequência Relativa (fri)'] * 100).map('{:,.2f}%'.format)
-tabela_freq_view['Frequência Relativa Acumulada (Fri)'] = tabela_freq_view['Frequência Relativa Acumulada (Fri)'].apply(
-    lambda x: f"{x*100:.2f}%" if isinstance(x, (int, float)) else x
-)
+passo('relatorio')
+
+# Exibir a tabela com as frequências relativas em porcentagem; cada coluna é formatada
+# de uma vez e as linhas são escritas em blocos, sem copiar a tabela (ver saida.py)
+formatos = {
+    'Frequência Relativa (fri)': percentual,
+    'Frequência Relativa Acumulada (Fri)': percentual,
+}
+# Com 'arquivo_tabela' (ex.: tabela.csv, .md, .json) a tabela é gravada no arquivo, no formato da extensão
+arquivo_tabela = parametro('arquivo_tabela')
+if arquivo_tabela:
+    escrever_tabela(tabela_freq, arquivo_tabela, formato_do_arquivo(arquivo_tabela), formatos, total_row)
+    print(f"Tabela de frequências gravada em {arquivo_tabela}")
+else:
+    print("\n")
+    escrever_tabela(tabela_freq, formatos=formatos, total=total_row)
+    print("\n")
 
-print(f"\n\n{tabela_freq_view.to_string()}\n\n")
\ No newline at end of file
+concluir()
@@ -1,11 +1,18 @@
-import pandas as pd
-import numpy as np
-from scipy.stats import chi2_contingency
+from entrada import caminho_entrada, ler_excel, parametro
+from contingencia import TabelaContingencia
+from monte_carlo import qui_quadrado_monte_carlo
+from bootstrap import intervalo_bootstrap, posicoes_v_cramer, v_cramer
+from instrumentacao import concluir, contar_linhas, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Carregar e Preparar os Dados ---
+passo('carregar')
 try:
-    file_path = '/Users/plgandini/Coding/UFABC/EASG/Motivação_Empresas.xlsx'
-    df = pd.read_excel(file_path, engine="calamine")
+    file_path = caminho_entrada('/Users/plgandini/Coding/UFABC/EASG/Motivação_Empresas.xlsx')
+    # Ler apenas as colunas de códigos, já como int8
+    df = ler_excel(file_path, colunas=['Empresa', 'MotivaçãO'], numericas=['Empresa', 'MotivaçãO'],
+                   dropna=['Empresa', 'MotivaçãO'], tipos={'Empresa': 'int8', 'MotivaçãO': 'int8'},
+                   engine="calamine")
 
 except FileNotFoundError:
     print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
@@ -13,8 +20,11 @@ except FileNotFoundError:
 except Exception as e:
     print(f"Ocorreu um erro ao ler o arquivo: {e}")
     exit()
+contar_linhas(len(df))
 
-# --- PASSO 2: Mapear Códigos Numéricos para Textos ---
+# --- PASSO 2: Rótulos dos Códigos Numéricos ---
+passo('preparar', linhas=len(df))
+# Os códigos continuam inteiros; os textos só são usados na exibição das tabelas
 # Com base no diagnóstico, as colunas são 'Empresa' e 'MotivaçãO'
 col_empresa_num = 'Empresa'
 col_motivacao_num = 'MotivaçãO'
@@ -36,41 +46,57 @@ mapa_motivacao = {
     5: 'Muito Motivado'
 }
 
-# Aplicar o mapeamento para criar novas colunas com os textos
-df['Empresa'] = df[col_empresa_num].map(mapa_empresa)
-df['Grau de Motivação'] = df[col_motivacao_num].map(mapa_motivacao)
-
-# Definir a ordem correta das categorias de texto para as tabelas
-ordem_empresa = ['Bradesco', 'Fiat', 'Outra', 'Petrobras', 'Vivo'] # Ordem alfabética
-ordem_motivacao = ['Muito Desmotivado', 'Pouco Desmotivado', 'Indiferente', 'Pouco Motivado', 'Muito Motivado']
-
-df['Empresa'] = pd.Categorical(df['Empresa'], categories=ordem_empresa, ordered=True)
-df['Grau de Motivação'] = pd.Categorical(df['Grau de Motivação'], categories=ordem_motivacao, ordered=True)
+# A ordem dos códigos define a ordem das linhas/colunas nas tabelas
+ordem_empresa = [1, 2, 5, 3, 4] # Ordem alfabética dos nomes
+ordem_motivacao = [1, 2, 3, 4, 5]
+
+# Tabela observada montada uma única vez, direto dos códigos
+tabela = TabelaContingencia.de_codigos(
+    df[col_empresa_num].to_numpy(), df[col_motivacao_num].to_numpy(), ordem_empresa, ordem_motivacao,
+    rotulos_linha=[mapa_empresa[c] for c in ordem_empresa], rotulos_coluna=[mapa_motivacao[c] for c in ordem_motivacao],
+    nome_linhas='Empresa', nome_colunas='Grau de Motivação',
+)
+
+# Qui-Quadrado, p-valor por simulação e intervalo do V, calculados antes de qualquer exibição
+# (simulação e bootstrap são lidos do cache de resultados quando a tabela não mudou)
+passo('calcular', linhas=len(df))
+chi2, p_valor, dof, esperadas_array = tabela.qui_quadrado()
+# p-valor por simulação (margens fixas), válido mesmo com frequências esperadas pequenas
+# (EASG_PARAMETROS {"replicas": N} muda o número de réplicas; 0 pula a simulação)
+replicas = parametro('replicas', 10_000)
+monte_carlo = memoizar(qui_quadrado_monte_carlo, tabela.observadas, replicas=replicas, semente=0) if replicas else None
+# Intensidade da associação: V de Cramér corrigido de viés, com intervalo de 95% por percentil
+# (o BCa do V sem correção pode deixar a estimativa fora do intervalo perto da independência)
+posicoes = posicoes_v_cramer(df[col_empresa_num].to_numpy(), df[col_motivacao_num].to_numpy(), ordem_empresa, ordem_motivacao)
+# (EASG_PARAMETROS {"reamostras": N} muda o número de reamostras; 0 pula o intervalo)
+reamostras = parametro('reamostras', 10_000)
+ic_v = memoizar(intervalo_bootstrap, posicoes, v_cramer(ordem_empresa, ordem_motivacao, corrigido=True),
+                metodo='percentil', reamostras=reamostras, semente=0) if reamostras else None
 
 # --- PASSO 3: Respostas para os Itens ---
+passo('relatorio')
 
 # a) Construção das Tabelas de Contingência
 print("--- a) Tabelas de Contingência ---")
 
-tabela_obs = pd.crosstab(df['Empresa'], df['Grau de Motivação'])
+tabela_obs = tabela.quadro()
 print("\n1. Tabela de Frequências Absolutas (Observadas):\n")
 print(tabela_obs)
 
-total_geral = tabela_obs.sum().sum()
-tabela_rel_total = (tabela_obs / total_geral) * 100
+total_geral = tabela.total
+tabela_rel_total = tabela.quadro(tabela.rel_total)
 print("\n2. Tabela de Frequências Relativas (%) - Em relação ao Total Geral:\n")
 print(tabela_rel_total.round(2))
 
-tabela_rel_linha = pd.crosstab(df['Empresa'], df['Grau de Motivação'], normalize='index') * 100
+tabela_rel_linha = tabela.quadro(tabela.rel_linha)
 print("\n3. Tabela de Frequências Relativas (%) - Em relação ao Total de Cada Linha:\n")
 print(tabela_rel_linha.round(2))
 
-tabela_rel_coluna = pd.crosstab(df['Empresa'], df['Grau de Motivação'], normalize='columns') * 100
+tabela_rel_coluna = tabela.quadro(tabela.rel_coluna)
 print("\n4. Tabela de Frequências Relativas (%) - Em relação ao Total de Cada Coluna:\n")
 print(tabela_rel_coluna.round(2))
 
-chi2, p_valor, dof, esperadas_array = chi2_contingency(tabela_obs)
-tabela_esp = pd.DataFrame(esperadas_array, index=tabela_obs.index, columns=tabela_obs.columns)
+tabela_esp = tabela.quadro(esperadas_array)
 print("\n5. Tabela de Frequências Esperadas:\n")
 print(tabela_esp.round(2))
 print("-" * 50)
@@ -113,10 +139,16 @@ print(f"   - Hipótese Alternativa (H1): As variáveis são dependentes (associa
 print(f"\n   - Estatística Qui-Quadrado (χ²): {chi2:.4f}")
 print(f"   - Graus de Liberdade (dof): {dof}")
 print(f"   - p-valor: {p_valor:.10f}")
+if monte_carlo is not None:
+    print(f"   - p-valor de Monte Carlo ({monte_carlo.replicas} réplicas): {monte_carlo.p_valor:.6f} (erro padrão {monte_carlo.erro_padrao:.6f})")
+if ic_v is not None:
+    print(f"   - V de Cramér (corrigido): {ic_v.estimativa:.4f} (IC 95%: [{ic_v.inferior:.4f} ; {ic_v.superior:.4f}])")
 print(f"\n   - Decisão (com alpha = {alpha}):")
 if p_valor < alpha:
     print(f"     Como o p-valor ({p_valor:.10f}) é menor que o nível de significância ({alpha}), rejeitamos a Hipótese Nula.")
     print("     Conclusão: Existe uma associação estatisticamente significativa entre a empresa e o grau de motivação dos funcionários.")
 else:
     print(f"     Como o p-valor ({p_valor:.10f}) é maior ou igual ao nível de significância ({alpha}), não rejeitamos a Hipótese Nula.")
-    print("     Conclusão: Não há evidência estatística para afirmar que existe uma associação entre as variáveis.")
\ No newline at end of file
+    print("     Conclusão: Não há evidência estatística para afirmar que existe uma associação entre as variáveis.")
+
+concluir()
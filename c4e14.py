@@ -1,8 +1,14 @@
 import pandas as pd
-from scipy.stats import chi2_contingency
+import numpy as np
+from contingencia import qui_quadrado_lote
+from entrada import parametro
+from monte_carlo import qui_quadrado_monte_carlo
+from instrumentacao import concluir, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Criar a Tabela de Frequências Observadas ---
 # Inserimos os dados da tabela fornecida na questão em um DataFrame do Pandas.
+passo('preparar')
 
 data = {
     'SP': [15, 25, 40, 30],
@@ -18,7 +24,10 @@ print(tabela_observada)
 
 
 # --- PASSO 2: Realizar o Teste Qui-Quadrado ---
-chi2, p_valor, dof, esperadas = chi2_contingency(tabela_observada)
+# O teste em lote aceita uma pilha de tabelas; aqui a pilha tem uma só tabela
+passo('calcular')
+resultado = qui_quadrado_lote(tabela_observada.to_numpy()[np.newaxis])
+chi2, p_valor, dof, esperadas = resultado.estatistica[0], resultado.p_valor[0], resultado.dof, resultado.esperadas[0]
 
 # Formatar a tabela de frequências esperadas para melhor visualização
 tabela_esperada = pd.DataFrame(esperadas, index=index, columns=tabela_observada.columns)
@@ -29,6 +38,7 @@ print(tabela_esperada.round(2))
 
 
 # --- PASSO 3: Interpretar os Resultados do Teste ---
+passo('relatorio')
 print("\n--- Análise do Teste Qui-Quadrado ---")
 
 # Definição das hipóteses
@@ -41,6 +51,16 @@ print("\nResultados do Teste:")
 print(f"  - Valor da Estatística Qui-Quadrado (χ²): {chi2:.4f}")
 print(f"  - Graus de Liberdade: {dof}")
 print(f"  - P-valor: {p_valor:.4f}")
+# p-valor por simulação (margens fixas), válido mesmo com frequências esperadas pequenas
+passo('calcular')
+# (EASG_PARAMETROS {"replicas": N} muda o número de réplicas; 0 pula a simulação)
+replicas = parametro('replicas', 10_000)
+monte_carlo = memoizar(qui_quadrado_monte_carlo, tabela_observada.to_numpy(), replicas=replicas, semente=0) if replicas else None
+passo('relatorio')
+if monte_carlo is not None:
+    print(f"  - P-valor de Monte Carlo ({monte_carlo.replicas} réplicas): {monte_carlo.p_valor:.4f} (erro padrão {monte_carlo.erro_padrao:.4f})")
+if resultado.viola_regra[0]:
+    print(f"  - Atenção: {resultado.frac_abaixo[0]:.0%} das frequências esperadas são menores que 5; o p-valor assintótico pode não ser confiável.")
 
 # Decisão estatística
 alpha = 0.05
@@ -68,4 +88,6 @@ if p_valor < alpha:
 
 else:
     print(f"  - Como o p-valor ({p_valor:.4f}) é MAIOR ou IGUAL a {alpha}, NÃO REJEITAMOS a Hipótese Nula.")
-    print("  - Conclusão: Não há evidência estatística suficiente para afirmar que existe uma associação entre a localidade de origem e o porte da empresa.")
\ No newline at end of file
+    print("  - Conclusão: Não há evidência estatística suficiente para afirmar que existe uma associação entre a localidade de origem e o porte da empresa.")
+
+concluir()
@@ -1,13 +1,20 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import pearsonr
+from entrada import caminho_entrada, ler_excel, parametro
+from correlacao import MatrizCorrelacao
+from bootstrap import intervalo_bootstrap, pearson
+from renderizacao import FilaGraficos
+import graficos
+from instrumentacao import concluir, contar_linhas, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Carregar e Preparar os Dados ---
+passo('carregar')
 try:
-    file_path = '/Users/plgandini/Coding/UFABC/EASG/Avaliação_Alunos.xlsx'
-    df = pd.read_excel(file_path, engine="calamine")
+    file_path = caminho_entrada('/Users/plgandini/Coding/UFABC/EASG/Avaliação_Alunos.xlsx')
+    # As colunas de notas (posições 1 a 4) são convertidas para float32 e as linhas
+    # incompletas removidas uma única vez, ao gerar o cache da planilha
+    df = ler_excel(file_path, colunas=[0, 1, 2, 3, 4], numericas=[1, 2, 3, 4], dropna=[1, 2, 3, 4],
+                   tipos={1: 'float32', 2: 'float32', 3: 'float32', 4: 'float32'}, engine="calamine")
 
 except FileNotFoundError:
     print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
@@ -15,7 +22,9 @@ except FileNotFoundError:
 except Exception as e:
     print(f"Ocorreu um erro ao ler o arquivo: {e}")
     exit()
+contar_linhas(len(df))
 
+passo('preparar', linhas=len(df))
 # --- CORREÇÃO: Renomear as colunas para um padrão consistente ---
 # Com base no seu diagnóstico, os nomes originais são ['Nome', 'Po', 'EstatíStica', 'OperaçõEs', 'FinançAs']
 # Vamos renomeá-los para os nomes que o resto do script espera.
@@ -27,75 +36,76 @@ except ValueError:
     pass
 
 
-# Garantir que todas as colunas de notas são numéricas
+# As colunas de notas já chegam numéricas e sem linhas incompletas (ver ler_excel)
 colunas_de_notas = ['Pesquisa Operacional', 'Estatística', 'Gestão de Operações', 'Finanças']
-for col in colunas_de_notas:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
 
-df.dropna(subset=colunas_de_notas, inplace=True)
 
+# --- PASSO 2: Calcular a Correlação de Todos os Pares de Disciplinas ---
+# Uma única matriz de correlação (um produto de matrizes) cobre todos os pares;
+# p-valores e interpretações são calculados para a matriz inteira de uma vez.
+# Matriz e intervalos bootstrap vêm do cache de resultados quando as notas não mudaram.
+passo('calcular', linhas=len(df))
+colunas_presentes = [col for col in colunas_de_notas if col in df.columns]
+matriz = memoizar(MatrizCorrelacao, df[colunas_presentes])
+pares = matriz.pares(alpha=0.05)
 
-# --- PASSO 2: Definir os pares de variáveis para análise ---
+# --- PASSO 3: Plotar os pares em destaque ---
+# Os gráficos são enviados antes da exibição dos resultados e desenhados em
+# paralelo (ver renderizacao.py) enquanto os intervalos são calculados
+passo('enviar_graficos')
+fila_graficos = FilaGraficos()
 pares_para_analise = [
     ('Pesquisa Operacional', 'Estatística'),
     ('Gestão de Operações', 'Finanças'),
     ('Pesquisa Operacional', 'Gestão de Operações')
 ]
 
-# --- PASSO 3: Iterar, Calcular e Plotar para cada par ---
+for var_x, var_y in pares_para_analise:
 
-print("--- Análise de Correlação de Pearson ---")
-
-for i, (var_x, var_y) in enumerate(pares_para_analise):
-    
     # Verificar se as colunas existem no DataFrame
-    if var_x not in df.columns or var_y not in df.columns:
+    if var_x not in colunas_presentes or var_y not in colunas_presentes:
         print(f"\nAVISO: Uma ou ambas as colunas '{var_x}' e '{var_y}' não foram encontradas no arquivo após a renomeação.")
         continue
 
-    # Extrair os dados
+    # Extrair os dados e o resultado do par já calculado na matriz
     x_data = df[var_x]
     y_data = df[var_y]
-    
-    # Calcular o Coeficiente de Correlação de Pearson
-    r, p_valor = pearsonr(x_data, y_data)
-    
-    # Interpretação da força da correlação
-    if abs(r) >= 0.7:
-        forca = "Forte"
-    elif abs(r) >= 0.4:
-        forca = "Moderada"
-    else:
-        forca = "Fraca"
-        
-    # Interpretação da significância
-    significancia = "estatisticamente significativa" if p_valor < 0.05 else "não é estatisticamente significativa"
-
-    print(f"\nAnálise do Par {chr(97+i)}): '{var_x}' vs '{var_y}'")
-    print(f"  - Coeficiente de Correlação de Pearson (r): {r:.4f}")
-    print(f"  - P-valor: {p_valor:.4f}")
-    print(f"  - Interpretação: Há uma correlação {forca}, {'positiva' if r > 0 else 'negativa'}, e que {significancia}.")
-    
-    # Construir o Diagrama de Dispersão
-    plt.figure(figsize=(8, 6))
-    sns.regplot(x=x_data, y=y_data, ci=None, scatter_kws={'alpha':0.6, 'color':'#005A9C'}, line_kws={'color':'#D43F4F'})
-    
-    plt.title(f'Diagrama de Dispersão: {var_x} vs {var_y}', fontsize=16)
-    plt.xlabel(f'Nota de {var_x}', fontsize=12)
-    plt.ylabel(f'Nota de {var_y}', fontsize=12)
-    
-    # Adicionar o valor da correlação no gráfico
-    plt.text(0.05, 0.95, f'r = {r:.4f}\np-valor = {p_valor:.4f}', 
-             transform=plt.gca().transAxes, fontsize=12,
-             verticalalignment='top', bbox=dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.5))
-             
-    plt.grid(True)
-    
-    # Salvar o gráfico
+    i, j = colunas_presentes.index(var_x), colunas_presentes.index(var_y)
+    r, p_valor = matriz.r[i, j], matriz.p[i, j]
+
+    # Diagrama de dispersão com a correlação anotada, desenhado em paralelo com os demais
     nome_arquivo = f"dispersao_{var_x.replace(' ', '')}_vs_{var_y.replace(' ', '')}.png"
-    plt.savefig(nome_arquivo)
-    plt.close() # Fecha a figura para não exibir todas de uma vez
+    # (com muitos alunos, vira um raster de densidade com a reta de regressão; ver graficos.py)
+    fila_graficos.enviar(graficos.especificar_dispersao(
+        nome_arquivo, x_data, y_data, f'Diagrama de Dispersão: {var_x} vs {var_y}', f'Nota de {var_x}',
+        f'Nota de {var_y}', rotulos=df['Nome'], rotular_todos=False, anotacao=f'r = {r:.4f}\np-valor = {p_valor:.4f}',
+        scatter_kws={'alpha': 0.6, 'color': '#005A9C'}, line_kws={'color': '#D43F4F'}))
+
+# Intervalos bootstrap de r de cada par, calculados enquanto os gráficos são desenhados
+passo('calcular', linhas=len(df))
+# (EASG_PARAMETROS {"reamostras": N} muda o número de reamostras; 0 pula os intervalos)
+reamostras = parametro('reamostras', 10_000)
+intervalos = [memoizar(intervalo_bootstrap, (df[par.var_x].to_numpy(np.float64), df[par.var_y].to_numpy(np.float64)),
+                       pearson, reamostras=reamostras, semente=0) if reamostras else None
+              for par in pares.itertuples(index=False)]
+
+# --- PASSO 4: Exibir os Resultados de Todos os Pares ---
+passo('relatorio', linhas=len(df))
+print("--- Análise de Correlação de Pearson ---")
+
+for i, par in enumerate(pares.itertuples(index=False)):
+    print(f"\nAnálise do Par {i + 1}): '{par.var_x}' vs '{par.var_y}'")
+    print(f"  - Coeficiente de Correlação de Pearson (r): {par.r:.4f}")
+    ic_r = intervalos[i]
+    if ic_r is not None:
+        print(f"  - IC 95% de r (Bootstrap BCa): [{ic_r.inferior:.4f} ; {ic_r.superior:.4f}]")
+    print(f"  - P-valor: {par.p_valor:.4f}")
+    print(f"  - Interpretação: Há uma correlação {par.forca}, {par.direcao}, e que {par.significancia}.")
+
+# --- PASSO 5: Aguardar os Gráficos ---
+passo('graficos')
+fila_graficos.esperar()
+concluir()
 
 print("\n--- Gráficos Gerados ---")
-print("Os diagramas de dispersão para cada par foram salvos como arquivos .png.")
\ No newline at end of file
+print("Os diagramas de dispersão dos pares em destaque foram salvos como arquivos .png.")
\ No newline at end of file
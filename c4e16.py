@@ -1,13 +1,22 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy.stats import pearsonr
+from entrada import caminho_entrada, ler_excel, parametro
+from influencia import influencia, ordem_influencia
+from bootstrap import intervalo_bootstrap, pearson
+from renderizacao import FilaGraficos
+import graficos
+from instrumentacao import concluir, contar_linhas, passo
+from memoizacao import memoizar
 
 # --- PASSO 1: Carregar e Preparar os Dados ---
+passo('carregar')
 try:
-    file_path = '/Users/plgandini/Coding/UFABC/EASG/Supermercados_Brasileiros.xlsx'
-    df = pd.read_excel(file_path, engine="calamine")
+    file_path = caminho_entrada('/Users/plgandini/Coding/UFABC/EASG/Supermercados_Brasileiros.xlsx')
+    # Nomes limpos, Faturamento/Lojas numéricos e linhas incompletas removidas
+    # uma única vez, ao gerar o cache da planilha
+    df = ler_excel(file_path, colunas=['Empresa', 'Faturamento', 'Lojas'], tipos={'Lojas': 'int32'},
+                   engine="calamine", limpar_nomes=True,
+                   numericas=['Faturamento', 'Lojas'], dropna=['Faturamento', 'Lojas'])
 
 except FileNotFoundError:
     print(f"Erro: O arquivo '{file_path}' não foi encontrado.")
@@ -15,82 +24,106 @@ except FileNotFoundError:
 except Exception as e:
     print(f"Ocorreu um erro ao ler o arquivo: {e}")
     exit()
+contar_linhas(len(df))
 
 # --- CORREÇÃO: Usar os nomes de coluna corretos identificados pelo diagnóstico ---
-df.columns = df.columns.str.strip() # Limpa espaços extras
+# (os espaços extras dos nomes já foram removidos na leitura)
 # Definir os nomes corretos das colunas que vamos usar
 col_empresa = 'Empresa'
 col_faturamento = 'Faturamento'
 col_lojas = 'Lojas'
 
-# Garantir que os dados são numéricos
-df[col_faturamento] = pd.to_numeric(df[col_faturamento], errors='coerce')
-df[col_lojas] = pd.to_numeric(df[col_lojas], errors='coerce')
-df.dropna(subset=[col_faturamento, col_lojas], inplace=True)
-
+passo('calcular', linhas=len(df))
+# Influência de cada supermercado sobre a correlação/regressão, deixando um de fora por vez:
+# todas as correlações saem das mesmas somas (n, Σx, Σy, Σx², Σy², Σxy), sem recalcular do zero
+# (tabela e intervalos bootstrap vêm do cache de resultados quando os dados não mudaram)
+tabela_influencia = memoizar(influencia, df[col_lojas], df[col_faturamento], rotulos=df[col_empresa].to_numpy(), ordenar=False)
+# Pontuação de influência (|Δr|, Cook e alavancagem, ver influencia.py) na ordem das linhas:
+# escolhe os pontos rotulados nos gráficos com muitos pontos
+pontuacao = tabela_influencia['pontuacao'].to_numpy()
+ordem = ordem_influencia(tabela_influencia)
+# O ponto com comportamento diferente é o de maior pontuação; selecionado pela posição,
+# pois nomes de empresa podem se repetir
+posicao_outlier = ordem[0]
+outlier_nome = df[col_empresa].iloc[posicao_outlier]
+r_sem_outlier = tabela_influencia['r_sem'].iloc[posicao_outlier]
+tabela_influencia = tabela_influencia.iloc[ordem]
+# Conjunto sem o outlier e intervalos bootstrap de r com e sem ele, calculados antes da exibição
+mantidos = np.ones(len(df), dtype=bool)
+mantidos[posicao_outlier] = False
+df_sem_outlier = df[mantidos]
+# (EASG_PARAMETROS {"reamostras": N} muda o número de reamostras; 0 pula os intervalos)
+reamostras = parametro('reamostras', 10_000)
+ic_completo = ic_sem = None
+if reamostras:
+    ic_completo = memoizar(intervalo_bootstrap, (df[col_faturamento].to_numpy(np.float64), df[col_lojas].to_numpy(np.float64)), pearson, reamostras=reamostras, semente=0)
+    ic_sem = memoizar(intervalo_bootstrap, (df_sem_outlier[col_faturamento].to_numpy(np.float64), df_sem_outlier[col_lojas].to_numpy(np.float64)), pearson, reamostras=reamostras, semente=0)
 
 # --- PASSO 2: Análise com Todos os Dados (a, b, c) ---
+passo('analise_completa', linhas=len(df))
 
 print("--- Análise com Todos os Dados ---")
 
-# a) Elaborar o diagrama de dispersão
-plt.figure(figsize=(10, 7))
-sns.regplot(data=df, x=col_lojas, y=col_faturamento, ci=None,
-            scatter_kws={'s': 70, 'alpha': 0.7, 'edgecolor': 'w'}, line_kws={'color': 'red', 'linestyle': '--'})
-# Adicionar rótulos para cada ponto
-for i, row in df.iterrows():
-    plt.text(row[col_lojas] + 10, row[col_faturamento], row[col_empresa], fontsize=9)
-
-plt.title('Diagrama de Dispersão: Faturamento vs. Nº de Lojas (Todos os Dados)', fontsize=16)
-plt.xlabel('Número de Lojas', fontsize=12)
-plt.ylabel('Faturamento', fontsize=12)
-plt.grid(True)
-plt.savefig('dispersao_completa.png')
-plt.close()
+# a) Elaborar o diagrama de dispersão (desenhado em paralelo, ver renderizacao.py)
+fila_graficos = FilaGraficos()
+estilo_pontos = {'s': 70, 'alpha': 0.7, 'edgecolor': 'w'}
+estilo_reta = {'color': 'red', 'linestyle': '--'}
+fila_graficos.enviar(graficos.especificar_dispersao(
+    'dispersao_completa.png', df[col_lojas], df[col_faturamento],
+    'Diagrama de Dispersão: Faturamento vs. Nº de Lojas (Todos os Dados)', 'Número de Lojas', 'Faturamento',
+    rotulos=df[col_empresa], pontuacao=pontuacao, deslocamento=10, scatter_kws=estilo_pontos, line_kws=estilo_reta,
+    tamanho=(10, 7)))
 
 # b) Análise visual da dependência
 print("\nb) Análise Visual da Dependência:")
-print("   - Sim, o diagrama de dispersão sugere uma tendência positiva: em geral, quanto maior o número de lojas, maior o faturamento. No entanto, um ponto (Pão de Açúcar) se destaca com um faturamento muito superior aos demais.")
+print(f"   - Sim, o diagrama de dispersão sugere uma tendência positiva: em geral, quanto maior o número de lojas, maior o faturamento. No entanto, um ponto ({outlier_nome}) se destaca dos demais, afastado da tendência do grupo.")
 
 # c) Calcular o coeficiente de correlação de Pearson
 r_completo, p_completo = pearsonr(df[col_faturamento], df[col_lojas])
 print("\nc) Coeficiente de Correlação de Pearson (Todos os Dados):")
 print(f"   - Coeficiente (r): {r_completo:.4f}")
+if ic_completo is not None:
+    print(f"   - IC 95% de r (Bootstrap BCa): [{ic_completo.inferior:.4f} ; {ic_completo.superior:.4f}]")
 print(f"   - Interpretação: Existe uma correlação positiva moderada a forte entre faturamento e número de lojas. A correlação é estatisticamente significativa.")
 print("-" * 50)
 
 
 # --- PASSO 3: Análise Sem o Outlier (d) ---
+passo('analise_sem_outlier')
 
-# d) Identificar e remover o conjunto de dados com comportamento diferente
-outlier_nome = 'Pão de Açúcar'
-df_sem_outlier = df[df[col_empresa] != outlier_nome]
+# d) Conjunto de dados sem o de comportamento diferente (separado no PASSO 1)
+contar_linhas(len(df_sem_outlier))
 
-print("\n--- Análise Sem o Outlier ('Pão de Açúcar') ---")
+print(f"\n--- Análise Sem o Outlier ('{outlier_nome}') ---")
+print("\nPontos mais influentes (distância de Cook, alavancagem e variação de r ao removê-los):")
+for empresa, linha in tabela_influencia.head(3).iterrows():
+    print(f"   - {empresa}: Cook = {linha['cook']:.4f} | Alavancagem = {linha['alavancagem']:.4f} | Δr = {linha['delta_r']:+.4f}")
 
 # d.1) Elaborar novamente o gráfico de dispersão
-plt.figure(figsize=(10, 7))
-sns.regplot(data=df_sem_outlier, x=col_lojas, y=col_faturamento, ci=None,
-            scatter_kws={'s': 70, 'alpha': 0.7, 'edgecolor': 'w'}, line_kws={'color': 'red', 'linestyle': '--'})
-for i, row in df_sem_outlier.iterrows():
-    plt.text(row[col_lojas] + 5, row[col_faturamento], row[col_empresa], fontsize=9)
-    
-plt.title('Diagrama de Dispersão: Faturamento vs. Nº de Lojas (Sem Outlier)', fontsize=16)
-plt.xlabel('Número de Lojas', fontsize=12)
-plt.ylabel('Faturamento', fontsize=12)
-plt.grid(True)
-plt.savefig('dispersao_sem_outlier.png')
-plt.close()
-
-# d.2) Recalcular o coeficiente de correlação
-r_sem_outlier, p_sem_outlier = pearsonr(df_sem_outlier[col_faturamento], df_sem_outlier[col_lojas])
+fila_graficos.enviar(graficos.especificar_dispersao(
+    'dispersao_sem_outlier.png', df_sem_outlier[col_lojas], df_sem_outlier[col_faturamento],
+    'Diagrama de Dispersão: Faturamento vs. Nº de Lojas (Sem Outlier)', 'Número de Lojas', 'Faturamento',
+    rotulos=df_sem_outlier[col_empresa], pontuacao=pontuacao[mantidos], deslocamento=5, scatter_kws=estilo_pontos,
+    line_kws=estilo_reta, tamanho=(10, 7)))
+
+# d.2) Coeficiente de correlação sem o outlier (já obtido na análise de influência)
 print(f"\nd) Coeficiente de Correlação de Pearson (Sem o Outlier):")
 print(f"   - Novo Coeficiente (r): {r_sem_outlier:.4f}")
+if ic_sem is not None:
+    print(f"   - IC 95% de r (Bootstrap BCa): [{ic_sem.inferior:.4f} ; {ic_sem.superior:.4f}]")
 
 print("\n   - Comparação e Conclusão:")
-print(f"   - Ao remover o 'Pão de Açúcar', o coeficiente de correlação AUMENTOU de {r_completo:.4f} para {r_sem_outlier:.4f}.")
-print("   - Isso indica que a relação linear entre o número de lojas e o faturamento para o *restante* do grupo é ainda MAIS FORTE. O Pão de Açúcar, com seu faturamento altíssimo, estava 'distorcendo' a força da correlação linear do conjunto.")
+if r_sem_outlier > r_completo:
+    print(f"   - Ao remover o '{outlier_nome}', o coeficiente de correlação AUMENTOU de {r_completo:.4f} para {r_sem_outlier:.4f}.")
+    print(f"   - Isso indica que a relação linear entre o número de lojas e o faturamento para o *restante* do grupo é ainda MAIS FORTE. O {outlier_nome} estava 'distorcendo' a força da correlação linear do conjunto.")
+else:
+    print(f"   - Ao remover o '{outlier_nome}', o coeficiente de correlação DIMINUIU de {r_completo:.4f} para {r_sem_outlier:.4f}.")
+    print(f"   - Isso indica que o {outlier_nome} reforçava a correlação linear do conjunto; sem ele, a relação do *restante* do grupo é MAIS FRACA.")
+
+passo('graficos')
+fila_graficos.esperar()
+concluir()
 
 print("\n\n--- GRÁFICOS GERADOS ---")
 print("1. 'dispersao_completa.png' (Análise com todos os supermercados)")
-print("2. 'dispersao_sem_outlier.png' (Análise sem o Pão de Açúcar)")
\ No newline at end of file
+print(f"2. 'dispersao_sem_outlier.png' (Análise sem o {outlier_nome})")
\ No newline at end of file
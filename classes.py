@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from momentos import Momentos
+from quantis import Quantis, SketchQuantis
+from saida import fixo
+
+# --- Distribuição de Frequências em Classes (dados agrupados) ---
+# Cada valor recebe o índice da sua classe aritmeticamente, com
+# floor((x - limite_inferior) / largura), e as classes são contadas com um único
+# np.bincount. Para volumes grandes o cálculo roda em duas passagens sobre os
+# blocos: a primeira obtém n, mínimo, máximo (e desvio/IQR, se a regra pedir) e
+# a segunda conta as classes.
+#
+# A largura das classes é a da regra (amplitude / k), arredondada para cima na
+# precisão dos dados (o menor número de casas decimais, até CASAS_MAXIMAS, que
+# representa todos os valores): dados inteiros têm largura inteira, e dados
+# em [0, 1) não caem todos na primeira classe. O primeiro limite é o mínimo
+# arredondado para baixo nessa mesma precisão.
+
+
+# Regras para o número de classes (k) a partir das estatísticas da amostra
+def _sturges(n, amplitude, desvio, iqr):
+    return int(1 + 3.322 * np.log10(n))
+
+
+def _raiz(n, amplitude, desvio, iqr):
+    return int(np.ceil(np.sqrt(n)))
+
+
+def _scott(n, amplitude, desvio, iqr):
+    largura = 3.49 * desvio * n ** (-1 / 3)
+    return int(np.ceil(amplitude / largura)) if largura > 0 else 1
+
+
+def _freedman_diaconis(n, amplitude, desvio, iqr):
+    largura = 2 * iqr * n ** (-1 / 3)
+    return int(np.ceil(amplitude / largura)) if largura > 0 else 1
+
+
+CASAS_MAXIMAS = 6
+
+REGRAS = {
+    'sturges': _sturges,
+    'raiz': _raiz,
+    'scott': _scott,
+    'freedman-diaconis': _freedman_diaconis,
+}
+
+
+def numero_classes(regra, n, amplitude, desvio=None, iqr=None):
+    if regra not in REGRAS:
+        raise ValueError(f"Regra '{regra}' desconhecida. Use uma de: {', '.join(REGRAS)}.")
+    return max(1, REGRAS[regra](n, amplitude, desvio, iqr))
+
+
+def casas_decimais(dados, maximo=CASAS_MAXIMAS):
+    """Menor número de casas decimais (até `maximo`) com que todos os valores finitos são escritos."""
+    dados = np.asarray(dados, dtype=np.float64)
+    dados = dados[np.isfinite(dados)]
+    for casas in range(maximo):
+        if np.allclose(np.round(dados, casas), dados, rtol=1e-12, atol=0):
+            return casas
+    return maximo
+
+
+def limites_classes(minimo, maximo, k, casas=0):
+    """Limites das k classes: largura da regra, arredondada para cima em `casas` decimais.
+
+    O primeiro limite é o mínimo arredondado para baixo em `casas` decimais. O
+    número de classes é o necessário para cobrir o máximo com essa largura: mais
+    que k se o primeiro limite recua, menos se o arredondamento alarga as classes.
+    """
+    unidade = 10.0 ** -casas
+    # round(..., 9): quocientes como 7.000000001 (erro de representação) não sobem uma unidade
+    largura = np.ceil(round((maximo - minimo) / k / unidade, 9)) * unidade
+    if largura == 0:
+        largura = unidade
+    limite_inferior = np.floor(round(minimo / unidade, 9)) * unidade
+    k = int(np.floor(round((maximo - limite_inferior) / largura, 9))) + 1
+    return [round(limite_inferior + i * largura, casas) for i in range(k + 1)]
+
+
+def contar_classes(dados, bins):
+    """Frequência absoluta de cada classe [bins[i], bins[i+1]) em uma passagem vetorizada."""
+    dados = np.asarray(dados, dtype=np.float64)
+    bins = np.asarray(bins, dtype=np.float64)
+    k = len(bins) - 1
+    largura = bins[1] - bins[0]
+    indices = np.floor((dados - bins[0]) / largura)
+    validos = (indices >= -1) & (indices <= k)
+    dados, indices = dados[validos], indices[validos].astype(np.intp)
+    # Larguras decimais (0.1) não são exatas em binário: valores sobre um limite
+    # podem cair na classe vizinha, então o índice é conferido com os limites
+    indices += dados >= bins[np.clip(indices + 1, 0, k)]
+    indices -= dados < bins[np.clip(indices, 0, k)]
+    dentro = (indices >= 0) & (indices < k)
+    return np.bincount(indices[dentro], minlength=k)
+
+
+def estatisticas_em_blocos(blocos, regra='sturges'):
+    """Primeira passagem: n, mínimo, máximo, casas decimais e, se a regra exigir, desvio-padrão e IQR."""
+    momentos = Momentos()
+    sketch = SketchQuantis() if regra == 'freedman-diaconis' else None
+    casas = 0
+    for bloco in blocos:
+        momentos = momentos + Momentos.de_array(bloco)
+        casas = max(casas, casas_decimais(bloco))
+        if sketch is not None:
+            sketch.atualizar(bloco)
+    iqr = sketch.cercas()[2] if sketch is not None else None
+    return momentos, iqr, casas
+
+
+def classes_em_blocos(abrir_blocos, regra='sturges'):
+    """Contagem em duas passagens; `abrir_blocos()` deve devolver um novo iterável a cada chamada."""
+    momentos, iqr, casas = estatisticas_em_blocos(abrir_blocos(), regra)
+    k = numero_classes(regra, momentos.n, momentos.amplitude, momentos.desvio_padrao(), iqr)
+    bins = limites_classes(momentos.minimo, momentos.maximo, k, casas)
+    contagens = np.zeros(k, dtype=np.int64)
+    for bloco in abrir_blocos():
+        contagens += contar_classes(bloco, bins)
+    return bins, contagens, momentos.n
+
+
+def classes_de_array(dados, regra='sturges'):
+    """Versão em memória: mesma tabela, com desvio e IQR exatos."""
+    dados = np.asarray(dados, dtype=np.float64)
+    momentos = Momentos.de_array(dados)
+    iqr = Quantis(dados).cercas()[2] if regra == 'freedman-diaconis' else None
+    k = numero_classes(regra, momentos.n, momentos.amplitude, momentos.desvio_padrao(), iqr)
+    bins = limites_classes(momentos.minimo, momentos.maximo, k, casas_decimais(dados))
+    return bins, contar_classes(dados, bins), momentos.n
+
+
+def blocos_de_array(dados, tamanho_bloco=10_000_000):
+    """Fatia um array (ex.: np.load(..., mmap_mode='r')) em blocos sem copiá-lo."""
+    for inicio in range(0, len(dados), tamanho_bloco):
+        yield dados[inicio:inicio + tamanho_bloco]
+
+
+def tabela_classes(bins, contagens, n, nome_classes='Classes'):
+    """Tabela de distribuição com ponto médio, frequências relativas e acumuladas."""
+    bins = np.asarray(bins, dtype=np.float64)
+    casas = max(1, casas_decimais(bins))
+    tabela = pd.DataFrame({
+        nome_classes: np.char.add(np.char.add(fixo(bins[:-1], casas), ' |-- '), fixo(bins[1:], casas)),
+        'Ponto Médio (xi)': (bins[:-1] + bins[1:]) / 2,
+        'Frequência Absoluta (fi)': contagens,
+    })
+    tabela['Frequência Relativa (fri) %'] = (tabela['Frequência Absoluta (fi)'] / n) * 100
+    tabela['Frequência Acumulada (Fi)'] = tabela['Frequência Absoluta (fi)'].cumsum()
+    tabela['Freq. Rel. Acumulada (Fri) %'] = tabela['Frequência Relativa (fri) %'].cumsum()
+    return tabela
@@ -0,0 +1,33 @@
+import numpy as np
+
+# --- Medidas em float32 sem Perder o Valor Decimal ---
+# No modo compacto (ver entrada.py), uma coluna de medidas só vira float32
+# quando todos os seus valores têm até 6 algarismos significativos (o que o
+# float32 sempre distingue). Assim o decimal original pode ser restaurado
+# exatamente: 12.3 guardado como float32 é 12.300000190734863, e arredondado
+# de volta a 6 algarismos volta a ser o float64 12.3, o mesmo de uma leitura
+# sem compactação. Os cálculos restauram bloco a bloco e acumulam em float64,
+# com resultados iguais aos dos dados originais.
+
+ALGARISMOS = 6  # algarismos decimais que o float32 sempre preserva (FLT_DIG)
+
+
+def para_float64(valores):
+    """Valores em float64; float32 volta ao decimal de até 6 algarismos significativos que o originou."""
+    valores = np.asarray(valores)
+    if valores.dtype != np.float32:
+        return valores.astype(np.float64, copy=False)
+    dobro = valores.astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expoente = ALGARISMOS - 1 - np.floor(np.log10(np.abs(dobro)))
+    expoente = np.where(np.isfinite(expoente), expoente, 0)
+    # Potências de 10 inteiras e exatas: inteiro / 10^k é o float64 mais próximo do decimal
+    potencia = 10.0 ** np.abs(expoente)
+    return np.where(expoente >= 0, np.round(dobro * potencia) / potencia, np.round(dobro / potencia) * potencia)
+
+
+def cabe_em_float32(valores):
+    """True se todos os valores (float64) voltam exatamente de float32 com `para_float64`."""
+    valores = np.asarray(valores, dtype=np.float64)
+    restaurados = para_float64(valores.astype(np.float32))
+    return bool(np.all((restaurados == valores) | (np.isnan(valores) & np.isnan(restaurados))))
@@ -0,0 +1,246 @@
+from collections import namedtuple
+from functools import partial, reduce
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2 as dist_chi2
+
+from paralelo import mapear
+
+# --- Tabelas de Contingência a partir de Códigos Inteiros ---
+# A tabela observada é montada uma única vez, direto dos códigos numéricos, com
+# um só np.bincount sobre linha * n_colunas + coluna. Todas as outras tabelas
+# (relativas ao total, à linha e à coluna, esperadas, resíduos) e o teste
+# Qui-Quadrado derivam dessa matriz. Os rótulos em texto só entram na exibição.
+#
+# Tabelas com as mesmas linhas/colunas podem ser somadas: cada arquivo (ou
+# processo) conta a sua parte e o resultado é idêntico ao de contar os dados
+# concatenados, sem precisar juntar as linhas em um único DataFrame.
+# Dentro de um mesmo array, os códigos também são contados em blocos de
+# TAMANHO_BLOCO linhas: os temporários int64 não crescem com os dados (códigos
+# uint8 do modo compacto, ver entrada.py, são lidos como estão).
+#
+# Para muitos segmentos/períodos, o teste roda em lote sobre uma pilha 3-D de
+# tabelas (n_tabelas x linhas x colunas) com operações vetorizadas, sem uma
+# chamada ao SciPy por tabela.
+
+TAMANHO_BLOCO = 1 << 20
+
+
+def posicoes_codigos(codigos_dados, codigos_validos):
+    """Posição de cada código na lista de códigos válidos (-1 para códigos fora da lista ou NaN).
+
+    Códigos não inteiros (ex.: 1.5) são rejeitados com ValueError, em vez de truncados.
+    """
+    codigos_dados = np.asarray(codigos_dados)
+    if codigos_dados.dtype.kind == 'f':
+        finitos = codigos_dados[np.isfinite(codigos_dados)]
+        if np.any(finitos != np.floor(finitos)):
+            raise ValueError('Códigos devem ser inteiros; há valores com parte decimal.')
+    codigos_validos = np.asarray(codigos_validos, dtype=np.int64)
+    consulta = np.full(int(codigos_validos.max()) + 1, -1, dtype=np.int64)
+    consulta[codigos_validos] = np.arange(codigos_validos.size)
+    dentro = (codigos_dados >= 0) & (codigos_dados < consulta.size)
+    posicoes = np.full(codigos_dados.shape, -1, dtype=np.int64)
+    posicoes[dentro] = consulta[codigos_dados[dentro].astype(np.int64)]
+    return posicoes
+
+
+def qui_quadrado(observadas, correcao=True):
+    """Estatística, p-valor, graus de liberdade e esperadas (como scipy.stats.chi2_contingency).
+
+    É o `qui_quadrado_lote` aplicado a uma pilha de uma só tabela.
+    """
+    resultado = qui_quadrado_lote(np.asarray(observadas)[np.newaxis], correcao)
+    return resultado.estatistica[0], resultado.p_valor[0], resultado.dof, resultado.esperadas[0]
+
+
+class TabelaContingencia:
+    """Tabela observada (linhas x colunas) com as tabelas derivadas e os rótulos de exibição."""
+
+    def __init__(self, observadas, rotulos_linha=None, rotulos_coluna=None, nome_linhas=None, nome_colunas=None,
+                 codigos_linha=None, codigos_coluna=None):
+        self.observadas = np.asarray(observadas, dtype=np.int64)
+        n_linhas, n_colunas = self.observadas.shape
+        self.codigos_linha = list(codigos_linha) if codigos_linha is not None else list(range(n_linhas))
+        self.codigos_coluna = list(codigos_coluna) if codigos_coluna is not None else list(range(n_colunas))
+        self.rotulos_linha = list(rotulos_linha) if rotulos_linha is not None else list(self.codigos_linha)
+        self.rotulos_coluna = list(rotulos_coluna) if rotulos_coluna is not None else list(self.codigos_coluna)
+        self.nome_linhas = nome_linhas
+        self.nome_colunas = nome_colunas
+
+    @classmethod
+    def de_codigos(cls, linhas, colunas, codigos_linha, codigos_coluna, **rotulos):
+        """Conta os pares (linha, coluna) de códigos; pares com códigos fora das listas são ignorados.
+
+        A ordem de `codigos_linha`/`codigos_coluna` define a ordem das linhas/colunas da tabela.
+        """
+        return cls.vazia(codigos_linha, codigos_coluna, **rotulos).acumular(linhas, colunas)
+
+    @classmethod
+    def vazia(cls, codigos_linha, codigos_coluna, **rotulos):
+        """Tabela parcial zerada, para ser preenchida com `acumular` bloco a bloco."""
+        observadas = np.zeros((len(codigos_linha), len(codigos_coluna)), dtype=np.int64)
+        return cls(observadas, codigos_linha=codigos_linha, codigos_coluna=codigos_coluna, **rotulos)
+
+    def acumular(self, linhas, colunas):
+        """Soma à tabela os pares de códigos de um bloco de dados."""
+        linhas, colunas = np.asarray(linhas), np.asarray(colunas)
+        n_linhas, n_colunas = self.observadas.shape
+        for inicio in range(0, linhas.shape[0], TAMANHO_BLOCO):
+            pos_linha = posicoes_codigos(linhas[inicio:inicio + TAMANHO_BLOCO], self.codigos_linha)
+            pos_coluna = posicoes_codigos(colunas[inicio:inicio + TAMANHO_BLOCO], self.codigos_coluna)
+            validos = (pos_linha >= 0) & (pos_coluna >= 0)
+            celulas = pos_linha[validos] * n_colunas + pos_coluna[validos]
+            self.observadas += np.bincount(celulas, minlength=n_linhas * n_colunas).reshape(n_linhas, n_colunas)
+        return self
+
+    def __add__(self, outra):
+        if self.codigos_linha != outra.codigos_linha or self.codigos_coluna != outra.codigos_coluna:
+            raise ValueError("Só é possível somar tabelas com os mesmos códigos de linha e de coluna.")
+        return TabelaContingencia(self.observadas + outra.observadas, **self._metadados())
+
+    # --- Serialização (para enviar parciais entre processos/máquinas) ---
+
+    def para_dict(self):
+        dados = {'observadas': self.observadas.tolist(), **self._metadados()}
+        dados['codigos_linha'] = np.asarray(self.codigos_linha).tolist()
+        dados['codigos_coluna'] = np.asarray(self.codigos_coluna).tolist()
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(**dados)
+
+    def _metadados(self):
+        return {
+            'codigos_linha': self.codigos_linha, 'codigos_coluna': self.codigos_coluna,
+            'rotulos_linha': self.rotulos_linha, 'rotulos_coluna': self.rotulos_coluna,
+            'nome_linhas': self.nome_linhas, 'nome_colunas': self.nome_colunas,
+        }
+
+    # --- Tabelas derivadas (em %, como nos relatórios) ---
+
+    @property
+    def total(self):
+        return self.observadas.sum()
+
+    @property
+    def rel_total(self):
+        return self.observadas / self.total * 100
+
+    @property
+    def rel_linha(self):
+        return self.observadas / self.observadas.sum(axis=1, keepdims=True) * 100
+
+    @property
+    def rel_coluna(self):
+        return self.observadas / self.observadas.sum(axis=0, keepdims=True) * 100
+
+    @property
+    def esperadas(self):
+        return np.outer(self.observadas.sum(axis=1), self.observadas.sum(axis=0)) / self.total
+
+    @property
+    def residuos(self):
+        # Resíduos de Pearson: (O - E) / sqrt(E)
+        esperadas = self.esperadas
+        return (self.observadas - esperadas) / np.sqrt(esperadas)
+
+    def qui_quadrado(self, correcao=True):
+        return qui_quadrado(self.observadas, correcao)
+
+    # --- Exibição ---
+
+    def quadro(self, matriz=None):
+        """DataFrame rotulado de uma das tabelas (por padrão, a observada)."""
+        matriz = self.observadas if matriz is None else matriz
+        return pd.DataFrame(
+            matriz,
+            index=pd.Index(self.rotulos_linha, name=self.nome_linhas),
+            columns=pd.Index(self.rotulos_coluna, name=self.nome_colunas),
+        )
+
+
+# --- Contagem distribuída (map-reduce) ---
+
+def somar(parciais):
+    """Soma um iterável de tabelas parciais."""
+    return reduce(lambda a, b: a + b, parciais)
+
+
+def _contar_arquivo(caminho, leitor, codigos_linha, codigos_coluna):
+    linhas, colunas = leitor(caminho)
+    return TabelaContingencia.vazia(codigos_linha, codigos_coluna).acumular(linhas, colunas)
+
+
+def contar_arquivos(caminhos, codigos_linha, codigos_coluna, leitor, processos=None, **rotulos):
+    """Conta cada arquivo em um processo e soma as parciais.
+
+    `leitor(caminho)` deve devolver os vetores de códigos (linha, coluna),
+    como `entrada.ler_codigos`.
+    """
+    total = TabelaContingencia.vazia(codigos_linha, codigos_coluna, **rotulos)
+    contar = partial(_contar_arquivo, leitor=leitor, codigos_linha=codigos_linha, codigos_coluna=codigos_coluna)
+    return somar([total, *mapear(contar, caminhos, processos)])
+
+
+# --- Teste Qui-Quadrado em lote ---
+
+ResultadoLote = namedtuple('ResultadoLote', 'estatistica p_valor dof esperadas frac_abaixo viola_regra')
+
+
+def qui_quadrado_lote(tabelas, correcao=True, minimo_esperado=5):
+    """Qui-Quadrado de cada tabela de uma pilha (n_tabelas x linhas x colunas).
+
+    `viola_regra` marca as tabelas com alguma frequência esperada abaixo de
+    `minimo_esperado`; `frac_abaixo` é a fração dessas células em cada tabela.
+    Tabelas com alguma linha ou coluna zerada resultam em NaN (o SciPy rejeita);
+    esperadas NaN (tabela vazia) também contam como abaixo do mínimo.
+    """
+    observadas = np.asarray(tabelas, dtype=np.float64)
+    soma_linhas = observadas.sum(axis=2, keepdims=True)
+    soma_colunas = observadas.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        esperadas = soma_linhas * soma_colunas / observadas.sum(axis=(1, 2), keepdims=True)
+        dof = (observadas.shape[1] - 1) * (observadas.shape[2] - 1)
+        if dof == 1 and correcao:
+            # Correção de continuidade de Yates, aplicada só em tabelas 2x2
+            diferenca = esperadas - observadas
+            observadas = observadas + np.sign(diferenca) * np.minimum(0.5, np.abs(diferenca))
+        estatistica = ((observadas - esperadas) ** 2 / esperadas).sum(axis=(1, 2))
+    if dof == 0:
+        estatistica = np.zeros(observadas.shape[0])
+    p_valor = dist_chi2.sf(estatistica, dof) if dof > 0 else np.ones(observadas.shape[0])
+    abaixo = ~(esperadas >= minimo_esperado)
+    return ResultadoLote(estatistica, p_valor, dof, esperadas,
+                         abaixo.mean(axis=(1, 2)), abaixo.any(axis=(1, 2)))
+
+
+def qui_quadrado_por_grupo(df, chaves, coluna_linha, coluna_coluna, codigos_linha=None, codigos_coluna=None, **opcoes):
+    """Qui-Quadrado de `coluna_linha` x `coluna_coluna` para cada grupo de `chaves` de um DataFrame longo.
+
+    Todas as tabelas são contadas com um único np.bincount sobre
+    grupo * (linhas * colunas) + célula e testadas com `qui_quadrado_lote`.
+    """
+    codigos_linha = np.sort(df[coluna_linha].dropna().unique()) if codigos_linha is None else codigos_linha
+    codigos_coluna = np.sort(df[coluna_coluna].dropna().unique()) if codigos_coluna is None else codigos_coluna
+    agrupado = df.groupby(chaves, sort=True)
+    grupo = agrupado.ngroup().to_numpy()
+    n_grupos = agrupado.ngroups
+    pos_linha = posicoes_codigos(df[coluna_linha].to_numpy(np.float64, na_value=np.nan), codigos_linha)
+    pos_coluna = posicoes_codigos(df[coluna_coluna].to_numpy(np.float64, na_value=np.nan), codigos_coluna)
+    n_linhas, n_colunas = len(codigos_linha), len(codigos_coluna)
+    validos = (pos_linha >= 0) & (pos_coluna >= 0) & (grupo >= 0)
+    celulas = (grupo[validos] * n_linhas + pos_linha[validos]) * n_colunas + pos_coluna[validos]
+    tabelas = np.bincount(celulas, minlength=n_grupos * n_linhas * n_colunas).reshape(n_grupos, n_linhas, n_colunas)
+
+    resultado = qui_quadrado_lote(tabelas, **opcoes)
+    return pd.DataFrame({
+        'chi2': resultado.estatistica,
+        'p_valor': resultado.p_valor,
+        'dof': resultado.dof,
+        'n': tabelas.sum(axis=(1, 2)),
+        'frac_esperadas_abaixo': resultado.frac_abaixo,
+        'viola_regra': resultado.viola_regra,
+    }, index=agrupado.size().index)
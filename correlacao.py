@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import t as dist_t
+
+# --- Matriz de Correlação de Pearson para Todos os Pares ---
+# A matriz de notas é padronizada uma vez e todas as correlações saem de um
+# único produto de matrizes (Z' Z / n). Estatísticas t, p-valores e os rótulos
+# de força/significância são calculados para a matriz inteira de uma vez.
+# Com `pares_completos=True`, cada par usa as linhas em que ambas as colunas
+# têm valor; com `bloco`, a matriz é calculada em faixas de colunas para
+# limitar a memória em planilhas muito largas.
+# Colunas constantes (ou sem pares suficientes) dão r = NaN, como no pandas,
+# rotulado como indefinido.
+
+ROTULOS_FORCA = ('Forte', 'Moderada', 'Fraca')
+ROTULO_INDEFINIDA = 'Indefinida'
+
+
+def forca_correlacao(r):
+    r = np.asarray(r)
+    return np.select([np.isnan(r), np.abs(r) >= 0.7, np.abs(r) >= 0.4],
+                     (ROTULO_INDEFINIDA,) + ROTULOS_FORCA[:2], default=ROTULOS_FORCA[2])
+
+
+def direcao_correlacao(r):
+    r = np.asarray(r)
+    return np.select([np.isnan(r), r > 0], ['indefinida', 'positiva'], default='negativa')
+
+
+def _linhas_completas(dados, inicio, fim):
+    # Linhas completas: padroniza uma vez e multiplica
+    n = dados.shape[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (dados - dados.mean(axis=0)) / dados.std(axis=0)
+    return z[:, inicio:fim].T @ z / n, np.full((fim - inicio, dados.shape[1]), n)
+
+
+def _pares_completos(dados, inicio, fim):
+    # Para cada par, somas apenas sobre as linhas em que as duas colunas existem
+    presente = ~np.isnan(dados)
+    m = presente.astype(np.float64)
+    # Centrar pela média de cada coluna melhora a estabilidade numérica das somas
+    x = np.where(presente, dados - np.nanmean(dados, axis=0), 0.0)
+    mb, xb = m[:, inicio:fim], x[:, inicio:fim]
+    n = mb.T @ m
+    soma_x, soma_y = xb.T @ m, mb.T @ x
+    soma_xx, soma_yy = (xb * xb).T @ m, mb.T @ (x * x)
+    soma_xy = xb.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * soma_xy - soma_x * soma_y
+        r = cov / np.sqrt((n * soma_xx - soma_x ** 2) * (n * soma_yy - soma_y ** 2))
+    return r, n
+
+
+class MatrizCorrelacao:
+    """Correlações de Pearson, tamanhos de amostra, estatísticas t e p-valores de todas as colunas."""
+
+    def __init__(self, df, pares_completos=False, bloco=None):
+        dados = df.to_numpy(dtype=np.float64)
+        if not pares_completos:
+            dados = dados[~np.isnan(dados).any(axis=1)]
+        calcular = _pares_completos if pares_completos else _linhas_completas
+        n_colunas = dados.shape[1]
+        bloco = bloco or n_colunas
+        faixas = [calcular(dados, i, min(i + bloco, n_colunas)) for i in range(0, n_colunas, bloco)]
+        self.colunas = list(df.columns)
+        self.r = np.clip(np.vstack([r for r, _ in faixas]), -1.0, 1.0)
+        # Diagonal 1, exceto nas colunas constantes, que ficam NaN como no pandas
+        np.fill_diagonal(self.r, np.where(np.isnan(np.diag(self.r)), np.nan, 1.0))
+        self.n = np.vstack([n for _, n in faixas]).astype(np.int64)
+        graus = self.n - 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.t = self.r * np.sqrt(graus / (1.0 - self.r ** 2))
+            self.p = np.where(graus > 0, 2 * dist_t.sf(np.abs(self.t), graus), np.nan)
+
+    def quadro(self, matriz=None):
+        matriz = self.r if matriz is None else matriz
+        return pd.DataFrame(matriz, index=self.colunas, columns=self.colunas)
+
+    def pares(self, alpha=0.05):
+        """Uma linha por par (triângulo superior) com r, p-valor e as interpretações."""
+        i, j = np.triu_indices(len(self.colunas), k=1)
+        r, p = self.r[i, j], self.p[i, j]
+        colunas = np.array(self.colunas, dtype=object)
+        return pd.DataFrame({
+            'var_x': colunas[i],
+            'var_y': colunas[j],
+            'n': self.n[i, j],
+            'r': r,
+            't': self.t[i, j],
+            'p_valor': p,
+            'forca': forca_correlacao(r),
+            'direcao': direcao_correlacao(r),
+            'significancia': np.where(p < alpha, 'estatisticamente significativa',
+                                      'não é estatisticamente significativa'),
+        })
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy.fft import dct
+from scipy.optimize import brentq
+
+# --- Estimativa de Densidade (KDE Gaussiano) por Binning Linear e FFT ---
+# Em vez de somar um núcleo por ponto em cada ponto da grade (custo n x g), os
+# dados são distribuídos numa grade regular por binning linear (cada valor
+# divide seu peso entre os dois pontos vizinhos da grade) e a grade é
+# convoluída com o núcleo Gaussiano via FFT: custo O(n + g log g).
+# A largura de banda também sai dos dados binados:
+#   - 'scott':     σ n^(-1/5) (a mesma regra do scipy/seaborn);
+#   - 'silverman': 0,9 min(σ, IQR/1,349) n^(-1/5);
+#   - 'isj':       Improved Sheather-Jones (Botev et al., 2010), robusta a
+#                  distribuições multimodais.
+
+Densidade = namedtuple('Densidade', 'grade densidade banda')
+
+PONTOS_GRADE = 1024
+
+
+def binarizar_linear(dados, inicio, fim, pontos=PONTOS_GRADE):
+    """Pesos dos dados nos `pontos` pontos igualmente espaçados de [inicio, fim]."""
+    delta = (fim - inicio) / (pontos - 1)
+    posicao = (np.asarray(dados, dtype=np.float64) - inicio) / delta
+    esquerda = np.clip(np.floor(posicao).astype(np.intp), 0, pontos - 2)
+    fracao = posicao - esquerda
+    pesos = np.bincount(esquerda, weights=1.0 - fracao, minlength=pontos)
+    pesos += np.bincount(esquerda + 1, weights=fracao, minlength=pontos)
+    return pesos
+
+
+def _desvio_e_iqr(grade, pesos):
+    # Desvio-padrão amostral e IQR dos dados binados
+    n = pesos.sum()
+    media = (grade * pesos).sum() / n
+    variancia = (pesos * (grade - media) ** 2).sum() / (n - 1)
+    acumulada = np.cumsum(pesos) / n
+    q1, q3 = np.interp([0.25, 0.75], acumulada, grade)
+    return np.sqrt(variancia), q3 - q1
+
+
+def banda_scott(n, desvio, iqr=None):
+    return desvio * n ** (-1 / 5)
+
+
+def banda_silverman(n, desvio, iqr):
+    escala = min(desvio, iqr / 1.349) if iqr > 0 else desvio
+    return 0.9 * escala * n ** (-1 / 5)
+
+
+def _ponto_fixo(t, n, indices2, a2, ordem=7):
+    # Equação de ponto fixo do ISJ: t = ξ γ^[ordem](t)
+    f = 2 * np.pi ** (2 * ordem) * np.sum(indices2 ** ordem * a2 * np.exp(-indices2 * np.pi ** 2 * t))
+    for s in range(ordem - 1, 1, -1):
+        k0 = np.prod(np.arange(1, 2 * s, 2)) / np.sqrt(2 * np.pi)
+        constante = (1 + 0.5 ** (s + 0.5)) / 3
+        tempo = (2 * constante * k0 / n / f) ** (2 / (3 + 2 * s))
+        f = 2 * np.pi ** (2 * s) * np.sum(indices2 ** s * a2 * np.exp(-indices2 * np.pi ** 2 * tempo))
+    return t - (2 * n * np.sqrt(np.pi) * f) ** (-2 / 5)
+
+
+def banda_isj(pesos, amplitude):
+    """Banda ISJ a partir dos pesos binados numa grade de largura `amplitude`."""
+    n = pesos.sum()
+    a = dct(pesos / n, type=2)
+    indices2 = np.arange(1, pesos.size, dtype=np.float64) ** 2
+    a2 = (a[1:] / 2) ** 2
+    t = brentq(_ponto_fixo, 0.0, 0.1, args=(n, indices2, a2))
+    return np.sqrt(t) * amplitude
+
+
+REGRAS_BANDA = ('scott', 'silverman', 'isj')
+
+
+def largura_banda(dados, regra='scott', pontos=PONTOS_GRADE):
+    """Largura de banda calculada sobre os dados binados numa grade com 10% de margem."""
+    if regra not in REGRAS_BANDA:
+        raise ValueError(f"Regra de banda desconhecida: '{regra}'. Use uma de {REGRAS_BANDA}.")
+    dados = np.asarray(dados, dtype=np.float64)
+    minimo, maximo = dados.min(), dados.max()
+    margem = (maximo - minimo) / 10
+    inicio, fim = minimo - margem, maximo + margem
+    pesos = binarizar_linear(dados, inicio, fim, pontos)
+    if regra == 'isj':
+        try:
+            return banda_isj(pesos, fim - inicio)
+        except ValueError:
+            # Sem raiz no intervalo (amostras pequenas ou muito discretas)
+            regra = 'silverman'
+    desvio, iqr = _desvio_e_iqr(np.linspace(inicio, fim, pontos), pesos)
+    return (banda_scott if regra == 'scott' else banda_silverman)(dados.size, desvio, iqr)
+
+
+def _convoluir(pesos, delta, banda):
+    # Núcleo Gaussiano amostrado até 4 bandas de cada lado, convoluído via FFT
+    pontos = pesos.size
+    alcance = int(min(pontos - 1, np.ceil(4 * banda / delta)))
+    deslocamentos = np.arange(-alcance, alcance + 1) * delta
+    nucleo = np.exp(-0.5 * (deslocamentos / banda) ** 2) / (banda * np.sqrt(2 * np.pi))
+    tamanho = 1 << int(np.ceil(np.log2(pontos + nucleo.size - 1)))
+    convolucao = np.fft.irfft(np.fft.rfft(pesos, tamanho) * np.fft.rfft(nucleo, tamanho), tamanho)
+    return convolucao[alcance:alcance + pontos]
+
+
+def estimar_densidade(dados, banda='scott', pontos=PONTOS_GRADE, corte=3, ajuste=1.0):
+    """KDE Gaussiano em `pontos` pontos de [mín - corte·h, máx + corte·h].
+
+    `banda` é uma regra ('scott', 'silverman', 'isj') ou um valor numérico;
+    `ajuste` multiplica a banda escolhida. NaNs são ignorados.
+    """
+    dados = np.asarray(dados, dtype=np.float64)
+    dados = dados[~np.isnan(dados)]
+    if dados.size < 2 or dados.min() == dados.max():
+        raise ValueError("A estimativa de densidade precisa de pelo menos dois valores distintos.")
+    h = (largura_banda(dados, banda, pontos) if isinstance(banda, str) else banda) * ajuste
+    inicio, fim = dados.min() - corte * h, dados.max() + corte * h
+    pesos = binarizar_linear(dados, inicio, fim, pontos)
+    densidade = _convoluir(pesos, (fim - inicio) / (pontos - 1), h) / dados.size
+    return Densidade(np.linspace(inicio, fim, pontos), densidade, h)
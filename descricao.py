@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from compacto import para_float64
+from momentos import Momentos
+from quantis import Quantis
+
+# --- Descrição Colunar de Várias Séries ---
+# Trata o DataFrame numérico inteiro como uma matriz 2-D (linhas x séries) e
+# calcula todas as medidas de uma vez, coluna a coluna via NumPy, sem laço em
+# Python sobre as séries. O relatório é impresso a partir da tabela resultante.
+# Colunas todas float32 (modo compacto) são usadas sem conversão; momentos e
+# quantis acumulam em float64.
+
+ROTULOS_ASSIMETRIA = ("Assimétrica Positiva", "Assimétrica Negativa", "Aproximadamente Simétrica")
+ROTULOS_CURTOSE = (
+    "Leptocúrtica (mais 'pontuda' que a Normal)",
+    "Platicúrtica (mais 'achatada' que a Normal)",
+    "Mesocúrtica (similar à Normal)",
+)
+
+
+def classificar(valores, rotulos, limite=0.5):
+    """Aplica os rótulos (acima, abaixo, entre) de `limite` a um vetor de coeficientes."""
+    valores = np.asarray(valores)
+    return np.select([valores > limite, valores < -limite], rotulos[:2], default=rotulos[2])
+
+
+def _modas(ordenados):
+    # Comprimento de cada sequência de valores iguais na matriz já ordenada por coluna
+    n = ordenados.shape[0]
+    indices = np.arange(n)[:, None]
+    inicio = np.ones(ordenados.shape, dtype=bool)
+    inicio[1:] = ordenados[1:] != ordenados[:-1]
+    inicio_run = np.maximum.accumulate(np.where(inicio, indices, 0), axis=0)
+    comprimento = indices - inicio_run + 1
+    fim = np.ones(ordenados.shape, dtype=bool)
+    fim[:-1] = inicio[1:]
+    maximo = comprimento.max(axis=0)
+    eh_moda = fim & (comprimento == maximo) & ~np.isnan(ordenados)
+    # Agrupa os valores modais por coluna (ordem crescente, como Series.mode)
+    colunas, linhas = np.nonzero(eh_moda.T)
+    cortes = np.searchsorted(colunas, np.arange(1, ordenados.shape[1]))
+    return [valores.tolist() for valores in np.split(para_float64(ordenados[linhas, colunas]), cortes)]
+
+
+def descrever_colunas(df, fator_iqr=1.5):
+    """Tabela com uma linha por coluna numérica de `df` e as medidas do relatório."""
+    dados = df.to_numpy()
+    if dados.dtype not in (np.float32, np.float64):
+        dados = df.to_numpy(dtype=np.float64)
+    momentos = Momentos.de_array(dados, axis=0)
+    quantis = Quantis(dados, axis=0)
+    q1, q3, iqr, limite_inferior, limite_superior = quantis.cercas(fator_iqr)
+    eh_outlier = (dados < limite_inferior) | (dados > limite_superior)
+    assimetria = momentos.assimetria()
+    curtose = momentos.curtose()
+
+    return pd.DataFrame({
+        'n': momentos.n,
+        'media': momentos.media,
+        'mediana': quantis.mediana(),
+        'moda': _modas(quantis.ordenados),
+        'variancia': momentos.variancia(ddof=1),
+        'desvio_padrao': momentos.desvio_padrao(ddof=1),
+        'erro_padrao': momentos.erro_padrao(ddof=1),
+        'q1': q1,
+        'q3': q3,
+        'iqr': iqr,
+        'limite_inferior': limite_inferior,
+        'limite_superior': limite_superior,
+        'n_outliers': eh_outlier.sum(axis=0),
+        'assimetria': assimetria,
+        'curtose': curtose,
+        'tipo_assimetria': classificar(assimetria, ROTULOS_ASSIMETRIA),
+        'tipo_curtose': classificar(curtose, ROTULOS_CURTOSE),
+    }, index=df.columns)
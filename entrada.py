@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from compacto import cabe_em_float32
+
+# --- Leitura de Planilhas com Cache Colunar e Colunas Tipadas ---
+# Ler XLS/XLSX é, de longe, a etapa mais lenta. Na primeira leitura a planilha
+# é normalizada (to_numeric/dropna) e gravada em formato colunar: um arquivo .npy
+# por coluna. Nas execuções seguintes as colunas são abertas por memory-map.
+# O cache é identificado pelo conteúdo do arquivo (hash SHA-256) e pelos
+# parâmetros de leitura; caminho, mtime e tamanho servem de atalho para não
+# recalcular o hash quando o arquivo não mudou (um arquivo pequeno por atalho,
+# gravado de forma atômica: processos concorrentes não perdem entradas).
+#
+# As colunas abertas do cache são cópia-na-escrita (mmap_mode='c'): alterações
+# no DataFrame ficam só na memória do processo e nunca chegam aos arquivos.
+# Acima do tamanho máximo, as entradas usadas há mais tempo são apagadas
+# (o uso é marcado no mtime do diretório da entrada).
+#
+# Cada script declara as colunas que usa (`colunas`) e os tipos compactos de
+# cada uma (`tipos`, ex.: int8 para códigos de questionário, float32 para
+# notas). Só essas colunas são lidas, já convertidas, o que reduz o tempo de
+# leitura e a memória ocupada pelo DataFrame em planilhas largas.
+#
+# No modo compacto (opcional), as colunas sem tipo declarado também encolhem:
+# inteiros vão para o menor tipo que os comporta (uint8 para códigos de
+# questionário), medidas vão para float32 quando todos os valores voltam
+# exatamente ao decimal original (ver compacto.py), e textos repetidos viram categorias
+# (códigos int8 + um único dicionário de rótulos). Os módulos de cálculo
+# aceitam esses arrays diretamente e acumulam em float64.
+#
+# Variáveis de ambiente:
+#   EASG_CACHE_DIR  diretório do cache (padrão: .cache_planilhas ao lado deste módulo)
+#   EASG_CACHE=0    desliga o cache (sempre lê a planilha)
+#   EASG_CACHE_MAXIMO tamanho máximo do cache em bytes (padrão: 1 GB)
+#   EASG_COMPACTO=1 liga o modo compacto
+#   EASG_ENTRADA    arquivo de entrada, no lugar do caminho fixo do script
+#   EASG_PARAMETROS parâmetros do script em JSON (ex.: {"regra_classes": "scott"},
+#                   {"arquivo_tabela": "tabela.csv"})
+
+DIRETORIO_CACHE = os.environ.get(
+    'EASG_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_planilhas')
+)
+TAMANHO_MAXIMO_CACHE = int(os.environ.get('EASG_CACHE_MAXIMO', 2 ** 30))
+MAXIMO_ATALHOS = 10_000  # arquivos de atalho caminho/mtime/tamanho -> hash
+VERSAO_FORMATO = 1
+
+
+def caminho_entrada(padrao=None):
+    """Arquivo de entrada do script: EASG_ENTRADA, se definida, ou o caminho padrão."""
+    return os.environ.get('EASG_ENTRADA') or padrao
+
+
+def parametro(nome, padrao=None):
+    """Parâmetro do script vindo de EASG_PARAMETROS (JSON), ou o valor padrão."""
+    return json.loads(os.environ.get('EASG_PARAMETROS') or '{}').get(nome, padrao)
+
+
+def compacto_ativo():
+    return os.environ.get('EASG_COMPACTO', '0') == '1'
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def assinatura_arquivo(caminho, diretorio=None):
+    """Hash do conteúdo, reaproveitado enquanto caminho, mtime e tamanho não mudarem."""
+    diretorio = diretorio or DIRETORIO_CACHE
+    info = os.stat(caminho)
+    chave_rapida = f"{os.path.abspath(caminho)}|{info.st_mtime_ns}|{info.st_size}"
+    atalho = os.path.join(diretorio, 'atalhos', hashlib.sha256(chave_rapida.encode()).hexdigest())
+    try:
+        with open(atalho, encoding='utf-8') as arquivo:
+            conteudo = arquivo.read().strip()
+        if len(conteudo) == 64:
+            return conteudo
+    except FileNotFoundError:
+        pass
+    conteudo = hash_arquivo(caminho)
+    os.makedirs(os.path.dirname(atalho), exist_ok=True)
+    _gravar_texto(atalho, conteudo)
+    return conteudo
+
+
+def aparar_cache(tamanho_maximo=None, diretorio=None):
+    """Apaga as entradas do cache usadas há mais tempo até ele caber no tamanho máximo."""
+    tamanho_maximo = TAMANHO_MAXIMO_CACHE if tamanho_maximo is None else tamanho_maximo
+    diretorio = diretorio or DIRETORIO_CACHE
+    entradas = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        if nome == 'atalhos' or not os.path.isdir(caminho) or nome.startswith('tmp'):
+            continue
+        try:
+            tamanho = sum(os.stat(os.path.join(caminho, arquivo)).st_size for arquivo in os.listdir(caminho))
+            entradas.append((os.stat(caminho).st_mtime, tamanho, caminho))
+        except FileNotFoundError:
+            continue  # apagada por outro processo
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= tamanho_maximo:
+            break
+        shutil.rmtree(caminho, ignore_errors=True)
+        total -= tamanho
+    # Atalhos: só os mais recentes (um arquivo de 64 bytes por versão de planilha)
+    pasta_atalhos = os.path.join(diretorio, 'atalhos')
+    if os.path.isdir(pasta_atalhos):
+        atalhos = [entrada for entrada in os.scandir(pasta_atalhos) if entrada.is_file()]
+        if len(atalhos) > MAXIMO_ATALHOS:
+            atalhos.sort(key=lambda entrada: entrada.stat().st_mtime)
+            for entrada in atalhos[:len(atalhos) - MAXIMO_ATALHOS]:
+                try:
+                    os.unlink(entrada.path)
+                except FileNotFoundError:
+                    pass
+
+
+# --- Modo compacto ---
+
+def compactar(df, manter=()):
+    """Converte as colunas (exceto as de `manter`) para os tipos compactos descritos no topo do módulo."""
+    for coluna in df.columns:
+        if coluna in manter:
+            continue
+        serie = df[coluna]
+        if serie.dtype.kind in 'iu':
+            df[coluna] = pd.to_numeric(serie, downcast='unsigned' if serie.min() >= 0 else 'integer')
+        elif serie.dtype == np.float64 and cabe_em_float32(serie.to_numpy()):
+            df[coluna] = serie.astype(np.float32)
+        elif (pd.api.types.infer_dtype(serie, skipna=False) == 'string'
+              and serie.nunique() <= len(serie) // 2):
+            df[coluna] = serie.astype('category')
+    return df
+
+
+def normalizar(df, numericas=None, dropna=None, limpar_nomes=False, tipos=None, compacto=False):
+    """Aplica a limpeza usual dos scripts: nomes sem espaços, to_numeric, dropna e tipos.
+
+    `numericas` e `dropna` aceitam True (todas as colunas) ou uma lista de
+    nomes/posições; posições inexistentes são ignoradas. `tipos` mapeia
+    nome/posição para o dtype final da coluna; com `compacto`, as demais
+    colunas passam por `compactar`.
+    """
+    if limpar_nomes:
+        df.columns = df.columns.str.strip()
+    colunas_num = _resolver_colunas(df, numericas)
+    for coluna in colunas_num:
+        df[coluna] = pd.to_numeric(df[coluna], errors='coerce')
+    if dropna:
+        df = df.dropna(subset=_resolver_colunas(df, dropna))
+    declaradas = []
+    for coluna, tipo in (tipos or {}).items():
+        resolvidas = _resolver_colunas(df, [coluna])
+        if resolvidas:
+            df[resolvidas[0]] = df[resolvidas[0]].astype(tipo)
+            declaradas.append(resolvidas[0])
+    if compacto:
+        # Os tipos declarados pelo script prevalecem
+        df = compactar(df, manter=declaradas)
+    return df
+
+
+def ler_excel(caminho, colunas=None, tipos=None, numericas=None, dropna=None, limpar_nomes=False, compacto=None,
+              **kwargs):
+    """pd.read_excel com cache colunar; a normalização é feita só ao gerar o cache.
+
+    `colunas` restringe a leitura a uma lista de posições ou de nomes (com
+    `limpar_nomes`, os nomes são comparados sem os espaços extras).
+    `compacto` (padrão: EASG_COMPACTO) liga o modo compacto.
+    """
+    compacto = compacto_ativo() if compacto is None else compacto
+    if colunas is not None:
+        kwargs['usecols'] = _projecao(colunas, limpar_nomes)
+    if os.environ.get('EASG_CACHE', '1') == '0':
+        return normalizar(pd.read_excel(caminho, **kwargs), numericas, dropna, limpar_nomes, tipos, compacto)
+
+    parametros = {
+        'colunas': colunas, 'tipos': {str(c): str(t) for c, t in (tipos or {}).items()},
+        'numericas': numericas, 'dropna': dropna, 'limpar_nomes': limpar_nomes,
+        'kwargs': {chave: repr(valor) for chave, valor in sorted(kwargs.items()) if chave != 'usecols'},
+        'versao': VERSAO_FORMATO,
+    }
+    if compacto:
+        parametros['compacto'] = True
+    conteudo = assinatura_arquivo(caminho)
+    chave = hashlib.sha256(f"{conteudo}|{json.dumps(parametros, sort_keys=True, default=repr)}".encode()).hexdigest()
+    destino = os.path.join(DIRETORIO_CACHE, chave)
+
+    if not os.path.isdir(destino):
+        df = normalizar(pd.read_excel(caminho, **kwargs), numericas, dropna, limpar_nomes, tipos, compacto)
+        _gravar_colunas(df, destino)
+        # Só quando uma entrada nova é gravada (raro): leituras não percorrem o cache
+        aparar_cache()
+        return df
+    try:
+        os.utime(destino)  # marca o uso, para a ordem de descarte
+        return _ler_colunas(destino)
+    except FileNotFoundError:
+        # Entrada descartada por outro processo entre a verificação e a leitura
+        return ler_excel(caminho, colunas, tipos, numericas, dropna, limpar_nomes, compacto, **kwargs)
+
+
+def ler_codigos(caminho, coluna_linha=0, coluna_coluna=1):
+    """Lê só as duas colunas de códigos (linha, coluna) de um arquivo CSV, Parquet ou Excel."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    colunas = [coluna_linha, coluna_coluna]
+    if extensao in ('.parquet', '.pq'):
+        if all(isinstance(coluna, int) for coluna in colunas):
+            import pyarrow.parquet as pq
+            nomes = pq.read_schema(caminho).names
+            colunas = [nomes[coluna] for coluna in colunas]
+        df = pd.read_parquet(caminho, columns=colunas)
+    elif extensao in ('.xls', '.xlsx'):
+        df = ler_excel(caminho, colunas=colunas, numericas=True, dropna=True)
+    else:
+        df = pd.read_csv(caminho, usecols=colunas)
+    df = df.apply(pd.to_numeric, errors='coerce').dropna()
+    return df.iloc[:, 0].to_numpy(np.int64), df.iloc[:, 1].to_numpy(np.int64)
+
+
+# --- Auxiliares internos ---
+
+def _projecao(colunas, limpar_nomes):
+    # Posições vão direto para usecols; nomes viram um filtro (tolerante a espaços)
+    if all(isinstance(coluna, int) for coluna in colunas):
+        return list(colunas)
+    desejadas = set(colunas)
+    if limpar_nomes:
+        return lambda nome: str(nome).strip() in desejadas
+    return lambda nome: nome in desejadas
+
+
+def _resolver_colunas(df, colunas):
+    if colunas is None or colunas is False:
+        return []
+    if colunas is True:
+        return list(df.columns)
+    resolvidas = []
+    for coluna in colunas:
+        if coluna in df.columns:
+            resolvidas.append(coluna)
+        elif isinstance(coluna, int) and 0 <= coluna < len(df.columns):
+            resolvidas.append(df.columns[coluna])
+    return resolvidas
+
+
+def _gravar_texto(caminho, texto):
+    # Temporário + rename: leitores veem o arquivo antigo ou o novo, nunca um pela metade
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho))
+    with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(texto)
+    os.replace(temporario, caminho)
+
+
+def _gravar_json(caminho, dados):
+    _gravar_texto(caminho, json.dumps(dados, ensure_ascii=False))
+
+
+def _gravar_colunas(df, destino):
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = tempfile.mkdtemp(dir=os.path.dirname(destino))
+    colunas = []
+    for i, coluna in enumerate(df.columns):
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            # Categorias: só os códigos ficam na coluna; os rótulos, num arquivo à parte
+            categorias = df[coluna].cat.categories.to_numpy()
+            np.save(os.path.join(temporario, f'{i}_rotulos.npy'), categorias.astype(str),
+                    allow_pickle=False)
+            valores = df[coluna].cat.codes.to_numpy()
+        else:
+            valores = df[coluna].to_numpy()
+        if valores.dtype == object and all(isinstance(v, str) for v in valores):
+            # Textos em largura fixa continuam legíveis por memory-map
+            valores = valores.astype(str)
+        np.save(os.path.join(temporario, f'{i}.npy'), valores, allow_pickle=valores.dtype == object)
+        colunas.append({'nome': coluna, 'tipo': str(df[coluna].dtype)})
+    np.save(os.path.join(temporario, 'indice.npy'), df.index.to_numpy())
+    _gravar_json(os.path.join(temporario, 'colunas.json'), colunas)
+    try:
+        os.replace(temporario, destino)
+    except OSError:
+        # Outro processo gravou o mesmo cache ao mesmo tempo
+        shutil.rmtree(temporario, ignore_errors=True)
+
+
+def _carregar(caminho):
+    try:
+        # Cópia-na-escrita: o DataFrame pode ser alterado sem tocar no arquivo do cache
+        return np.load(caminho, mmap_mode='c')
+    except ValueError:
+        # Colunas com objetos (ex.: textos misturados com NaN) não podem ser mapeadas
+        return np.load(caminho, allow_pickle=True)
+
+
+def _ler_colunas(destino):
+    with open(os.path.join(destino, 'colunas.json'), encoding='utf-8') as arquivo:
+        colunas = json.load(arquivo)
+    dados = {}
+    for i, coluna in enumerate(colunas):
+        valores = _carregar(os.path.join(destino, f'{i}.npy'))
+        if coluna['tipo'] in ('object', 'str') and valores.dtype.kind == 'U':
+            valores = valores.astype(object)
+        elif coluna['tipo'] == 'category':
+            rotulos = np.load(os.path.join(destino, f'{i}_rotulos.npy')).astype(object)
+            valores = pd.Categorical.from_codes(np.asarray(valores), categories=rotulos)
+        dados[coluna['nome']] = valores
+    indice = _carregar(os.path.join(destino, 'indice.npy'))
+    return pd.DataFrame(dados, index=indice, columns=[c['nome'] for c in colunas], copy=False)
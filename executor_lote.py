@@ -0,0 +1,147 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+from collections import namedtuple
+
+import instrumentacao
+from paralelo import criar_executor
+
+# --- Execução em Lote das Análises ---
+# Roda muitas análises (um script cXeY por entrada do manifesto) sem pagar a
+# partida do interpretador e as importações de pandas/NumPy/SciPy/matplotlib
+# a cada execução. As bibliotecas são importadas uma vez no processo
+# principal, antes do pool ser criado: com 'fork' os processos de trabalho já
+# nascem com tudo carregado (com 'spawn'/'forkserver', cada processo as importa
+# uma vez, ao ser criado). Cada tarefa roda o script com runpy, com
+# EASG_ENTRADA/EASG_PARAMETROS (ver entrada.py) apontando para o seu arquivo e
+# parâmetros, dentro do seu diretório de saída: o relatório do console vai
+# para relatorio.txt e as figuras ficam ao lado dele.
+#
+# Manifesto: lista JSON (ou um objeto JSON por linha, .jsonl) com
+#   {"analise": "c3e12", "entrada": "dados/Desidratação.xls",
+#    "parametros": {...}, "saida": "nome_opcional"}
+#
+# Uso: python executor_lote.py manifesto.json [--saida resultados] [--processos N]
+
+DIRETORIO_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+ResultadoTarefa = namedtuple('ResultadoTarefa', 'analise saida status segundos')
+
+# Importadas uma vez, antes do fork; os módulos do projeto também ficam em cache
+MODULOS_AQUECIDOS = (
+    'numpy', 'pandas', 'scipy.stats', 'scipy.fft', 'scipy.optimize', 'matplotlib', 'matplotlib.figure',
+    'seaborn', 'bootstrap', 'classes', 'compacto', 'contingencia', 'correlacao', 'densidade', 'descricao', 'entrada',
+    'frequencias', 'graficos', 'influencia', 'instrumentacao', 'memoizacao', 'momentos', 'monte_carlo', 'quantis',
+    'ramo_folhas', 'renderizacao', 'saida',
+)
+
+
+def aquecer(modulos=MODULOS_AQUECIDOS):
+    import importlib
+    import matplotlib
+    matplotlib.use('Agg')
+    for modulo in modulos:
+        importlib.import_module(modulo)
+
+
+def _preparar_processo():
+    # Cada processo de trabalho roda uma tarefa por vez: sem pools aninhados
+    os.environ['EASG_PROCESSOS'] = '1'
+    aquecer()
+
+
+def ler_manifesto(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        if caminho.endswith('.jsonl'):
+            return [json.loads(linha) for linha in arquivo if linha.strip()]
+        return json.load(arquivo)
+
+
+def _diretorios_saida(tarefas, raiz):
+    # Um diretório por tarefa: o nome pedido ou número + análise
+    return [os.path.abspath(os.path.join(raiz, tarefa.get('saida') or f"{i + 1:04d}_{tarefa['analise']}"))
+            for i, tarefa in enumerate(tarefas)]
+
+
+def executar_tarefa(item):
+    """Roda um script de análise no diretório de saída, com o console gravado em relatorio.txt."""
+    tarefa, saida = item
+    script = os.path.join(DIRETORIO_SCRIPTS, tarefa['analise'] + '.py')
+    os.makedirs(saida, exist_ok=True)
+    ambiente = {'EASG_ENTRADA': os.path.abspath(tarefa['entrada']) if tarefa.get('entrada') else '',
+                'EASG_PARAMETROS': json.dumps(tarefa.get('parametros') or {})}
+    anteriores = {nome: os.environ.get(nome) for nome in ambiente}
+    diretorio_anterior = os.getcwd()
+    inicio = time.perf_counter()
+    status = 'ok'
+    relatorio = io.StringIO()
+    try:
+        os.environ.update(ambiente)
+        os.chdir(saida)
+        with contextlib.redirect_stdout(relatorio), contextlib.redirect_stderr(relatorio):
+            try:
+                runpy.run_path(script, run_name='__main__')
+            except SystemExit:
+                # Os scripts só chamam exit() quando não conseguem ler a entrada
+                status = 'interrompido'
+            except Exception:
+                traceback.print_exc(file=relatorio)
+                status = 'erro'
+            finally:
+                # Encerra a etapa deixada aberta por um script interrompido
+                instrumentacao.concluir()
+    finally:
+        os.chdir(diretorio_anterior)
+        for nome, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
+    with open(os.path.join(saida, 'relatorio.txt'), 'w', encoding='utf-8') as arquivo:
+        arquivo.write(relatorio.getvalue())
+    return ResultadoTarefa(tarefa['analise'], saida, status, time.perf_counter() - inicio)
+
+
+def executar_lote(tarefas, raiz='resultados', processos=None):
+    """Executa as tarefas do manifesto em processos já aquecidos; devolve um resultado por tarefa, na ordem."""
+    aquecer()
+    itens = list(zip(tarefas, _diretorios_saida(tarefas, raiz)))
+    executor = criar_executor(processos, inicializar=_preparar_processo)
+    if executor is None:
+        anterior = os.environ.get('EASG_PROCESSOS')
+        _preparar_processo()
+        try:
+            return [executar_tarefa(item) for item in itens]
+        finally:
+            if anterior is None:
+                os.environ.pop('EASG_PROCESSOS', None)
+            else:
+                os.environ['EASG_PROCESSOS'] = anterior
+    with executor:
+        return list(executor.map(executar_tarefa, itens))
+
+
+def main(argumentos=None):
+    leitor = argparse.ArgumentParser(description='Executa em lote as análises listadas num manifesto.')
+    leitor.add_argument('manifesto', help='arquivo .json (lista) ou .jsonl com as tarefas')
+    leitor.add_argument('--saida', default='resultados', help='diretório raiz das saídas')
+    leitor.add_argument('--processos', type=int, default=None, help='processos de trabalho (padrão: EASG_PROCESSOS ou nº de CPUs)')
+    opcoes = leitor.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    resultados = executar_lote(ler_manifesto(opcoes.manifesto), opcoes.saida, opcoes.processos)
+    for resultado in resultados:
+        print(f"{resultado.status:>12} | {resultado.segundos:7.2f} s | {resultado.analise} -> {resultado.saida}")
+    falhas = sum(resultado.status != 'ok' for resultado in resultados)
+    print(f"\n{len(resultados)} tarefas em {time.perf_counter() - inicio:.2f} s ({falhas} com falha)")
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Tabelas de Frequência em Blocos (fora da memória) ---
+# Os dados são lidos em pedaços; cada pedaço é contado e as contagens parciais
+# são somadas. Valores inteiros com faixa pequena usam np.bincount num vetor
+# denso; qualquer outro caso usa um contador esparso (valores distintos +
+# contagens). A memória depende do número de valores distintos, não de linhas.
+
+LIMITE_DENSO = 1 << 22  # maior faixa (max - min + 1) contada com bincount
+
+
+def ler_blocos(caminho, coluna=0, tamanho_bloco=1_000_000):
+    """Gera os valores de uma coluna de um CSV ou Parquet, bloco a bloco."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("A leitura de arquivos Parquet requer o pacote 'pyarrow'.")
+        arquivo = pq.ParquetFile(caminho)
+        nome = arquivo.schema_arrow.names[coluna] if isinstance(coluna, int) else coluna
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=[nome]):
+            yield lote.column(0).to_numpy(zero_copy_only=False)
+    else:
+        for pedaco in pd.read_csv(caminho, usecols=[coluna], chunksize=tamanho_bloco):
+            yield pedaco.iloc[:, 0].to_numpy()
+
+
+class ContadorFrequencias:
+    """Acumula frequências absolutas de blocos de valores; contadores podem ser somados."""
+
+    def __init__(self, limite_denso=LIMITE_DENSO):
+        self.limite_denso = limite_denso
+        self.total = 0
+        # Modo denso: contagens[i] é a frequência do valor base + i
+        self._base = None
+        self._densas = None
+        # Modo esparso: valores distintos ordenados e suas contagens
+        self._valores = None
+        self._esparsas = None
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco)
+        if bloco.dtype.kind == 'f':
+            bloco = bloco[~np.isnan(bloco)]
+        if bloco.size == 0:
+            return self
+        self.total += bloco.size
+        if bloco.dtype.kind in 'iu' and self._valores is None:
+            minimo, maximo = int(bloco.min()), int(bloco.max())
+            if maximo - minimo < self.limite_denso:
+                # Subtração em int64: no tipo do bloco (ex.: int8) ela pode transbordar
+                parcial = np.bincount(bloco.astype(np.int64) - minimo)
+                presentes = np.flatnonzero(parcial)
+                self._acumular(presentes + minimo, parcial[presentes])
+                return self
+        self._acumular(*np.unique(bloco, return_counts=True))
+        return self
+
+    def atualizar_blocos(self, blocos):
+        for bloco in blocos:
+            self.atualizar(bloco)
+        return self
+
+    def __add__(self, outro):
+        total = ContadorFrequencias(self.limite_denso)
+        total.total = self.total + outro.total
+        total._acumular(*self._itens())
+        total._acumular(*outro._itens())
+        return total
+
+    def contagens(self):
+        """Frequências absolutas como Series ordenada pelo valor (igual a value_counts().sort_index())."""
+        valores, contagens = self._itens()
+        return pd.Series(contagens, index=pd.Index(valores), name='count')
+
+    # --- Auxiliares internos ---
+
+    def _acumular(self, valores, contagens):
+        # `valores` chega ordenado e sem repetições
+        if valores.size == 0:
+            return
+        if valores.dtype.kind in 'iu' and self._valores is None:
+            base, topo = int(valores[0]), int(valores[-1])
+            if self._densas is not None:
+                base, topo = min(base, self._base), max(topo, self._base + self._densas.size - 1)
+            if topo - base < self.limite_denso:
+                self._garantir_faixa(base, topo)
+                self._densas[valores.astype(np.int64) - self._base] += contagens
+                return
+        # Qualquer soma esparsa (ex.: um bloco float depois de blocos inteiros) leva
+        # antes as contagens densas para o contador esparso, para não perdê-las
+        self._para_esparso()
+        self._somar_esparso(valores, contagens)
+
+    def _garantir_faixa(self, base, topo):
+        if self._densas is None:
+            self._base, self._densas = base, np.zeros(topo - base + 1, dtype=np.int64)
+        elif base < self._base or topo >= self._base + self._densas.size:
+            novas = np.zeros(topo - base + 1, dtype=np.int64)
+            inicio = self._base - base
+            novas[inicio:inicio + self._densas.size] = self._densas
+            self._base, self._densas = base, novas
+
+    def _para_esparso(self):
+        if self._densas is not None:
+            self._valores, self._esparsas = self._itens()
+            self._base = self._densas = None
+
+    def _somar_esparso(self, valores, contagens):
+        if self._valores is None:
+            self._valores, self._esparsas = valores, contagens.astype(np.int64)
+            return
+        juntos, posicao = np.unique(np.concatenate([self._valores, valores]), return_inverse=True)
+        self._esparsas = np.bincount(posicao, weights=np.concatenate([self._esparsas, contagens]),
+                                     minlength=juntos.size).astype(np.int64)
+        self._valores = juntos
+
+    def _itens(self):
+        if self._densas is not None:
+            presentes = np.flatnonzero(self._densas)
+            return presentes + self._base, self._densas[presentes]
+        if self._valores is not None:
+            return self._valores, self._esparsas
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
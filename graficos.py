@@ -0,0 +1,212 @@
+from collections import namedtuple
+
+import numpy as np
+import seaborn as sns
+from matplotlib.colors import LogNorm
+
+from densidade import estimar_densidade
+from influencia import reta_das_somas, somas_suficientes
+from renderizacao import grafico
+
+# --- Funções de Desenho dos Gráficos ---
+# Cada função recebe uma Figure nova (ver renderizacao.py) e desenha nela só
+# pela API de objetos do matplotlib, sem o estado global do pyplot, para que
+# os gráficos possam ser desenhados em qualquer processo e em qualquer ordem.
+#
+# Dispersões com muitos pontos (acima de LIMITE_PONTOS) viram um raster de
+# densidade: os pontos são contados numa grade fixa e desenhados como imagem,
+# a reta de regressão sai das somas suficientes e só os k pontos de maior
+# pontuação (resíduo, distância de Cook...) recebem rótulo. O resumo é
+# calculado antes do envio à fila, então o custo do desenho, o tamanho do PNG
+# e o volume enviado aos processos não crescem com o número de linhas.
+
+LIMITE_PONTOS = 50_000
+
+ResumoDispersao = namedtuple('ResumoDispersao', 'contagens extensao inclinacao intercepto destaques')
+
+
+def histograma_densidade(ax, valores, cor, bins='auto', banda='scott'):
+    """Histograma de contagens com a curva de densidade (KDE por FFT, ver densidade.py) na mesma escala."""
+    dados = np.asarray(valores, dtype=np.float64)
+    dados = dados[~np.isnan(dados)]
+    bordas = np.histogram_bin_edges(dados, bins)
+    # Transparência que o seaborn usa nas barras quando sobrepõe a KDE
+    sns.histplot(valores, bins=bordas, color=cor, alpha=0.5, ax=ax)
+    if dados.size > 1 and dados.min() < dados.max():
+        # Densidade só no intervalo dos dados, escalada para contagens por classe
+        kde = estimar_densidade(dados, banda=banda, corte=0)
+        ax.plot(kde.grade, kde.densidade * dados.size * (bordas[-1] - bordas[0]) / (bordas.size - 1), color=cor)
+
+
+def histograma_boxplot(fig, valores, titulo, rotulo):
+    """Histograma (com KDE) e boxplot lado a lado."""
+    with sns.axes_style('whitegrid'):
+        axes = fig.subplots(1, 2)
+        fig.suptitle(titulo, fontsize=16)
+
+        histograma_densidade(axes[0], valores, 'royalblue')
+        axes[0].set_title('Histograma')
+        axes[0].set_xlabel(rotulo)
+        axes[0].set_ylabel('Frequência')
+
+        sns.boxplot(y=valores, color='mediumseagreen', ax=axes[1])
+        axes[1].set_title('Boxplot')
+        axes[1].set_ylabel(rotulo)
+
+        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+
+def barras(fig, serie, titulo, rotulo_x, rotulo_y, cores=None):
+    ax = fig.subplots()
+    serie.plot(kind='bar', color=cores, edgecolor='black', ax=ax)
+    ax.set_title(titulo, fontsize=16)
+    ax.set_ylabel(rotulo_y)
+    ax.set_xlabel(rotulo_x)
+    ax.tick_params(axis='x', labelrotation=0)
+    ax.grid(axis='y', linestyle='--')
+
+
+def boxplot(fig, df, titulo, rotulo_x, rotulo_y):
+    ax = fig.subplots()
+    sns.boxplot(data=df, ax=ax)
+    ax.set_title(titulo, fontsize=16)
+    ax.set_ylabel(rotulo_y)
+    ax.set_xlabel(rotulo_x)
+
+
+def histogramas(fig, df, titulo, rotulo_x, rotulo_y, cores, bins=12):
+    """Um histograma (com KDE) por coluna, lado a lado e com o mesmo eixo y."""
+    axes = fig.subplots(1, len(df.columns), sharey=True, squeeze=False)[0]
+    fig.suptitle(titulo, fontsize=18)
+    for ax, coluna, cor in zip(axes, df.columns, cores):
+        histograma_densidade(ax, df[coluna], cor, bins=bins)
+        ax.set_title(coluna)
+        ax.set_xlabel(rotulo_x)
+    axes[0].set_ylabel(rotulo_y)
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+
+def dispersao(fig, x, y, titulo, rotulo_x, rotulo_y, rotulos=None, deslocamento=0, anotacao=None,
+              scatter_kws=None, line_kws=None):
+    """Diagrama de dispersão com a reta de regressão, rótulos opcionais por ponto e uma caixa de texto."""
+    ax = fig.subplots()
+    sns.regplot(x=x, y=y, ci=None, ax=ax, scatter_kws=scatter_kws, line_kws=line_kws)
+    if rotulos is not None:
+        for xi, yi, texto in zip(x, y, rotulos):
+            ax.text(xi + deslocamento, yi, texto, fontsize=9)
+    if anotacao is not None:
+        ax.text(0.05, 0.95, anotacao, transform=ax.transAxes, fontsize=12, verticalalignment='top',
+                bbox=dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.5))
+    ax.set_title(titulo, fontsize=16)
+    ax.set_xlabel(rotulo_x, fontsize=12)
+    ax.set_ylabel(rotulo_y, fontsize=12)
+    ax.grid(True)
+
+
+def ramo_folhas(fig, diagrama, titulo=None, unidade=''):
+    """Texto de um diagrama de ramo-e-folhas (ver ramo_folhas.py) em fonte monoespaçada, sem eixos."""
+    ax = fig.subplots()
+    ax.axis('off')
+    if titulo:
+        ax.set_title(titulo)
+    linhas = diagrama.texto(unidade).split('\n')
+    altura = 1.0 / (len(linhas) + 1)
+    for i, linha in enumerate(linhas):
+        ax.text(0.02, 1.0 - (i + 1) * altura, linha, family='monospace', fontsize=11,
+                fontweight='bold' if i == 0 else 'normal', verticalalignment='center', transform=ax.transAxes)
+
+
+def _grade(valores, n_celulas):
+    # Célula de cada valor numa grade de largura fixa: floor((x - mínimo) / largura)
+    minimo, maximo = valores.min(), valores.max()
+    largura = (maximo - minimo) / n_celulas or 1.0
+    indices = np.floor((valores - minimo) / largura).astype(np.intp)
+    return np.minimum(indices, n_celulas - 1), (minimo, maximo)
+
+
+def maiores_pontuacoes(pontuacao, k):
+    """Índices dos k maiores valores de |pontuacao|, do maior para o menor."""
+    pontuacao = np.abs(np.asarray(pontuacao, dtype=np.float64))
+    k = min(k, pontuacao.size)
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    indices = np.argpartition(-pontuacao, k - 1)[:k]
+    return indices[np.argsort(-pontuacao[indices])]
+
+
+def resumir_dispersao(x, y, rotulos=None, pontuacao=None, k=10, resolucao=(400, 300)):
+    """Raster de contagens, reta de regressão e os k pontos de destaque de uma nuvem de pontos.
+
+    Sem `pontuacao`, os destaques são os pontos de maior resíduo em relação à reta.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[validos], y[validos]
+
+    # Reta a partir das somas de x e y centrados (mais estável para n grande)
+    media_x, media_y = x.mean(), y.mean()
+    n, sx, sy, sxx, _, sxy = somas_suficientes(x - media_x, y - media_y)
+    inclinacao, intercepto = reta_das_somas(n, sx, sy, sxx, sxy)
+    intercepto = media_y + intercepto - inclinacao * media_x
+
+    n_x, n_y = resolucao
+    coluna, faixa_x = _grade(x, n_x)
+    linha, faixa_y = _grade(y, n_y)
+    contagens = np.bincount(linha * n_x + coluna, minlength=n_x * n_y).reshape(n_y, n_x)
+
+    if pontuacao is None:
+        pontuacao = y - (intercepto + inclinacao * x)
+    else:
+        pontuacao = np.asarray(pontuacao, dtype=np.float64)[validos]
+    indices = maiores_pontuacoes(pontuacao, k)
+    textos = np.asarray(rotulos)[validos][indices] if rotulos is not None else indices
+    destaques = (x[indices], y[indices], [str(texto) for texto in textos])
+    return ResumoDispersao(contagens, faixa_x + faixa_y, inclinacao, intercepto, destaques)
+
+
+def dispersao_densidade(fig, resumo, titulo, rotulo_x, rotulo_y, anotacao=None, cmap='Blues', line_kws=None):
+    """Dispersão como imagem de densidade (escala log), com a reta e os pontos de destaque rotulados."""
+    ax = fig.subplots()
+    contagens = np.ma.masked_equal(resumo.contagens, 0)
+    imagem = ax.imshow(contagens, origin='lower', extent=resumo.extensao, aspect='auto', cmap=cmap,
+                       norm=LogNorm(vmin=1, vmax=max(1, resumo.contagens.max())), interpolation='nearest')
+    fig.colorbar(imagem, ax=ax, label='Pontos por célula')
+
+    x_min, x_max = resumo.extensao[:2]
+    ax.plot([x_min, x_max], [resumo.intercepto + resumo.inclinacao * x_min, resumo.intercepto + resumo.inclinacao * x_max],
+            **(line_kws or {'color': 'red'}))
+
+    x, y, textos = resumo.destaques
+    if textos:
+        ax.scatter(x, y, s=20, facecolors='none', edgecolors='black')
+        # Deslocamento único (1% da largura do eixo) para todos os rótulos
+        deslocamento = 0.01 * (x_max - x_min)
+        for xi, yi, texto in zip(x + deslocamento, y, textos):
+            ax.text(xi, yi, texto, fontsize=9)
+    if anotacao is not None:
+        ax.text(0.05, 0.95, anotacao, transform=ax.transAxes, fontsize=12, verticalalignment='top',
+                bbox=dict(boxstyle='round,pad=0.5', fc='wheat', alpha=0.5))
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(*resumo.extensao[2:])
+    ax.set_title(titulo, fontsize=16)
+    ax.set_xlabel(rotulo_x, fontsize=12)
+    ax.set_ylabel(rotulo_y, fontsize=12)
+    ax.grid(True)
+
+
+def especificar_dispersao(arquivo, x, y, titulo, rotulo_x, rotulo_y, rotulos=None, pontuacao=None, k=10,
+                          rotular_todos=True, tamanho=(8, 6), anotacao=None, line_kws=None, **opcoes):
+    """Especificação do diagrama de dispersão: pontos individuais até LIMITE_PONTOS, raster de densidade acima.
+
+    Com poucos pontos, `rotulos` marca todos os pontos (se `rotular_todos`); no
+    modo de densidade, só os k de maior `pontuacao`. As demais opções vão para
+    `dispersao`.
+    """
+    if len(x) <= LIMITE_PONTOS:
+        return grafico(arquivo, dispersao, x, y, titulo, rotulo_x, rotulo_y,
+                       rotulos=rotulos if rotular_todos else None, anotacao=anotacao, line_kws=line_kws,
+                       tamanho=tamanho, **opcoes)
+    resumo = resumir_dispersao(x, y, rotulos=rotulos, pontuacao=pontuacao, k=k)
+    return grafico(arquivo, dispersao_densidade, resumo, titulo, rotulo_x, rotulo_y, anotacao=anotacao,
+                   line_kws=line_kws, tamanho=tamanho)
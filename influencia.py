@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# --- Influência de Cada Observação na Correlação (deixar um de fora) ---
+# As estatísticas suficientes (n, Σx, Σy, Σx², Σy², Σxy) são calculadas uma
+# vez; a correlação sem a observação i sai de subtrair os termos de i dessas
+# somas, para todas as observações de uma vez (O(n) no total, sem n reajustes).
+# Alavancagem e distância de Cook referem-se à reta de regressão de y em x.
+#
+# As observações são ordenadas pela `pontuacao`: |Δr|, distância de Cook e
+# alavancagem, cada uma dividida pelo seu máximo na amostra, somadas (0 a 3).
+# Um ponto só é o primeiro se pesar nos três critérios juntos, e não apenas
+# num deles (ex.: alta alavancagem, mas sobre a reta).
+
+
+def somas_suficientes(x, y):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return x.size, x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()
+
+
+def correlacao_das_somas(n, sx, sy, sxx, syy, sxy):
+    """Pearson r a partir das somas (aceita vetores de somas)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+
+
+def reta_das_somas(n, sx, sy, sxx, sxy):
+    """Inclinação e intercepto da regressão de mínimos quadrados de y em x."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        inclinacao = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    return inclinacao, (sy - inclinacao * sx) / n
+
+
+def influencia(x, y, rotulos=None, ordenar=True):
+    """Tabela com r sem cada observação, Δr, alavancagem, distância de Cook, resíduo e pontuação.
+
+    Ordenada da observação mais influente (maior pontuação) para a menor;
+    com `ordenar=False`, na ordem original das observações (ver `ordem_influencia`).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Centrar antes de somar reduz o cancelamento numérico nas fórmulas com somas
+    x_c, y_c = x - x.mean(), y - y.mean()
+    n, sx, sy, sxx, syy, sxy = somas_suficientes(x_c, y_c)
+    r = correlacao_das_somas(n, sx, sy, sxx, syy, sxy)
+    r_sem = correlacao_das_somas(n - 1, sx - x_c, sy - y_c, sxx - x_c * x_c, syy - y_c * y_c, sxy - x_c * y_c)
+
+    inclinacao, intercepto = reta_das_somas(n, sx, sy, sxx, sxy)
+    residuo = y_c - (intercepto + inclinacao * x_c)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        alavancagem = 1.0 / n + x_c * x_c / (sxx - sx * sx / n)
+        variancia_residual = (residuo * residuo).sum() / (n - 2)
+        cook = residuo * residuo / (2 * variancia_residual) * alavancagem / (1.0 - alavancagem) ** 2
+
+    tabela = pd.DataFrame({
+        'r_sem': r_sem,
+        'delta_r': r_sem - r,
+        'alavancagem': alavancagem,
+        'cook': cook,
+        'residuo': residuo,
+    }, index=rotulos if rotulos is not None else None)
+    tabela['pontuacao'] = sum(_relativo(np.abs(tabela[coluna].to_numpy())) for coluna in ('delta_r', 'cook', 'alavancagem'))
+    return tabela.iloc[ordem_influencia(tabela)] if ordenar else tabela
+
+
+def ordem_influencia(tabela):
+    """Posições das linhas da mais influente para a menor (pontuação; empates pela distância de Cook)."""
+    return np.lexsort((-tabela['cook'].to_numpy(), -tabela['pontuacao'].to_numpy()))
+
+
+def _relativo(valores):
+    # Valores divididos pelo máximo finito (0 a 1); NaN conta como 0
+    valores = np.where(np.isfinite(valores), valores, 0.0)
+    maximo = valores.max(initial=0.0)
+    return valores / maximo if maximo > 0 else valores
@@ -0,0 +1,233 @@
+import atexit
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# --- Instrumentação das Etapas dos Scripts ---
+# Cada PASSO de um script (carregar, preparar, calcular, relatório, gráficos)
+# é uma etapa: `passo(nome)` encerra a etapa aberta e abre a próxima, e
+# `concluir()` encerra a última. Por etapa é emitido um registro JSON (uma
+# linha) com tempo de relógio, tempo de CPU, RSS no início, aumento do pico de
+# RSS e o número de linhas processadas (`contar_linhas`).
+#
+# Tempo de CPU e pico de RSS são do processo do script. O trabalho feito nos
+# processos filhos (pool de paralelo.py) aparece à parte: `cpu_filhos_segundos`
+# soma os filhos já encerrados (os.times) e os ainda vivos (/proc, no Linux), e
+# `pico_rss_filhos_mb` é o maior pico entre os filhos vivos no fim da etapa
+# (desde a criação de cada um: o pico dos filhos não é zerado por etapa).
+#
+#   EASG_INSTRUMENTACAO  arquivo onde as linhas JSON são acrescentadas ('-' = stderr)
+#   EASG_PERFIL          etapa a perfilar ('calcular' ou 'c3e12:calcular'); o
+#                        relatório vai para perfil_<script>_<etapa>.txt no
+#                        diretório atual (pyinstrument, se instalado; senão cProfile)
+#
+# Sem nenhuma das duas variáveis, `passo`, `contar_linhas` e `concluir` só
+# testam uma global e retornam. O pico de RSS é zerado no início de cada etapa
+# (/proc/self/clear_refs), então as etapas não devem ser aninhadas.
+
+DESTINO = os.environ.get('EASG_INSTRUMENTACAO') or None
+PERFIL = os.environ.get('EASG_PERFIL') or None
+
+_aberta = None
+
+
+def configurar(destino=None, perfil=None):
+    """Liga (ou desliga, com None) a emissão de registros e o perfilador, sem usar o ambiente."""
+    global DESTINO, PERFIL
+    concluir()
+    DESTINO, PERFIL = destino, perfil
+
+
+# --- Memória do processo ---
+
+def zerar_pico_rss():
+    """Zera o pico de RSS do processo (Linux); devolve False se não for possível."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as arquivo:
+            arquivo.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _status_mb(campo, pid='self'):
+    try:
+        with open(f'/proc/{pid}/status') as arquivo:
+            for linha in arquivo:
+                if linha.startswith(campo):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _ru_maxrss_mb():
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KB nos demais
+    return pico / 2 ** 20 if sys.platform == 'darwin' else pico / 1024
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo (MB): VmHWM no Linux, senão ru_maxrss."""
+    pico = _status_mb('VmHWM:')
+    return pico if pico is not None else _ru_maxrss_mb()
+
+
+def rss_mb():
+    """Memória residente atual (MB); sem /proc, o pico (ru_maxrss) é a melhor aproximação."""
+    atual = _status_mb('VmRSS:')
+    return atual if atual is not None else _ru_maxrss_mb()
+
+
+def _cpu_proc(pid):
+    # utime + stime de um processo vivo (campos 14 e 15 de /proc/<pid>/stat)
+    try:
+        with open(f'/proc/{pid}/stat') as arquivo:
+            campos = arquivo.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return 0.0
+    return (int(campos[11]) + int(campos[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def cpu_filhos():
+    """CPU (s) dos processos filhos: encerrados (os.times) e vivos (/proc, só no Linux)."""
+    tempos = os.times()
+    return tempos.children_user + tempos.children_system + sum(
+        _cpu_proc(filho.pid) for filho in multiprocessing.active_children())
+
+
+def pico_rss_filhos_mb():
+    """Maior pico de RSS (VmHWM, MB) entre os processos filhos vivos; None sem filhos ou sem /proc."""
+    picos = [_status_mb('VmHWM:', filho.pid) for filho in multiprocessing.active_children()]
+    picos = [pico for pico in picos if pico is not None]
+    return max(picos) if picos else None
+
+
+# --- Perfilador ---
+
+def _perfilar(script, nome):
+    return PERFIL is not None and PERFIL in (nome, f'{script}:{nome}')
+
+
+def _iniciar_perfil():
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        import cProfile
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+        return perfilador
+    perfilador = Profiler()
+    perfilador.start()
+    return perfilador
+
+
+def _salvar_perfil(perfilador, script, nome):
+    caminho = os.path.abspath(f'perfil_{script}_{nome}.txt')
+    if hasattr(perfilador, 'output_text'):
+        perfilador.stop()
+        texto = perfilador.output_text()
+    else:
+        import io
+        import pstats
+        perfilador.disable()
+        saida = io.StringIO()
+        pstats.Stats(perfilador, stream=saida).sort_stats('cumulative').print_stats(40)
+        texto = saida.getvalue()
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(texto)
+    return caminho
+
+
+# --- Etapas ---
+
+def _nome_script():
+    # Com runpy (executor_lote.py) o argv[0] também é o script em execução
+    return os.path.splitext(os.path.basename(sys.argv[0] or 'interativo'))[0]
+
+
+def emitir(registro):
+    linha = json.dumps(registro, ensure_ascii=False) + '\n'
+    if DESTINO == '-':
+        sys.stderr.write(linha)
+        return
+    with open(DESTINO, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(linha)
+
+
+class _Etapa:
+
+    def __init__(self, nome, linhas=None):
+        self.script = _nome_script()
+        self.nome = nome
+        self.linhas = linhas
+        self.perfilador = _iniciar_perfil() if _perfilar(self.script, nome) else None
+        self.pico_zerado = zerar_pico_rss()
+        self.rss_inicio = rss_mb()
+        # Sem como zerar o pico, mede-se quanto o pico do processo subiu
+        self.pico_inicio = self.rss_inicio if self.pico_zerado else pico_rss_mb()
+        self.inicio = time.time()
+        self.cpu = time.process_time()
+        self.cpu_filhos = cpu_filhos()
+        self.relogio = time.perf_counter()
+
+    def encerrar(self):
+        registro = {
+            'script': self.script,
+            'etapa': self.nome,
+            'inicio': self.inicio,
+            'segundos': time.perf_counter() - self.relogio,
+            'cpu_segundos': time.process_time() - self.cpu,
+            'cpu_filhos_segundos': max(0.0, cpu_filhos() - self.cpu_filhos),
+            'rss_inicio_mb': self.rss_inicio,
+            'pico_rss_delta_mb': max(0.0, pico_rss_mb() - self.pico_inicio),
+            'pico_rss_filhos_mb': pico_rss_filhos_mb(),
+            'linhas': self.linhas,
+            'pid': os.getpid(),
+        }
+        if self.perfilador is not None:
+            registro['perfil'] = _salvar_perfil(self.perfilador, self.script, self.nome)
+        if DESTINO is not None:
+            emitir(registro)
+        return registro
+
+
+def passo(nome, linhas=None):
+    """Encerra a etapa aberta (se houver) e abre a etapa `nome`."""
+    global _aberta
+    if DESTINO is None and PERFIL is None:
+        return
+    concluir()
+    _aberta = _Etapa(nome, linhas)
+
+
+def contar_linhas(linhas):
+    """Número de linhas (registros) processadas pela etapa aberta."""
+    if _aberta is not None:
+        _aberta.linhas = int(linhas)
+
+
+def concluir():
+    """Encerra a etapa aberta; chamado também na saída do interpretador."""
+    global _aberta
+    if _aberta is None:
+        return
+    etapa, _aberta = _aberta, None
+    etapa.encerrar()
+
+
+@contextlib.contextmanager
+def etapa(nome, linhas=None):
+    """Mede um bloco `with` como uma etapa (encerra a etapa aberta por `passo`, se houver)."""
+    passo(nome, linhas)
+    try:
+        yield
+    finally:
+        concluir()
+
+
+atexit.register(concluir)
@@ -0,0 +1,266 @@
+import ast
+import functools
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# --- Memoização de Resultados e Figuras por Conteúdo ---
+# Resultados de cálculos (intervalos bootstrap, p-valores de Monte Carlo,
+# resumos) e figuras ficam num diretório local, identificados por um hash de:
+#   - os dados e parâmetros da chamada (arrays e DataFrames pelo conteúdo);
+#   - a versão do código de que o cálculo depende: o conteúdo dos módulos do
+#     projeto onde estão as funções e classes da chamada (a função memoizada,
+#     estatísticas passadas como argumento, a função de desenho) e dos módulos
+#     do projeto que eles importam, direta ou indiretamente; mais as versões do
+#     Python e das bibliotecas numéricas. Editar saida.py ou servico.py não
+#     invalida um intervalo bootstrap; editar bootstrap.py, sim.
+# Com os mesmos dados, parâmetros e código, o resultado é lido do cache e a
+# figura é copiada, sem recalcular nem redesenhar; quando um arquivo de
+# entrada muda, só as saídas que dependem dele mudam de chave. Acima do
+# limite de tamanho, os itens usados há mais tempo são apagados: o processo
+# soma o que grava a partir do último levantamento do diretório e só o percorre
+# de novo quando a soma passa do limite ou a cada APARAR_A_CADA gravações.
+#
+# Só faz sentido memoizar cálculos determinísticos (ex.: bootstrap com semente fixa).
+#
+# Variáveis de ambiente:
+#   EASG_MEMO_DIR     diretório do cache (padrão: .cache_resultados ao lado deste módulo)
+#   EASG_MEMO=0       desliga a memoização
+#   EASG_MEMO_MAXIMO  tamanho máximo do cache em bytes (padrão: 1 GB)
+
+DIRETORIO = os.environ.get(
+    'EASG_MEMO_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_resultados')
+)
+TAMANHO_MAXIMO = int(os.environ.get('EASG_MEMO_MAXIMO', 2 ** 30))
+BIBLIOTECAS = ('numpy', 'pandas', 'scipy', 'matplotlib', 'seaborn')
+APARAR_A_CADA = 256  # gravações entre levantamentos completos do diretório
+
+_SCRIPT = re.compile(r'^c\d+e\d+\.py$')
+_PROJETO = os.path.dirname(os.path.abspath(__file__))
+
+# Tamanho do cache no último levantamento mais o gravado desde então (None: sem levantamento)
+_tamanho_estimado = None
+_gravacoes = 0
+
+
+def ativa():
+    return os.environ.get('EASG_MEMO', '1') != '0'
+
+
+@functools.lru_cache(maxsize=None)
+def modulos_projeto():
+    """Nomes dos módulos do projeto (os .py deste diretório, exceto os scripts cXeY.py)."""
+    return frozenset(nome[:-3] for nome in os.listdir(_PROJETO) if nome.endswith('.py') and not _SCRIPT.match(nome))
+
+
+@functools.lru_cache(maxsize=None)
+def _importados(modulo):
+    # Módulos do projeto importados (em qualquer ponto do arquivo) pelo módulo
+    with open(os.path.join(_PROJETO, modulo + '.py'), 'rb') as arquivo:
+        arvore = ast.parse(arquivo.read())
+    nomes = set()
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Import):
+            nomes.update(alias.name.split('.')[0] for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.level == 0 and no.module:
+            nomes.add(no.module.split('.')[0])
+    return frozenset(nomes & modulos_projeto())
+
+
+def dependencias(modulos):
+    """Os módulos do projeto em `modulos` e todos os que eles importam, direta ou indiretamente."""
+    pendentes = [modulo for modulo in modulos if modulo in modulos_projeto()]
+    vistos = set()
+    while pendentes:
+        modulo = pendentes.pop()
+        if modulo not in vistos:
+            vistos.add(modulo)
+            pendentes.extend(_importados(modulo))
+    return frozenset(vistos)
+
+
+@functools.lru_cache(maxsize=None)
+def versao_codigo(modulos=None):
+    """Hash dos módulos do projeto (só `modulos` e suas dependências, se dados) e das versões do Python e das bibliotecas."""
+    sha = hashlib.sha256(sys.version.encode())
+    for nome in BIBLIOTECAS:
+        modulo = sys.modules.get(nome)
+        sha.update(f"{nome}={getattr(modulo, '__version__', None)}".encode())
+    for nome in sorted(modulos_projeto() if modulos is None else dependencias(modulos)):
+        with open(os.path.join(_PROJETO, nome + '.py'), 'rb') as arquivo:
+            sha.update(f"{nome}.py".encode())
+            sha.update(arquivo.read())
+    return sha.hexdigest()
+
+
+# --- Hash do conteúdo ---
+
+def _alimentar(sha, valor, modulos):
+    # `modulos` recebe os módulos das funções e classes encontradas, para a versão do código
+    if valor is None or isinstance(valor, (bool, int, float, complex, str, bytes, np.generic)):
+        sha.update(f"{type(valor).__name__}:{valor!r};".encode())
+    elif isinstance(valor, np.ndarray):
+        sha.update(f"ndarray:{valor.dtype.str}:{valor.shape};".encode())
+        sha.update(pickle.dumps(valor) if valor.dtype.hasobject else np.ascontiguousarray(valor).data)
+    elif isinstance(valor, pd.DataFrame):
+        sha.update(f"DataFrame:{list(valor.columns)!r}:{list(valor.dtypes.astype(str))!r};".encode())
+        sha.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().data)
+    elif isinstance(valor, pd.Series):
+        sha.update(f"Series:{valor.name!r}:{valor.dtype};".encode())
+        sha.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().data)
+    elif isinstance(valor, pd.Index):
+        _alimentar(sha, valor.to_series(), modulos)
+    elif isinstance(valor, dict):
+        sha.update(f"dict:{len(valor)};".encode())
+        for chave in sorted(valor, key=repr):
+            _alimentar(sha, chave, modulos)
+            _alimentar(sha, valor[chave], modulos)
+    elif isinstance(valor, (list, tuple)):
+        sha.update(f"{type(valor).__name__}:{len(valor)};".encode())
+        for item in valor:
+            _alimentar(sha, item, modulos)
+    elif isinstance(valor, functools.partial):
+        sha.update(b"partial;")
+        _alimentar(sha, (valor.func, valor.args, valor.keywords), modulos)
+    elif callable(valor) and hasattr(valor, '__qualname__'):
+        # Funções e classes pelo nome; mudanças no código entram pela versao_codigo()
+        sha.update(f"funcao:{valor.__module__}.{valor.__qualname__};".encode())
+        modulos.add(str(valor.__module__).split('.')[0])
+    elif hasattr(valor, '__dict__'):
+        sha.update(f"objeto:{type(valor).__module__}.{type(valor).__qualname__};".encode())
+        modulos.add(type(valor).__module__.split('.')[0])
+        _alimentar(sha, vars(valor), modulos)
+    else:
+        sha.update(pickle.dumps(valor))
+
+
+def chave(*partes):
+    """Hash (hex) das partes, incluindo a versão do código de que elas dependem."""
+    sha = hashlib.sha256()
+    modulos = set()
+    for parte in partes:
+        _alimentar(sha, parte, modulos)
+    versao = versao_codigo(frozenset(modulos & modulos_projeto()))
+    return hashlib.sha256(f"{versao}:{sha.hexdigest()}".encode()).hexdigest()
+
+
+# --- Armazenamento ---
+
+def _caminho(chave_item, extensao):
+    return os.path.join(DIRETORIO, chave_item[:2], chave_item + extensao)
+
+
+def _gravar(destino, escrever):
+    # Grava num temporário e renomeia: leitores nunca veem um arquivo pela metade
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(destino))
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            escrever(arquivo)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    _registrar_gravacao(os.path.getsize(destino))
+
+
+def _registrar_gravacao(tamanho):
+    # Percorre o diretório só no primeiro uso, quando a estimativa passa do
+    # limite ou a cada APARAR_A_CADA gravações (outros processos também gravam)
+    global _tamanho_estimado, _gravacoes
+    _gravacoes += 1
+    if _tamanho_estimado is not None:
+        _tamanho_estimado += tamanho
+    if _tamanho_estimado is None or _tamanho_estimado > TAMANHO_MAXIMO or _gravacoes >= APARAR_A_CADA:
+        aparar()
+
+
+def aparar(tamanho_maximo=None):
+    """Apaga os itens usados há mais tempo até o cache caber no tamanho máximo; devolve o tamanho final."""
+    global _tamanho_estimado, _gravacoes
+    tamanho_maximo = TAMANHO_MAXIMO if tamanho_maximo is None else tamanho_maximo
+    itens = []
+    for raiz, _, arquivos in os.walk(DIRETORIO):
+        for nome in arquivos:
+            caminho = os.path.join(raiz, nome)
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            itens.append((info.st_mtime, info.st_size, caminho))
+    total = sum(tamanho for _, tamanho, _ in itens)
+    for _, tamanho, caminho in sorted(itens):
+        if total <= tamanho_maximo:
+            break
+        try:
+            os.unlink(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+    _tamanho_estimado, _gravacoes = total, 0
+    return total
+
+
+def _usar(caminho):
+    # O mtime marca o último uso, para a ordem de descarte
+    try:
+        os.utime(caminho)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def memoizar(funcao, *argumentos, **opcoes):
+    """funcao(*argumentos, **opcoes), lida do cache quando dados, parâmetros e código não mudaram."""
+    if not ativa():
+        return funcao(*argumentos, **opcoes)
+    destino = _caminho(chave('resultado', funcao, argumentos, opcoes), '.pkl')
+    if _usar(destino):
+        try:
+            with open(destino, 'rb') as arquivo:
+                return pickle.load(arquivo)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass  # item corrompido ou apagado no meio da leitura: recalcula
+    resultado = funcao(*argumentos, **opcoes)
+    _gravar(destino, lambda arquivo: pickle.dump(resultado, arquivo, protocol=pickle.HIGHEST_PROTOCOL))
+    return resultado
+
+
+# --- Figuras ---
+
+def chave_figura(especificacao):
+    """Chave de uma especificação de gráfico (ver renderizacao.py), ou None sem memoização."""
+    if not ativa():
+        return None
+    extensao = os.path.splitext(especificacao.arquivo)[1]
+    return chave('figura', especificacao.desenhar, especificacao.argumentos, especificacao.opcoes,
+                 especificacao.tamanho, extensao)
+
+
+def restaurar_arquivo(chave_item, destino):
+    """Copia a figura guardada para `destino`; False se não estiver no cache."""
+    if chave_item is None:
+        return False
+    origem = _caminho(chave_item, os.path.splitext(destino)[1])
+    if not _usar(origem):
+        return False
+    try:
+        shutil.copyfile(origem, destino)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def guardar_arquivo(chave_item, origem):
+    if chave_item is None:
+        return
+    with open(origem, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    _gravar(_caminho(chave_item, os.path.splitext(origem)[1]), lambda destino: destino.write(conteudo))
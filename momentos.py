@@ -0,0 +1,135 @@
+import numpy as np
+
+from compacto import para_float64
+
+# --- Acumulador de Momentos em Passagem Única ---
+# Guarda contagem, média e as somas dos desvios centrais (M2, M3, M4) de cada
+# bloco de dados e combina blocos com as fórmulas de Welford/Terriberry.
+# Assim a variância, o erro-padrão, a assimetria e a curtose saem de uma única
+# leitura dos dados, mesmo quando eles chegam em pedaços.
+# Dados float32 (modo compacto) voltam a float64 um bloco de TAMANHO_BLOCO
+# linhas por vez (ver compacto.py): a acumulação é sempre em float64, sem uma
+# cópia float64 do array inteiro.
+
+TAMANHO_BLOCO = 1 << 20
+
+
+class Momentos:
+    """Contagem, média, M2, M3, M4, mínimo e máximo de uma amostra."""
+
+    def __init__(self, n=0, media=0.0, m2=0.0, m3=0.0, m4=0.0, minimo=np.inf, maximo=-np.inf):
+        self.n = n
+        self.media = media
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+        self.minimo = minimo
+        self.maximo = maximo
+
+    @classmethod
+    def de_array(cls, dados, axis=0):
+        """Calcula os momentos de um bloco de dados (ignora NaN) de forma vetorizada."""
+        dados = np.asarray(dados)
+        if dados.dtype != np.float64 and axis == 0 and dados.ndim and dados.shape[0] > TAMANHO_BLOCO:
+            return cls.de_blocos(dados[inicio:inicio + TAMANHO_BLOCO]
+                                 for inicio in range(0, dados.shape[0], TAMANHO_BLOCO))
+        dados = para_float64(dados)
+        validos = ~np.isnan(dados)
+        n = validos.sum(axis=axis)
+        soma = np.where(validos, dados, 0.0).sum(axis=axis)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = soma / n
+        desvios = np.where(validos, dados - np.expand_dims(media, axis), 0.0)
+        d2 = desvios * desvios
+        m2 = d2.sum(axis=axis)
+        m3 = (d2 * desvios).sum(axis=axis)
+        m4 = (d2 * d2).sum(axis=axis)
+        minimo = np.where(validos, dados, np.inf).min(axis=axis, initial=np.inf)
+        maximo = np.where(validos, dados, -np.inf).max(axis=axis, initial=-np.inf)
+        media = np.where(n > 0, media, 0.0)
+        if np.ndim(n) == 0:
+            return cls(int(n), float(media), float(m2), float(m3), float(m4), float(minimo), float(maximo))
+        return cls(n, media, m2, m3, m4, minimo, maximo)
+
+    @classmethod
+    def de_blocos(cls, blocos):
+        """Acumula os momentos de um iterável de blocos (ex.: leitura em chunks)."""
+        total = cls()
+        for bloco in blocos:
+            total = total + cls.de_array(bloco)
+        return total
+
+    def __add__(self, outro):
+        # Combinação de Chan/Terriberry para dois conjuntos de momentos centrais
+        n_a, n_b = self.n, outro.n
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = outro.media - self.media
+            delta_n = np.where(n > 0, delta / np.where(n > 0, n, 1), 0.0)
+            delta_n2 = delta_n * delta_n
+            termo1 = delta * delta_n * n_a * n_b
+
+            media = self.media + n_b * delta_n
+            m2 = self.m2 + outro.m2 + termo1
+            m3 = (self.m3 + outro.m3
+                  + termo1 * delta_n * (n_a - n_b)
+                  + 3.0 * delta_n * (n_a * outro.m2 - n_b * self.m2))
+            m4 = (self.m4 + outro.m4
+                  + termo1 * delta_n2 * (n_a * n_a - n_a * n_b + n_b * n_b)
+                  + 6.0 * delta_n2 * (n_a * n_a * outro.m2 + n_b * n_b * self.m2)
+                  + 4.0 * delta_n * (n_a * outro.m3 - n_b * self.m3))
+        minimo = np.minimum(self.minimo, outro.minimo)
+        maximo = np.maximum(self.maximo, outro.maximo)
+        if np.ndim(n) == 0:
+            return Momentos(int(n), float(media), float(m2), float(m3), float(m4), float(minimo), float(maximo))
+        return Momentos(n, media, m2, m3, m4, minimo, maximo)
+
+    # --- Estatísticas derivadas (mesmas convenções do pandas) ---
+
+    def _por_n(self, valor, minimo_n):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n >= minimo_n, valor, np.nan)[()]
+
+    def _float64(self):
+        # n e M2..M4 em np.float64: divisões por zero viram inf/NaN (tratados por
+        # np.where/_por_n) em vez de ZeroDivisionError nos escalares Python
+        return tuple(np.asarray(valor, dtype=np.float64) for valor in (self.n, self.m2, self.m3, self.m4))
+
+    @property
+    def amplitude(self):
+        return self._por_n(self.maximo - self.minimo, 1)
+
+    def variancia(self, ddof=1):
+        n, m2, _, _ = self._float64()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._por_n(m2 / (n - ddof), ddof + 1)
+
+    def desvio_padrao(self, ddof=1):
+        return np.sqrt(self.variancia(ddof))
+
+    def erro_padrao(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.desvio_padrao(ddof) / np.sqrt(self.n)
+
+    def coef_variacao(self, ddof=1):
+        # Em porcentagem, como no relatório; 0 quando a média é nula
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.media != 0, self.desvio_padrao(ddof) / self.media * 100, 0.0)[()]
+
+    def assimetria(self):
+        # Coeficiente G1 ajustado (o mesmo de Series.skew)
+        n, m2, m3, _ = self._float64()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(n * (n - 1.0)) / (n - 2.0) * (n ** 0.5 * m3) / m2 ** 1.5
+            g1 = np.where(m2 == 0, 0.0, g1)
+        return self._por_n(g1, 3)
+
+    def curtose(self):
+        # Curtose em excesso G2 (o mesmo de Series.kurtosis, padrão de Fisher)
+        n, m2, _, m4 = self._float64()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            numerador = (n + 1.0) * n * (n - 1.0) * m4
+            denominador = (n - 2.0) * (n - 3.0) * m2 ** 2
+            ajuste = 3.0 * (n - 1.0) ** 2 / ((n - 2.0) * (n - 3.0))
+            g2 = np.where(m2 == 0, 0.0, numerador / denominador - ajuste)
+        return self._por_n(g2, 4)
@@ -0,0 +1,93 @@
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+from paralelo import mapear
+
+# --- Teste Qui-Quadrado por Simulação de Monte Carlo ---
+# Quando há frequências esperadas abaixo de 5, o p-valor assintótico do
+# Qui-Quadrado deixa de ser confiável. Aqui as tabelas são simuladas com as
+# margens observadas fixas (amostragem hipergeométrica sequencial, como no
+# algoritmo de Patefield), em lotes vetorizados: cada lote sorteia todas as
+# réplicas de uma célula de uma vez. Os lotes são distribuídos entre processos,
+# cada um com sua semente derivada (SeedSequence), e o resultado é o mesmo
+# qualquer que seja o número de processos.
+#
+# Em tabelas 2x2 a estatística (observada e simulada) leva a mesma correção de
+# Yates do teste assintótico (`contingencia.qui_quadrado`), salvo `correcao=False`.
+
+ResultadoMonteCarlo = namedtuple('ResultadoMonteCarlo', 'estatistica p_valor erro_padrao replicas')
+
+REPLICAS_POR_TAREFA = 50_000
+
+
+def simular_tabelas(soma_linhas, soma_colunas, replicas, rng):
+    """Sorteia `replicas` tabelas com as margens dadas (replicas x linhas x colunas)."""
+    soma_linhas = np.asarray(soma_linhas, dtype=np.int64)
+    soma_colunas = np.asarray(soma_colunas, dtype=np.int64)
+    n_linhas, n_colunas = soma_linhas.size, soma_colunas.size
+    tabelas = np.zeros((replicas, n_linhas, n_colunas), dtype=np.int64)
+    restantes = np.tile(soma_colunas, (replicas, 1))
+    for i in range(n_linhas - 1):
+        falta = np.full(replicas, soma_linhas[i])
+        fora = restantes.sum(axis=1)
+        for j in range(n_colunas - 1):
+            # Dos itens restantes, quantos da coluna j caem na linha i
+            fora = fora - restantes[:, j]
+            sorteio = rng.hypergeometric(restantes[:, j], fora, falta)
+            tabelas[:, i, j] = sorteio
+            restantes[:, j] -= sorteio
+            falta = falta - sorteio
+        tabelas[:, i, -1] = falta
+        restantes[:, -1] -= falta
+    tabelas[:, -1, :] = restantes
+    return tabelas
+
+
+def _estatistica(tabelas, esperadas, correcao=False):
+    # Qui-Quadrado de Pearson, ignorando células com esperada nula; com `correcao`,
+    # cada |O - E| diminui de até 0.5 (Yates), como em contingencia.qui_quadrado
+    positivas = esperadas > 0
+    diferenca = np.abs(tabelas[..., positivas] - esperadas[positivas])
+    if correcao:
+        diferenca = diferenca - np.minimum(0.5, diferenca)
+    return (diferenca * diferenca / esperadas[positivas]).sum(axis=-1)
+
+
+def _contar_extremos(tarefa, soma_linhas, soma_colunas, esperadas, observada, lote, correcao):
+    semente, replicas = tarefa
+    rng = np.random.default_rng(semente)
+    extremos = 0
+    for inicio in range(0, replicas, lote):
+        tabelas = simular_tabelas(soma_linhas, soma_colunas, min(lote, replicas - inicio), rng)
+        # Tolerância relativa para empates numéricos com a estatística observada
+        extremos += int((_estatistica(tabelas, esperadas, correcao) >= observada * (1 - 1e-7)).sum())
+    return extremos
+
+
+def qui_quadrado_monte_carlo(observadas, replicas=10_000, semente=None, processos=None, lote=10_000, correcao=True):
+    """p-valor de Monte Carlo do Qui-Quadrado de independência, com margens fixas.
+
+    p = (1 + nº de réplicas com χ² >= observado) / (réplicas + 1), com erro
+    padrão sqrt(p (1 - p) / réplicas). Em tabelas 2x2, `correcao` aplica Yates.
+    """
+    if replicas < 1:
+        raise ValueError(f'O número de réplicas deve ser pelo menos 1 (recebido: {replicas}).')
+    observadas = np.asarray(observadas, dtype=np.int64)
+    soma_linhas, soma_colunas = observadas.sum(axis=1), observadas.sum(axis=0)
+    esperadas = np.outer(soma_linhas, soma_colunas) / observadas.sum()
+    correcao = correcao and observadas.shape == (2, 2)
+    estatistica = _estatistica(observadas.astype(np.float64), esperadas, correcao)
+
+    # Tarefas de tamanho fixo: as sementes não dependem do número de processos
+    tamanhos = [REPLICAS_POR_TAREFA] * (replicas // REPLICAS_POR_TAREFA)
+    if replicas % REPLICAS_POR_TAREFA:
+        tamanhos.append(replicas % REPLICAS_POR_TAREFA)
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    contar = partial(_contar_extremos, soma_linhas=soma_linhas, soma_colunas=soma_colunas,
+                     esperadas=esperadas, observada=estatistica, lote=lote, correcao=correcao)
+    extremos = sum(mapear(contar, list(zip(sementes, tamanhos)), processos if len(tamanhos) > 1 else 1))
+
+    p_valor = (1 + extremos) / (replicas + 1)
+    return ResultadoMonteCarlo(estatistica, p_valor, np.sqrt(p_valor * (1 - p_valor) / replicas), replicas)
@@ -0,0 +1,95 @@
+import ast
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Execução em Paralelo ---
+# Os pools usam o método de início padrão da plataforma. Com 'fork' (padrão
+# no Linux) os processos nascem com os módulos e dados já carregados. Com
+# 'spawn' ou 'forkserver' (Windows, macOS) cada processo importa de novo o
+# script principal; os exercícios são scripts sem `if __name__ == '__main__'`
+# e seriam executados inteiros outra vez, então nesses casos o trabalho só
+# vai para outros processos se o script principal tiver essa proteção (como
+# executor_lote.py); senão roda em série no próprio processo.
+#
+# Cada processo tem um único pool compartilhado (`executor_compartilhado`),
+# usado pela fila de gráficos e por `mapear`: um pool nunca é criado enquanto
+# outro está ativo, e os processos de trabalho (que já estão dentro de um
+# pool) rodam tudo em série, sem pools aninhados. Com 'fork', todos os
+# processos do pool são criados de uma vez, antes das threads do pool.
+#
+# EASG_PROCESSOS limita o número de processos (1 desliga o paralelismo).
+
+_COMPARTILHADO = None
+
+
+def numero_processos(processos=None):
+    if processos is None:
+        processos = int(os.environ.get('EASG_PROCESSOS', '0')) or os.cpu_count() or 1
+    return max(1, processos)
+
+
+def contexto():
+    """Contexto de multiprocessing do método padrão, ou None se o trabalho deve rodar em série."""
+    if multiprocessing.parent_process() is not None:
+        return None
+    metodo = multiprocessing.get_start_method()
+    if metodo != 'fork' and not _principal_protegido():
+        return None
+    return multiprocessing.get_context(metodo)
+
+
+def criar_executor(processos=None, inicializar=None):
+    """ProcessPoolExecutor novo, ou None quando o trabalho deve rodar em série.
+
+    `inicializar` é chamada uma vez em cada processo, ao ser criado.
+    """
+    processos = numero_processos(processos)
+    contexto_pool = contexto()
+    if processos == 1 or contexto_pool is None:
+        return None
+    return ProcessPoolExecutor(max_workers=processos, mp_context=contexto_pool, initializer=inicializar)
+
+
+def executor_compartilhado(processos=None):
+    """O pool único do processo, criado no primeiro uso (None quando o trabalho deve rodar em série).
+
+    `processos` só escolhe entre série (1) e o pool, que tem `numero_processos()` processos.
+    """
+    global _COMPARTILHADO
+    if numero_processos(processos) == 1:
+        return None
+    if _COMPARTILHADO is None:
+        _COMPARTILHADO = criar_executor()
+    return _COMPARTILHADO
+
+
+def mapear(funcao, itens, processos=None):
+    """Lista com funcao(item) para cada item, distribuída entre processos quando possível."""
+    executor = executor_compartilhado(processos)
+    if executor is None:
+        return [funcao(item) for item in itens]
+    return list(executor.map(funcao, itens))
+
+
+# --- Auxiliares internos ---
+
+def _principal_protegido():
+    # True se o módulo principal pode ser importado de novo pelos processos:
+    # sem arquivo (interpretador interativo, `python -c`) ou com `if __name__ == '__main__'`
+    caminho = getattr(sys.modules.get('__main__'), '__file__', None)
+    if caminho is None:
+        return True
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            arvore = ast.parse(arquivo.read())
+    except (OSError, SyntaxError, ValueError):
+        return False
+    return any(_protecao(no) for no in arvore.body)
+
+
+def _protecao(no):
+    if not isinstance(no, ast.If) or not isinstance(no.test, ast.Compare) or len(no.test.comparators) != 1:
+        return False
+    return {ast.unparse(no.test.left), ast.unparse(no.test.comparators[0])} == {'__name__', "'__main__'"}
@@ -0,0 +1,127 @@
+import numpy as np
+
+from compacto import para_float64
+
+# --- Motor de Quantis com Ordenação Única ---
+# Quartis, percentis, decis, mediana e limites de outliers saem todos da mesma
+# estrutura: os dados são ordenados uma vez e cada probabilidade vira só uma
+# consulta por índice. Para dados que não cabem na memória há um sketch KLL,
+# alimentado em blocos, com erro de posto limitado.
+# Dados float32 (modo compacto) são ordenados em float32, com metade da
+# memória; só os vizinhos usados na interpolação voltam a float64 (ver compacto.py).
+
+
+class _BaseQuantis:
+
+    def mediana(self):
+        return self.quantil(0.5)
+
+    def cercas(self, fator=1.5):
+        """Q1, Q3, IQR e os limites inferior/superior para outliers."""
+        q1, q3 = self.quantil([0.25, 0.75])
+        iqr = q3 - q1
+        return q1, q3, iqr, q1 - fator * iqr, q3 + fator * iqr
+
+
+class Quantis(_BaseQuantis):
+    """Quantis exatos (interpolação linear, como Series.quantile) sobre dados ordenados uma vez."""
+
+    def __init__(self, dados, axis=0):
+        dados = np.asarray(dados)
+        if dados.dtype not in (np.float32, np.float64):
+            dados = dados.astype(np.float64)
+        if dados.ndim == 1:
+            dados = dados[~np.isnan(dados)]
+        # np.sort coloca os NaN no fim; n conta apenas os valores válidos
+        self.ordenados = np.sort(dados, axis=axis)
+        self.axis = axis
+        self.n = (~np.isnan(self.ordenados)).sum(axis=axis)
+
+    def quantil(self, p):
+        p = np.asarray(p, dtype=np.float64)
+        n = np.asarray(self.n)
+        # Posição fracionária h = (n - 1) * p, igual ao método 'linear' do pandas
+        h = np.multiply.outer(p, n - 1).astype(np.float64)
+        baixo = np.floor(h).astype(np.intp)
+        alto = np.minimum(baixo + 1, np.maximum(n - 1, 0))
+        baixo = np.maximum(baixo, 0)
+        fracao = h - baixo
+        if self.ordenados.ndim == 1:
+            v_baixo = self.ordenados[baixo] if self.ordenados.size else np.full(baixo.shape, np.nan)
+            v_alto = self.ordenados[alto] if self.ordenados.size else np.full(alto.shape, np.nan)
+        else:
+            ordem = np.moveaxis(self.ordenados, self.axis, 0)
+            colunas = np.arange(ordem.shape[1])
+            v_baixo = ordem[baixo, colunas]
+            v_alto = ordem[alto, colunas]
+        v_baixo = para_float64(v_baixo)
+        v_alto = para_float64(v_alto)
+        valores = v_baixo + fracao * (v_alto - v_baixo)
+        valores = np.where(n > 0, valores, np.nan)
+        return valores[()] if valores.ndim else float(valores)
+
+
+class SketchQuantis(_BaseQuantis):
+    """Sketch KLL mesclável: quantis aproximados com memória O(k log(n/k)).
+
+    O erro de posto é da ordem de 1/k (k=200 dá ~1%); use `atualizar` para
+    cada bloco lido e `+` para juntar sketches de partições diferentes.
+    """
+
+    def __init__(self, k=200, semente=None):
+        self.k = k
+        self.n = 0
+        self.niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        profundidade = len(self.niveis) - nivel - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** profundidade)))
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco, dtype=np.float64).ravel()
+        bloco = bloco[~np.isnan(bloco)]
+        self.n += bloco.size
+        self.niveis[0] = np.concatenate([self.niveis[0], bloco])
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self.niveis):
+            if self.niveis[nivel].size > self._capacidade(nivel):
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                itens = np.sort(self.niveis[nivel])
+                # Um item sobra quando a quantidade é ímpar e fica no nível atual
+                par = itens.size - itens.size % 2
+                promovidos = itens[self._rng.integers(2):par:2]
+                self.niveis[nivel] = itens[par:]
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+            nivel += 1
+
+    def __add__(self, outro):
+        total = SketchQuantis(max(self.k, outro.k))
+        total._rng = self._rng
+        total.n = self.n + outro.n
+        profundidade = max(len(self.niveis), len(outro.niveis))
+        total.niveis = [
+            np.concatenate([a[i] for a in (self.niveis, outro.niveis) if i < len(a)])
+            for i in range(profundidade)
+        ]
+        total._compactar()
+        return total
+
+    def quantil(self, p):
+        p = np.asarray(p, dtype=np.float64)
+        if self.n == 0:
+            return np.full(p.shape, np.nan)[()]
+        itens = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(nivel.size, 2.0 ** i) for i, nivel in enumerate(self.niveis)])
+        ordem = np.argsort(itens)
+        itens, pesos = itens[ordem], pesos[ordem]
+        # Posto médio (base 0) de cada item; sem compactação coincide com o índice exato
+        acumulado = np.cumsum(pesos)
+        postos = (acumulado - pesos / 2.0) / acumulado[-1] * self.n - 0.5
+        valores = np.interp(p * (self.n - 1), postos, itens)
+        return valores[()] if valores.ndim else float(valores)
@@ -0,0 +1,128 @@
+import numpy as np
+
+from compacto import para_float64
+from frequencias import ContadorFrequencias
+
+# --- Diagrama de Ramo-e-Folhas em Blocos ---
+# Cada valor vira um código inteiro ramo * 10 + folha por aritmética de
+# dígitos (|x| / unidade da folha, truncado), numa única passagem vetorizada
+# por bloco. Os códigos são contados num ContadorFrequencias, então a memória
+# depende do número de ramos (no máximo 10 contagens por ramo), e não do
+# número de valores. Na exibição, ramos com folhas demais mostram uma amostra
+# proporcional das folhas, seguida do total de valores do ramo.
+#
+# Ramos negativos usam chaves -1, -2, ... para '-0', '-1', ...: o código
+# ramo * 10 + folha continua único e ordenado.
+#
+# Só os ramos que ocorrem são listados, com os ramos vazios entre eles quando
+# a lacuna tem até RAMOS_VAZIOS_MAX ramos. Lacunas maiores (um valor extremo
+# como 1e9 criaria milhões de ramos vazios) viram uma única linha LACUNA.
+#
+# Blocos float32 (modo compacto) voltam aos decimais originais aos pedaços (ver compacto.py).
+
+TAMANHO_BLOCO = 1 << 22  # valores processados por vez, para limitar os temporários
+RAMOS_VAZIOS_MAX = 5  # ramos vazios seguidos exibidos; acima disso, uma linha LACUNA
+LACUNA = ':'
+
+
+class RamoFolhas:
+    """Acumula ramos e folhas de blocos de valores; `escala` é o valor de uma unidade do ramo."""
+
+    def __init__(self, escala=10, folhas_max=40):
+        self.escala = escala
+        self.folhas_max = folhas_max
+        self._contador = ContadorFrequencias()
+
+    @classmethod
+    def de_array(cls, dados, escala=10, folhas_max=40):
+        return cls(escala, folhas_max).atualizar(dados)
+
+    @classmethod
+    def de_blocos(cls, blocos, escala=10, folhas_max=40):
+        ramo_folhas = cls(escala, folhas_max)
+        for bloco in blocos:
+            ramo_folhas.atualizar(bloco)
+        return ramo_folhas
+
+    @property
+    def total(self):
+        return self._contador.total
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco).ravel()
+        for inicio in range(0, bloco.size, TAMANHO_BLOCO):
+            self._contador.atualizar(self._codigos(para_float64(bloco[inicio:inicio + TAMANHO_BLOCO])))
+        return self
+
+    def __add__(self, outro):
+        if self.escala != outro.escala:
+            raise ValueError("Só é possível somar diagramas com a mesma escala.")
+        total = RamoFolhas(self.escala, self.folhas_max)
+        total._contador = self._contador + outro._contador
+        return total
+
+    def _codigos(self, valores):
+        valores = valores[~np.isnan(valores)]
+        # Tolerância para erros de representação (ex.: 2.3 / 0.1 = 22.999...)
+        unidades = np.floor(np.abs(valores) / (self.escala / 10) + 1e-9).astype(np.int64)
+        ramos, folhas = np.divmod(unidades, 10)
+        ramos = np.where(valores < 0, -ramos - 1, ramos)
+        return ramos * 10 + folhas
+
+    def contagens(self):
+        """Matriz (ramos x 10) com a contagem de cada folha, e as chaves dos ramos (de mín. a máx.).
+
+        Ramos vazios só entram em lacunas de até RAMOS_VAZIOS_MAX ramos.
+        """
+        codigos, contagens = self._contador._itens()
+        if codigos.size == 0:
+            return np.empty(0, dtype=np.int64), np.zeros((0, 10), dtype=np.int64)
+        ramos, folhas = np.divmod(codigos, 10)
+        presentes = np.unique(ramos)
+        vazios = np.diff(presentes) - 1
+        curtas = (vazios > 0) & (vazios <= RAMOS_VAZIOS_MAX)
+        preenchidos = [np.arange(a + 1, b) for a, b in zip(presentes[:-1][curtas], presentes[1:][curtas])]
+        chaves = np.sort(np.concatenate([presentes, *preenchidos]))
+        matriz = np.zeros((chaves.size, 10), dtype=np.int64)
+        matriz[np.searchsorted(chaves, ramos), folhas] = contagens
+        return chaves, matriz
+
+    def _folhas_exibidas(self, linha):
+        # Folhas de um ramo em ordem; acima de `folhas_max`, amostra proporcional por dígito
+        total = linha.sum()
+        if total > self.folhas_max:
+            linha = np.floor(linha * self.folhas_max / total + 0.5).astype(np.int64)
+        return ''.join(np.repeat(np.array(list('0123456789')), linha))
+
+    def linhas(self):
+        """Linhas (rótulo do ramo, folhas exibidas, total do ramo), do menor ramo ao maior.
+
+        Uma lacuna longa de ramos vazios aparece como a linha (LACUNA, '', 0).
+        """
+        chaves, matriz = self.contagens()
+        resultado = []
+        for i, (chave, linha) in enumerate(zip(chaves, matriz)):
+            if i and chave - chaves[i - 1] > 1:
+                resultado.append((LACUNA, '', 0))
+            rotulo = f"-{-chave - 1}" if chave < 0 else str(chave)
+            folhas = self._folhas_exibidas(linha)
+            if chave < 0:
+                # Nos ramos negativos, a ordem crescente dos valores é a decrescente das folhas
+                folhas = folhas[::-1]
+            resultado.append((rotulo, folhas, int(linha.sum())))
+        return resultado
+
+    def texto(self, unidade=''):
+        """Diagrama em texto, com a chave de leitura e o total de cada ramo quando há amostragem."""
+        linhas = self.linhas()
+        largura = max((len(rotulo) for rotulo, _, _ in linhas), default=1)
+        exemplo = 1.2 * self.escala
+        saida = [f"Chave: 1 | 2 = {exemplo:g}{(' ' + unidade) if unidade else ''}"]
+        for rotulo, folhas, total in linhas:
+            if rotulo == LACUNA:
+                saida.append(f"{LACUNA:>{largura}}")
+                continue
+            sufixo = f" ({total})" if total > len(folhas) else ''
+            saida.append(f"{rotulo:>{largura}} | {folhas}{sufixo}")
+        return '\n'.join(saida)
+
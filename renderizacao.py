@@ -0,0 +1,69 @@
+from collections import namedtuple
+
+import matplotlib
+matplotlib.use('Agg')  # sem janelas: as figuras só são gravadas em arquivo
+from matplotlib.figure import Figure
+
+import memoizacao
+from paralelo import executor_compartilhado
+
+# --- Renderização de Gráficos em Paralelo ---
+# Cada gráfico é descrito por uma especificação (arquivo, função de desenho e
+# seus argumentos) separada do desenho em si. As funções de desenho (ver
+# graficos.py) recebem uma Figure nova, sem o estado global do pyplot, e podem
+# rodar em qualquer processo. A fila envia as especificações a um pool de
+# processos assim que são criadas; o script segue imprimindo as estatísticas
+# e só espera os PNGs no final. O pool é o compartilhado do processo (ver
+# paralelo.py), o mesmo das reamostragens e simulações. Sem pool (um processo
+# só, ou script sem proteção de __main__ fora do 'fork'), os gráficos são
+# desenhados em série ao esperar.
+#
+# Gráficos cuja especificação (dados, parâmetros e código) não mudou desde a
+# última execução são copiados do cache de memoizacao.py, sem redesenhar.
+
+Grafico = namedtuple('Grafico', 'arquivo desenhar argumentos opcoes tamanho')
+
+
+def grafico(arquivo, desenhar, *argumentos, tamanho=(8, 6), **opcoes):
+    """Especificação de um gráfico: desenhar(fig, *argumentos, **opcoes) e salvar em `arquivo`."""
+    return Grafico(arquivo, desenhar, argumentos, opcoes, tamanho)
+
+
+def renderizar(especificacao):
+    fig = Figure(figsize=especificacao.tamanho)
+    especificacao.desenhar(fig, *especificacao.argumentos, **especificacao.opcoes)
+    fig.savefig(especificacao.arquivo)
+    return especificacao.arquivo
+
+
+class FilaGraficos:
+    """Fila de gráficos desenhados em paralelo; `esperar()` devolve os arquivos gravados, na ordem de envio."""
+
+    def __init__(self, processos=None):
+        self._executor = executor_compartilhado(processos)
+        self._pendentes = []
+
+    def enviar(self, especificacao):
+        chave = memoizacao.chave_figura(especificacao)
+        if memoizacao.restaurar_arquivo(chave, especificacao.arquivo):
+            self._pendentes.append((None, especificacao.arquivo))
+        elif self._executor is None:
+            self._pendentes.append((chave, especificacao))
+        else:
+            self._pendentes.append((chave, self._executor.submit(renderizar, especificacao)))
+
+    def esperar(self):
+        arquivos = []
+        try:
+            for chave, item in self._pendentes:
+                if isinstance(item, Grafico):
+                    item = renderizar(item)
+                elif not isinstance(item, str):
+                    item = item.result()
+                if chave is not None:
+                    memoizacao.guardar_arquivo(chave, item)
+                arquivos.append(item)
+            return arquivos
+        finally:
+            self._pendentes = []
+
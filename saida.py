@@ -0,0 +1,201 @@
+import os
+import sys
+
+import numpy as np
+
+# --- Formatação Vetorizada e Escrita de Tabelas em Blocos ---
+# As tabelas ficam numéricas até a saída: a linha de Total é passada à parte
+# e marcadores como '' ou '---' só existem no texto escrito, então nenhuma
+# coluna vira `object`. Cada coluna é formatada de uma vez, com operações
+# vetorizadas de string do NumPy (sem `.map(format)` elemento a elemento),
+# e as linhas são escritas em blocos de TAMANHO_BLOCO, sem copiar a tabela.
+#
+# Formatos: 'texto' (colunas alinhadas, para o console), 'markdown', 'csv' e
+# 'json' (um objeto por linha). Em CSV e JSON os números saem sem formatação.
+
+TAMANHO_BLOCO = 65_536
+FORMATOS = ('texto', 'markdown', 'csv', 'json')
+EXTENSOES = {'.txt': 'texto', '.md': 'markdown', '.csv': 'csv', '.json': 'json', '.jsonl': 'json'}
+
+
+def fixo(valores, casas=2, sufixo='', vazio=''):
+    """Números com `casas` decimais (como '{:.2f}'), formatados todos de uma vez; NaN vira `vazio`."""
+    valores = np.asarray(valores, dtype=np.float64)
+    escala = 10 ** casas
+    brutos = np.abs(valores) * escala
+    escalados = np.round(brutos)
+    finitos = np.isfinite(escalados)
+    if finitos.any() and escalados[finitos].max() >= 2 ** 53:
+        # Fora da faixa exata do int64/float64: formatação elemento a elemento
+        texto = np.char.mod(f'%.{casas}f', valores)
+    else:
+        inteiros, decimais = np.divmod(np.where(finitos, escalados, 0).astype(np.int64), escala)
+        texto = np.char.add(np.where(np.signbit(valores), '-', ''), _digitos(inteiros))
+        if casas:
+            # Só existem `escala` partes decimais possíveis: uma tabela de consulta evita convertê-las uma a uma
+            partes = np.char.zfill(np.arange(escala).astype(str), casas)
+            texto = np.char.add(np.char.add(texto, '.'), partes[decimais])
+        # Perto de meia unidade o produto por `escala` pode cair do outro lado do
+        # empate (1.05 é 1.04999... em binário: '{:.1f}' dá '1.0', np.round(10.5) dá 10):
+        # esses poucos valores são formatados um a um, com o arredondamento exato do printf
+        with np.errstate(invalid='ignore'):
+            empates = finitos & (np.abs(brutos - np.floor(brutos) - 0.5) < 1e-6)
+        if empates.any():
+            exatos = np.char.mod(f'%.{casas}f', valores[empates])
+            texto = np.array(texto, dtype=np.promote_types(np.asarray(texto).dtype, exatos.dtype))
+            texto[empates] = exatos
+    if sufixo:
+        texto = np.char.add(texto, sufixo)
+    return np.where(finitos, texto, vazio)
+
+
+def percentual(valores, casas=2, vazio=''):
+    """Frações (0 a 1) como porcentagens: 0.1333 -> '13.33%'."""
+    return fixo(np.asarray(valores, dtype=np.float64) * 100, casas, '%', vazio)
+
+
+def inteiro(valores):
+    return _digitos(np.asarray(valores).astype(np.int64))
+
+
+def formato_do_arquivo(caminho):
+    """Formato de saída pela extensão do arquivo ('texto' se desconhecida)."""
+    return EXTENSOES.get(os.path.splitext(caminho)[1].lower(), 'texto')
+
+
+# --- Auxiliares internos ---
+
+def _digitos(inteiros):
+    # Inteiros não negativos: com poucos valores possíveis (contagens, porcentagens),
+    # converte só 0..máximo e indexa, em vez de converter cada elemento
+    if inteiros.size and inteiros.min() >= 0 and inteiros.max() < inteiros.size:
+        return np.arange(inteiros.max() + 1).astype(str)[inteiros]
+    return inteiros.astype(str)
+
+
+def _texto_coluna(valores, formatar):
+    if formatar is not None:
+        return np.asarray(formatar(valores)).astype(str, copy=False)
+    valores = np.asarray(valores)
+    return _digitos(valores.astype(np.int64)) if valores.dtype.kind in 'iu' else valores.astype(str)
+
+
+def _blocos(tabela, indice, formatos, tamanho_bloco):
+    # Cada bloco: lista de arrays de strings, uma por coluna (índice primeiro)
+    for inicio in range(0, len(tabela), tamanho_bloco):
+        bloco = tabela.iloc[inicio:inicio + tamanho_bloco]
+        colunas = [_texto_coluna(bloco.index.to_numpy(), None)] if indice else []
+        colunas += [_texto_coluna(bloco[nome].to_numpy(), formatos.get(nome)) for nome in tabela.columns]
+        yield colunas
+
+
+def _linha_total(tabela, total, rotulo_total, indice, formatos, vazio):
+    # Valores numéricos passam pelo formato da coluna; textos e colunas ausentes ficam como estão
+    linha = [rotulo_total] if indice else []
+    for nome in tabela.columns:
+        if nome not in total:
+            linha.append(vazio)
+        elif isinstance(total[nome], str):
+            linha.append(total[nome])
+        else:
+            linha.append(str(_texto_coluna(np.asarray([total[nome]]), formatos.get(nome))[0]))
+    return linha
+
+
+def _juntar(colunas, separador):
+    linhas = colunas[0]
+    for coluna in colunas[1:]:
+        linhas = np.char.add(np.char.add(linhas, separador), coluna)
+    return linhas
+
+
+def _escrever_texto(destino, cabecalho, abrir_blocos, linha_total, alinhar_esquerda):
+    # Primeira passagem: largura de cada coluna; segunda: escrita alinhada.
+    # Com um único bloco, as strings da primeira passagem são reaproveitadas.
+    larguras = [len(nome) for nome in cabecalho]
+    blocos = abrir_blocos()
+    primeiro = next(blocos, None)
+    if primeiro is not None and next(blocos, None) is None:
+        abrir_blocos = lambda: iter([primeiro])  # noqa: E731
+    for colunas in abrir_blocos():
+        larguras = [max(largura, int(np.char.str_len(coluna).max(initial=0)))
+                    for largura, coluna in zip(larguras, colunas)]
+    if linha_total is not None:
+        larguras = [max(largura, len(valor)) for largura, valor in zip(larguras, linha_total)]
+
+    def alinhar(textos, i):
+        return np.char.ljust(textos, larguras[i]) if alinhar_esquerda[i] else np.char.rjust(textos, larguras[i])
+
+    destino.write('  '.join(str(alinhar(np.asarray(nome), i)) for i, nome in enumerate(cabecalho)) + '\n')
+    for colunas in abrir_blocos():
+        linhas = np.char.rstrip(_juntar([alinhar(coluna, i) for i, coluna in enumerate(colunas)], '  '))
+        destino.write('\n'.join(linhas.tolist()) + '\n')
+    if linha_total is not None:
+        destino.write('  '.join(str(alinhar(np.asarray(valor), i)) for i, valor in enumerate(linha_total)).rstrip()
+                      + '\n')
+
+
+def _escrever_markdown(destino, cabecalho, abrir_blocos, linha_total, alinhar_esquerda):
+    def escapar(textos):
+        return np.char.replace(textos, '|', '\\|')
+
+    destino.write('| ' + ' | '.join(str(escapar(np.asarray(nome))) for nome in cabecalho) + ' |\n')
+    destino.write('|' + '|'.join(':---' if esquerda else '---:' for esquerda in alinhar_esquerda) + '|\n')
+    for colunas in abrir_blocos():
+        linhas = _juntar([escapar(coluna) for coluna in colunas], ' | ')
+        destino.write('| ' + ' |\n| '.join(linhas.tolist()) + ' |\n')
+    if linha_total is not None:
+        destino.write('| ' + ' | '.join(str(escapar(np.asarray(valor))) for valor in linha_total) + ' |\n')
+
+
+def escrever_tabela(tabela, destino=None, formato='texto', formatos=None, total=None, rotulo_total='Total',
+                    indice=True, vazio='', tamanho_bloco=TAMANHO_BLOCO):
+    """Escreve a tabela em `destino` (arquivo aberto ou caminho; padrão: stdout), bloco a bloco.
+
+    `formatos` mapeia colunas para funções que formatam um array inteiro
+    (ex.: `percentual`), usadas em 'texto' e 'markdown'. `total` é a linha de
+    totais ({coluna: valor}); colunas sem total aparecem como `vazio`.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' desconhecido. Use um de: {', '.join(FORMATOS)}.")
+    if isinstance(destino, str):
+        with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+            return escrever_tabela(tabela, arquivo, formato, formatos, total, rotulo_total, indice, vazio,
+                                   tamanho_bloco)
+    destino = sys.stdout if destino is None else destino
+    formatos = formatos or {}
+
+    if formato in ('csv', 'json'):
+        _escrever_dados(tabela, destino, formato, total, rotulo_total, indice, tamanho_bloco)
+        return
+
+    nome_indice = tabela.index.name if tabela.index.name is not None else ''
+    cabecalho = ([str(nome_indice)] if indice else []) + [str(nome) for nome in tabela.columns]
+    # Índice e colunas de texto alinhados à esquerda; números, à direita
+    alinhar_esquerda = ([True] if indice else []) + [tabela[nome].dtype.kind in 'OSU' for nome in tabela.columns]
+    linha_total = None if total is None else _linha_total(tabela, total, rotulo_total, indice, formatos, vazio)
+    escrever = _escrever_texto if formato == 'texto' else _escrever_markdown
+    escrever(destino, cabecalho, lambda: _blocos(tabela, indice, formatos, tamanho_bloco), linha_total,
+             alinhar_esquerda)
+
+
+def _escrever_dados(tabela, destino, formato, total, rotulo_total, indice, tamanho_bloco):
+    import pandas as pd
+
+    for inicio in range(0, len(tabela), tamanho_bloco):
+        bloco = tabela.iloc[inicio:inicio + tamanho_bloco]
+        if formato == 'csv':
+            bloco.to_csv(destino, header=inicio == 0, index=indice)
+        else:
+            bloco = bloco.reset_index() if indice else bloco
+            destino.write(bloco.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+    if len(tabela) == 0 and formato == 'csv':
+        tabela.to_csv(destino, index=indice)
+    if total is not None:
+        linha = pd.DataFrame([total], columns=tabela.columns,
+                             index=pd.Index([rotulo_total], name=tabela.index.name))
+        if formato == 'csv':
+            linha.to_csv(destino, header=False, index=indice)
+        else:
+            linha = linha.reset_index() if indice else linha
+            destino.write(linha.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analises import ANALISES
+
+# --- Serviço de Análises de Longa Duração ---
+# Um processo que fica aberto respondendo consultas às análises de analises.py,
+# sem pagar de novo importações, leitura das planilhas e cálculos a cada
+# pergunta. Três níveis ficam num cache LRU com limite de memória:
+#   dados     o DataFrame lido (chave: análise, caminho, mtime e tamanho do arquivo)
+#   resumo    o cálculo caro sobre os dados (matriz de correlação, tabela de influência, ...)
+#   resposta  a resposta para um conjunto de parâmetros
+# Trocar um parâmetro (outro alpha, outro par, outro outlier) só refaz a resposta;
+# alterar o arquivo muda a chave e os itens antigos saem do cache pelo uso.
+#
+# Protocolo: um objeto JSON por linha, uma resposta JSON por linha.
+#   {"id": 1, "analise": "c4e15", "entrada": "Avaliação_Alunos.xlsx", "parametros": {"alpha": 0.01}}
+#   -> {"id": 1, "ok": true, "resultado": ..., "cache": "resumo", "ms": 0.8}
+#   {"comando": "estado"} | {"comando": "limpar"} | {"comando": "encerrar"}
+# "cache" indica o nível mais alto encontrado pronto (ou null).
+#
+# Uso: python servico.py                     (stdin/stdout)
+#      python servico.py --socket /tmp/easg.sock
+#
+# EASG_SERVICO_MEMORIA: limite do cache em bytes (padrão: 512 MB).
+
+MEMORIA_MAXIMA = int(os.environ.get('EASG_SERVICO_MEMORIA', 512 * 2 ** 20))
+
+
+def tamanho_em_memoria(valor, vistos=None):
+    """Estimativa dos bytes ocupados por um valor (DataFrames, arrays, dicionários e objetos simples)."""
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_em_memoria(v, vistos) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_em_memoria(v, vistos) for v in valor)
+    if hasattr(valor, '__dict__'):
+        return sys.getsizeof(valor) + tamanho_em_memoria(vars(valor), vistos)
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """Dicionário com limite de memória: ao passar do limite, descarta os itens usados há mais tempo."""
+
+    def __init__(self, memoria_maxima=MEMORIA_MAXIMA):
+        self.memoria_maxima = memoria_maxima
+        self.memoria = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()  # chave -> (valor, tamanho)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, calcular):
+        """Valor da chave (calculado e guardado se faltar) e se ele já estava no cache."""
+        if chave in self._itens:
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return self._itens[chave][0], True
+        self.falhas += 1
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor, False
+
+    def guardar(self, chave, valor):
+        if chave in self._itens:
+            self.memoria -= self._itens.pop(chave)[1]
+        tamanho = tamanho_em_memoria(valor)
+        if tamanho > self.memoria_maxima:
+            return  # maior que o cache inteiro: é devolvido, mas não guardado
+        self._itens[chave] = (valor, tamanho)
+        self.memoria += tamanho
+        while self.memoria > self.memoria_maxima:
+            _, (_, tamanho_antigo) = self._itens.popitem(last=False)
+            self.memoria -= tamanho_antigo
+
+    def limpar(self):
+        self._itens.clear()
+        self.memoria = 0
+
+    def estado(self):
+        return {'itens': len(self._itens), 'memoria': self.memoria, 'memoria_maxima': self.memoria_maxima,
+                'acertos': self.acertos, 'falhas': self.falhas}
+
+
+class Servico:
+    """Responde consultas às análises, com dados, resumos e respostas num CacheLRU."""
+
+    def __init__(self, memoria_maxima=MEMORIA_MAXIMA):
+        self.cache = CacheLRU(memoria_maxima)
+
+    def consultar(self, analise, entrada=None, parametros=None):
+        """Resposta da análise e o nível de cache encontrado ('resposta', 'resumo', 'dados' ou None)."""
+        if analise not in ANALISES:
+            raise ValueError(f"Análise '{analise}' desconhecida. Use uma de: {', '.join(ANALISES)}.")
+        definicao = ANALISES[analise]
+        caminho = os.path.abspath(entrada or definicao.arquivo)
+        info = os.stat(caminho)
+        chave_dados = ('dados', analise, caminho, info.st_mtime_ns, info.st_size)
+        chave_resumo = ('resumo',) + chave_dados[1:]
+        parametros = parametros or {}
+        chave_resposta = ('resposta',) + chave_dados[1:] + (json.dumps(parametros, sort_keys=True),)
+
+        nivel = None
+        for nome, chave in (('dados', chave_dados), ('resumo', chave_resumo), ('resposta', chave_resposta)):
+            if chave in self.cache:
+                nivel = nome
+
+        def calcular_resposta():
+            df, _ = self.cache.obter(chave_dados, lambda: definicao.ler(caminho))
+            resumo, _ = self.cache.obter(chave_resumo, lambda: definicao.resumir(df))
+            return definicao.responder(resumo, df, **parametros)
+
+        resposta, _ = self.cache.obter(chave_resposta, calcular_resposta)
+        return resposta, nivel
+
+    def atender(self, pedido):
+        """Processa um pedido (dicionário) e devolve o dicionário de resposta."""
+        inicio = time.perf_counter()
+        resposta = {'id': pedido.get('id')}
+        try:
+            comando = pedido.get('comando')
+            if comando == 'estado':
+                resposta['resultado'] = self.cache.estado()
+            elif comando == 'limpar':
+                self.cache.limpar()
+                resposta['resultado'] = self.cache.estado()
+            elif comando is not None and comando != 'encerrar':
+                raise ValueError(f"Comando '{comando}' desconhecido.")
+            elif comando is None:
+                resposta['resultado'], resposta['cache'] = self.consultar(
+                    pedido['analise'], pedido.get('entrada'), pedido.get('parametros'))
+            resposta['ok'] = True
+        except Exception as e:
+            resposta['ok'] = False
+            resposta['erro'] = f"{type(e).__name__}: {e}"
+        resposta['ms'] = (time.perf_counter() - inicio) * 1000
+        return resposta
+
+    def atender_linhas(self, linhas, escrever):
+        """Laço do protocolo: uma linha JSON por pedido, `escrever(texto)` para cada resposta."""
+        for linha in linhas:
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+            except ValueError as e:
+                pedido, resposta = {}, {'id': None, 'ok': False, 'erro': f"JSON inválido: {e}"}
+            else:
+                resposta = self.atender(pedido)
+            escrever(json.dumps(resposta, ensure_ascii=False, default=_para_json) + '\n')
+            if pedido.get('comando') == 'encerrar':
+                return True
+        return False
+
+
+def _para_json(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return str(valor)
+
+
+def _servir_socket(servico, caminho):
+    import socketserver
+
+    class Atendente(socketserver.StreamRequestHandler):
+        def handle(self):
+            linhas = (linha.decode('utf-8') for linha in self.rfile)
+            if servico.atender_linhas(linhas, lambda texto: self.wfile.write(texto.encode('utf-8'))):
+                self.server.encerrar = True
+
+    if os.path.exists(caminho):
+        os.unlink(caminho)
+    # Um pedido por vez: o cache não é compartilhado entre threads
+    with socketserver.UnixStreamServer(caminho, Atendente) as servidor:
+        servidor.encerrar = False
+        try:
+            while not servidor.encerrar:
+                servidor.handle_request()
+        finally:
+            os.unlink(caminho)
+
+
+def main(argumentos=None):
+    leitor = argparse.ArgumentParser(description='Serviço de análises com cache em memória (JSON por linha).')
+    leitor.add_argument('--socket', help='atende num socket Unix em vez de stdin/stdout')
+    leitor.add_argument('--memoria', type=int, default=MEMORIA_MAXIMA, help='limite do cache em bytes')
+    opcoes = leitor.parse_args(argumentos)
+
+    servico = Servico(opcoes.memoria)
+    if opcoes.socket:
+        _servir_socket(servico, opcoes.socket)
+        return 0
+
+    def escrever(texto):
+        sys.stdout.write(texto)
+        sys.stdout.flush()
+
+    servico.atender_linhas(sys.stdin, escrever)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bootstrap import intervalo_bootstrap, iqr, media, mediana, pearson, posicoes_v_cramer, v_cramer  # noqa: E402
+
+
+def test_estatisticas_por_linha_iguais_ao_numpy():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(5, 40)), rng.normal(size=(5, 40))
+    np.testing.assert_allclose(media(x), x.mean(axis=1))
+    np.testing.assert_allclose(mediana(x), np.median(x, axis=1))
+    np.testing.assert_allclose(iqr(x), stats.iqr(x, axis=1))
+    np.testing.assert_allclose(pearson(x, y), [stats.pearsonr(a, b)[0] for a, b in zip(x, y)])
+
+
+def test_bca_da_media_proximo_do_scipy():
+    dados = np.random.default_rng(1).exponential(size=300)
+    nosso = intervalo_bootstrap(dados, media, reamostras=20_000, semente=0, processos=1)
+    referencia = stats.bootstrap((dados,), np.mean, n_resamples=20_000, method='BCa',
+                                 random_state=np.random.default_rng(0)).confidence_interval
+    assert nosso.estimativa == pytest.approx(dados.mean())
+    # Reamostras diferentes: os limites coincidem a menos do erro de Monte Carlo
+    assert nosso.inferior == pytest.approx(referencia.low, abs=0.1 * nosso.erro_padrao)
+    assert nosso.superior == pytest.approx(referencia.high, abs=0.1 * nosso.erro_padrao)
+
+
+def test_estatistica_indefinida_em_todas_as_reamostras_da_intervalo_nan():
+    # Um código de linha sem nenhuma observação: chi2 (e V) é NaN em todas as reamostras
+    posicoes = posicoes_v_cramer(np.array([1, 1, 2, 2]), np.array([1, 2, 1, 2]), [1, 2, 3], [1, 2])
+    intervalo = intervalo_bootstrap(posicoes, v_cramer([1, 2, 3], [1, 2]), reamostras=200, semente=0, processos=1)
+    assert np.isnan(intervalo.inferior) and np.isnan(intervalo.superior)
+    assert intervalo.reamostras == 0
+
+
+def _v_referencia(linhas, colunas, corrigido):
+    tabela = pd.crosstab(linhas, colunas).to_numpy()
+    n, (r, k) = tabela.sum(), tabela.shape
+    chi2 = stats.chi2_contingency(tabela, correction=False)[0]
+    if not corrigido:
+        return np.sqrt(chi2 / (n * (min(r, k) - 1)))
+    phi2 = max(0.0, chi2 / n - (r - 1) * (k - 1) / (n - 1))
+    return np.sqrt(phi2 / (min(r - (r - 1) ** 2 / (n - 1), k - (k - 1) ** 2 / (n - 1)) - 1))
+
+
+@pytest.mark.parametrize('corrigido', [False, True])
+def test_v_cramer_igual_ao_scipy(corrigido):
+    rng = np.random.default_rng(2)
+    linhas = rng.integers(1, 6, size=500)
+    colunas = np.where(rng.random(500) < 0.3, linhas, rng.integers(1, 6, size=500))
+    posicoes = posicoes_v_cramer(linhas, colunas, [1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
+    valor = v_cramer([1, 2, 3, 4, 5], [1, 2, 3, 4, 5], corrigido)(*(p[None, :] for p in posicoes))[0]
+    assert valor == pytest.approx(_v_referencia(linhas, colunas, corrigido))
+
+
+def test_v_corrigido_perto_da_independencia_fica_no_intervalo():
+    rng = np.random.default_rng(3)
+    linhas, colunas = rng.integers(1, 6, size=300), rng.integers(1, 6, size=300)
+    codigos = [1, 2, 3, 4, 5]
+    intervalo = intervalo_bootstrap(posicoes_v_cramer(linhas, colunas, codigos, codigos),
+                                    v_cramer(codigos, codigos, corrigido=True), reamostras=2_000,
+                                    metodo='percentil', semente=0, processos=1)
+    assert intervalo.inferior <= intervalo.estimativa <= intervalo.superior
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes import blocos_de_array, classes_de_array, classes_em_blocos, contar_classes  # noqa: E402
+
+
+def _contagens_pandas(dados, bins):
+    return pd.Series(pd.cut(dados, bins, right=False)).value_counts(sort=False).to_numpy()
+
+
+@pytest.mark.parametrize('regra', ['sturges', 'raiz', 'scott', 'freedman-diaconis'])
+def test_contagens_iguais_ao_pd_cut(regra):
+    dados = np.round(np.random.default_rng(1).normal(70, 12, size=2_000), 1)
+    bins, contagens, n = classes_de_array(dados, regra)
+    assert contagens.sum() == n == dados.size
+    np.testing.assert_array_equal(contagens, _contagens_pandas(dados, bins))
+
+
+def test_minimo_negativo_fica_na_primeira_classe():
+    bins, contagens, n = classes_de_array([-3.5, 0, 5, 1, 2])
+    assert bins[0] <= -3.5
+    assert contagens.sum() == n == 5
+
+
+def test_dados_entre_zero_e_um_usam_todas_as_classes():
+    dados = np.random.default_rng(2).random(1_000)
+    bins, contagens, _ = classes_de_array(dados, 'raiz')
+    assert len(contagens) >= 30
+    assert (contagens > 0).all()
+
+
+def test_valores_sobre_limites_decimais():
+    # 0.3 / 0.1 = 2.9999999999999996: o valor fica na classe [0.3, 0.4), como no pd.cut
+    dados = np.array([0.0, 0.1, 0.2, 0.3, 0.6, 0.7])
+    bins = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+    np.testing.assert_array_equal(contar_classes(dados, bins), _contagens_pandas(dados, bins))
+
+
+def test_em_blocos_igual_em_memoria():
+    dados = np.round(np.random.default_rng(3).gamma(2, 5, size=5_000), 2)
+    em_memoria = classes_de_array(dados)
+    em_blocos = classes_em_blocos(lambda: blocos_de_array(dados, 700))
+    assert em_memoria[0] == em_blocos[0]
+    np.testing.assert_array_equal(em_memoria[1], em_blocos[1])
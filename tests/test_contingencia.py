@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contingencia import TabelaContingencia, qui_quadrado, qui_quadrado_lote, qui_quadrado_por_grupo  # noqa: E402
+
+
+def _codigos(semente, n=1_000, linhas=4, colunas=3):
+    rng = np.random.default_rng(semente)
+    return rng.integers(1, linhas + 1, size=n), rng.integers(1, colunas + 1, size=n)
+
+
+def test_tabela_igual_ao_crosstab_com_codigos_fora_da_lista():
+    linhas, colunas = _codigos(0)
+    colunas[::7] = 9  # código fora da lista: ignorado, como ao filtrar antes do crosstab
+    tabela = TabelaContingencia.de_codigos(linhas, colunas, [4, 3, 2, 1], [1, 2, 3])
+    esperado = pd.crosstab(linhas[colunas != 9], colunas[colunas != 9]).loc[[4, 3, 2, 1], [1, 2, 3]]
+    np.testing.assert_array_equal(tabela.observadas, esperado.to_numpy())
+
+
+def test_soma_das_parciais_igual_ao_total():
+    linhas, colunas = _codigos(1)
+    codigos = ([1, 2, 3, 4], [1, 2, 3])
+    partes = [TabelaContingencia.de_codigos(parte_l, parte_c, *codigos) for parte_l, parte_c in zip(np.array_split(linhas, 3), np.array_split(colunas, 3))]
+    np.testing.assert_array_equal(sum(partes[1:], partes[0]).observadas,
+                                  TabelaContingencia.de_codigos(linhas, colunas, *codigos).observadas)
+
+
+@pytest.mark.parametrize('forma', [(2, 2), (4, 3)])
+@pytest.mark.parametrize('correcao', [True, False])
+def test_qui_quadrado_igual_ao_scipy(forma, correcao):
+    observadas = np.random.default_rng(2).integers(3, 40, size=forma)
+    nosso = qui_quadrado(observadas, correcao)
+    referencia = stats.chi2_contingency(observadas, correction=correcao)
+    assert nosso[0] == pytest.approx(referencia[0])
+    assert nosso[1] == pytest.approx(referencia[1])
+    assert nosso[2] == referencia[2]
+    np.testing.assert_allclose(nosso[3], referencia[3])
+
+
+def test_lote_igual_a_uma_chamada_por_tabela():
+    tabelas = np.random.default_rng(3).integers(0, 12, size=(50, 3, 4))
+    tabelas[0, 1] = 0  # linha zerada: NaN (o SciPy rejeita a tabela)
+    resultado = qui_quadrado_lote(tabelas)
+    assert np.isnan(resultado.estatistica[0]) and resultado.viola_regra[0]
+    for tabela, chi2, p, viola in zip(tabelas[1:], resultado.estatistica[1:], resultado.p_valor[1:], resultado.viola_regra[1:]):
+        referencia = stats.chi2_contingency(tabela)
+        assert (chi2, p) == pytest.approx(referencia[:2])
+        assert viola == (referencia[3] < 5).any()
+
+
+def test_por_grupo_igual_ao_scipy_em_cada_grupo():
+    linhas, colunas = _codigos(4, n=3_000)
+    df = pd.DataFrame({'grupo': np.random.default_rng(5).integers(0, 4, size=3_000), 'a': linhas, 'b': colunas})
+    resultado = qui_quadrado_por_grupo(df, 'grupo', 'a', 'b')
+    for grupo, parte in df.groupby('grupo'):
+        referencia = stats.chi2_contingency(pd.crosstab(parte['a'], parte['b']))
+        assert (resultado.loc[grupo, 'chi2'], resultado.loc[grupo, 'p_valor']) == pytest.approx(referencia[:2])
+        assert resultado.loc[grupo, 'n'] == len(parte)
+
+
+def test_codigo_com_parte_decimal_rejeitado():
+    with pytest.raises(ValueError):
+        TabelaContingencia.de_codigos(np.array([1.0, 1.5]), np.array([1.0, 2.0]), [1, 2], [1, 2])
@@ -0,0 +1,50 @@
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from correlacao import MatrizCorrelacao  # noqa: E402
+
+
+def _notas(semente=0, linhas=200):
+    rng = np.random.default_rng(semente)
+    base = rng.normal(size=linhas)
+    return pd.DataFrame({f'd{i}': base * i / 4 + rng.normal(size=linhas) for i in range(5)})
+
+
+@pytest.mark.parametrize('bloco', [None, 2])
+def test_r_e_p_iguais_ao_pandas_e_scipy(bloco):
+    df = _notas()
+    matriz = MatrizCorrelacao(df, bloco=bloco)
+    np.testing.assert_allclose(matriz.r, df.corr().to_numpy(), atol=1e-12)
+    for par in matriz.pares().itertuples(index=False):
+        r, p = stats.pearsonr(df[par.var_x], df[par.var_y])
+        assert par.r == pytest.approx(r, abs=1e-12)
+        assert par.p_valor == pytest.approx(p, rel=1e-9)
+
+
+def test_pares_completos_igual_ao_pandas():
+    df = _notas(1)
+    rng = np.random.default_rng(2)
+    df = df.mask(rng.random(df.shape) < 0.15)
+    matriz = MatrizCorrelacao(df, pares_completos=True, bloco=3)
+    np.testing.assert_allclose(matriz.r, df.corr().to_numpy(), atol=1e-12)
+    np.testing.assert_array_equal(matriz.n, df.notna().astype(int).T @ df.notna().astype(int))
+
+
+@pytest.mark.parametrize('pares_completos', [False, True])
+def test_coluna_constante_indefinida_sem_avisos(pares_completos):
+    df = _notas(3, 30).assign(constante=7.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        matriz = MatrizCorrelacao(df, pares_completos=pares_completos)
+        pares = matriz.pares()
+    np.testing.assert_array_equal(np.isnan(matriz.r), np.isnan(df.corr().to_numpy()))
+    constante = pares[(pares.var_y == 'constante')]
+    assert (constante.forca == 'Indefinida').all() and (constante.direcao == 'indefinida').all()
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from densidade import binarizar_linear, estimar_densidade, largura_banda  # noqa: E402
+
+
+def _bimodal(semente=0, n=2_000):
+    rng = np.random.default_rng(semente)
+    return np.concatenate([rng.normal(0, 1, n // 2), rng.normal(6, 0.5, n // 2)])
+
+
+def test_binning_conserva_peso_e_media():
+    dados = np.random.default_rng(1).uniform(2, 8, size=500)
+    pesos = binarizar_linear(dados, 0.0, 10.0, 101)
+    assert pesos.sum() == pytest.approx(dados.size)
+    assert (pesos * np.linspace(0, 10, 101)).sum() / dados.size == pytest.approx(dados.mean())
+
+
+@pytest.mark.parametrize('regra, metodo', [('scott', 'scott'), ('silverman', None)])
+def test_igual_ao_gaussian_kde(regra, metodo):
+    dados = _bimodal()
+    resultado = estimar_densidade(dados, banda=regra)
+    if metodo == 'scott':
+        assert resultado.banda == pytest.approx(stats.gaussian_kde(dados).factor * dados.std(ddof=1), rel=1e-2)
+    referencia = stats.gaussian_kde(dados, bw_method=resultado.banda / dados.std(ddof=1))(resultado.grade)
+    np.testing.assert_allclose(resultado.densidade, referencia, atol=1e-3 * referencia.max())
+    assert resultado.densidade.sum() * (resultado.grade[1] - resultado.grade[0]) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_isj_mais_estreita_que_scott_em_dados_bimodais():
+    dados = _bimodal(2)
+    assert largura_banda(dados, 'isj') < largura_banda(dados, 'scott')
+
+
+def test_erros():
+    with pytest.raises(ValueError):
+        estimar_densidade([1.0, 1.0, np.nan])
+    with pytest.raises(ValueError):
+        largura_banda([1.0, 2.0, 3.0], 'outra')
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frequencias import ContadorFrequencias  # noqa: E402
+
+
+def test_bloco_float_depois_de_bloco_inteiro():
+    # Blocos de pd.read_csv passam de int para float quando aparece um NaN
+    contador = ContadorFrequencias().atualizar([1, 2, 2, 3]).atualizar([2.0, 5.0, np.nan])
+    assert contador.total == 6
+    assert contador.contagens().to_dict() == {1: 1, 2: 3, 3: 1, 5: 1}
+
+
+def test_bloco_int8_sem_transbordar():
+    contador = ContadorFrequencias().atualizar(np.array([-100, 100, 100], dtype=np.int8))
+    assert contador.contagens().to_dict() == {-100: 1, 100: 2}
@@ -0,0 +1,60 @@
+import os
+import sys
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from influencia import influencia  # noqa: E402
+
+
+def _dados(semente=0, n=40):
+    rng = np.random.default_rng(semente)
+    x = rng.normal(50, 10, size=n)
+    y = 3 * x + rng.normal(0, 15, size=n)
+    x[0], y[0] = 95, 80  # ponto de alta alavancagem, longe da reta
+    return x, y
+
+
+def test_r_sem_cada_observacao_igual_ao_pearsonr_deixando_um_de_fora():
+    x, y = _dados()
+    tabela = influencia(x, y, ordenar=False)
+    r = stats.pearsonr(x, y)[0]
+    deixar_um = np.array([stats.pearsonr(np.delete(x, i), np.delete(y, i))[0] for i in range(x.size)])
+    np.testing.assert_allclose(tabela['r_sem'], deixar_um, atol=1e-12)
+    np.testing.assert_allclose(tabela['delta_r'], deixar_um - r, atol=1e-12)
+
+
+def test_alavancagem_e_cook_iguais_aos_da_regressao():
+    x, y = _dados(1)
+    tabela = influencia(x, y, ordenar=False)
+    # Referência direta: matriz chapéu e reajuste da reta sem cada observação
+    X = np.column_stack([np.ones_like(x), x])
+    chapeu = X @ np.linalg.solve(X.T @ X, X.T)
+    ajuste = chapeu @ y
+    s2 = ((y - ajuste) ** 2).sum() / (x.size - 2)
+    cook = []
+    for i in range(x.size):
+        coeficientes = np.polyfit(np.delete(x, i), np.delete(y, i), 1)
+        cook.append(((ajuste - np.polyval(coeficientes, x)) ** 2).sum() / (2 * s2))
+    np.testing.assert_allclose(tabela['alavancagem'], np.diag(chapeu), rtol=1e-10)
+    np.testing.assert_allclose(tabela['residuo'], y - ajuste, atol=1e-9)
+    np.testing.assert_allclose(tabela['cook'], cook, rtol=1e-8)
+
+
+def test_ponto_influente_ordenado_primeiro():
+    x, y = _dados(2)
+    tabela = influencia(x, y, rotulos=[f'p{i}' for i in range(x.size)])
+    assert tabela.index[0] == 'p0'
+    assert tabela['pontuacao'].is_monotonic_decreasing
+    assert tabela['pontuacao'].between(0, 3).all()
+
+
+def test_x_constante_indefinido_sem_avisos():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        tabela = influencia([2.0, 2.0, 2.0, 2.0], [1.0, 3.0, 2.0, 5.0], ordenar=False)
+    assert tabela['r_sem'].isna().all()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from momentos import Momentos  # noqa: E402
+
+
+def _comparar(valor, referencia):
+    if np.isnan(referencia):
+        assert np.isnan(valor)
+    else:
+        assert valor == pytest.approx(referencia, rel=1e-9, abs=1e-12)
+
+
+def test_igual_ao_pandas_em_blocos():
+    dados = np.random.default_rng(0).gamma(2.0, 3.0, size=10_001)
+    momentos = Momentos.de_blocos(np.array_split(dados, 7))
+    serie = pd.Series(dados)
+    _comparar(momentos.media, serie.mean())
+    _comparar(momentos.variancia(), serie.var())
+    _comparar(momentos.desvio_padrao(), serie.std())
+    _comparar(momentos.erro_padrao(), serie.sem())
+    _comparar(momentos.assimetria(), serie.skew())
+    _comparar(momentos.curtose(), serie.kurt())
+
+
+@pytest.mark.parametrize('dados', [[], [5.0], [1.0, 2.0], [1.0, 2.0, 4.0], [3.0] * 50, [2.0, 2.0, 2.0]])
+def test_amostras_curtas_e_constantes_como_o_pandas(dados):
+    # Sem ZeroDivisionError: NaN para n pequeno e 0 para dados constantes, como no pandas
+    momentos = Momentos.de_array(np.array(dados, dtype=np.float64))
+    serie = pd.Series(dados, dtype=np.float64)
+    _comparar(momentos.variancia(), serie.var())
+    _comparar(momentos.assimetria(), serie.skew())
+    _comparar(momentos.curtose(), serie.kurt())
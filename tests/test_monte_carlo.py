@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monte_carlo import qui_quadrado_monte_carlo, simular_tabelas  # noqa: E402
+
+
+def test_tabelas_simuladas_mantem_as_margens():
+    tabelas = simular_tabelas([5, 0, 12, 8], [10, 7, 8], 500, np.random.default_rng(0))
+    assert (tabelas >= 0).all()
+    np.testing.assert_array_equal(tabelas.sum(axis=2), np.tile([5, 0, 12, 8], (500, 1)))
+    np.testing.assert_array_equal(tabelas.sum(axis=1), np.tile([10, 7, 8], (500, 1)))
+
+
+def test_media_das_celulas_igual_as_esperadas():
+    linhas, colunas = np.array([30, 50, 20]), np.array([60, 40])
+    tabelas = simular_tabelas(linhas, colunas, 20_000, np.random.default_rng(1))
+    np.testing.assert_allclose(tabelas.mean(axis=0), np.outer(linhas, colunas) / 100, rtol=0.02)
+
+
+@pytest.mark.parametrize('observadas, correcao', [
+    ([[12, 5], [7, 15]], True),
+    ([[12, 5], [7, 15]], False),
+    ([[20, 15, 30], [25, 30, 18], [10, 22, 19]], True),
+])
+def test_estatistica_do_scipy_e_p_proximo_do_assintotico(observadas, correcao):
+    resultado = qui_quadrado_monte_carlo(observadas, replicas=20_000, semente=0, processos=1, correcao=correcao)
+    chi2, p_valor = stats.chi2_contingency(observadas, correction=correcao)[:2]
+    assert resultado.estatistica == pytest.approx(chi2)
+    # Esperadas grandes: o p de Monte Carlo fica perto do assintótico
+    assert resultado.p_valor == pytest.approx(p_valor, abs=4 * resultado.erro_padrao + 0.01)
+
+
+def test_resultado_nao_depende_do_numero_de_processos():
+    observadas = [[3, 1, 0], [1, 4, 2], [0, 2, 6]]
+    serie = qui_quadrado_monte_carlo(observadas, replicas=120_000, semente=3, processos=1)
+    paralelo = qui_quadrado_monte_carlo(observadas, replicas=120_000, semente=3, processos=2)
+    assert serie == paralelo
+
+
+def test_replicas_invalidas():
+    with pytest.raises(ValueError):
+        qui_quadrado_monte_carlo([[1, 2], [3, 4]], replicas=0)
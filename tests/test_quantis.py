@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantis import Quantis, SketchQuantis  # noqa: E402
+
+PROBABILIDADES = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32, np.int64])
+def test_igual_ao_series_quantile(dtype):
+    # Decimais curtos, como numa planilha: float32 volta ao decimal original (ver compacto.py)
+    dados = np.round(np.random.default_rng(0).gamma(2, 10, size=1_001), 2)
+    referencia = dados.astype(np.int64) if dtype is np.int64 else dados
+    esperado = pd.Series(referencia).quantile(PROBABILIDADES).to_numpy()
+    np.testing.assert_allclose(Quantis(dados.astype(dtype)).quantil(PROBABILIDADES), esperado, rtol=1e-12)
+
+
+def test_nan_ignorado_e_por_coluna_como_o_pandas():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(50, 3))).mask(rng.random((50, 3)) < 0.2)
+    np.testing.assert_allclose(Quantis(df.to_numpy()).quantil(PROBABILIDADES), df.quantile(PROBABILIDADES).to_numpy())
+    np.testing.assert_allclose(Quantis(df[0].to_numpy()).quantil(0.3), df[0].quantile(0.3))
+
+
+def test_cercas_de_tukey():
+    dados = np.random.default_rng(2).normal(size=300)
+    q1, q3, iqr, inferior, superior = Quantis(dados).cercas()
+    serie = pd.Series(dados)
+    assert (q1, q3) == pytest.approx((serie.quantile(0.25), serie.quantile(0.75)))
+    assert (inferior, superior) == pytest.approx((q1 - 1.5 * iqr, q3 + 1.5 * iqr))
+
+
+def test_vazio_da_nan():
+    assert np.isnan(Quantis([]).mediana())
+    assert np.isnan(SketchQuantis().mediana())
+
+
+def test_sketch_dentro_do_erro_de_posto():
+    dados = np.random.default_rng(3).normal(size=100_000)
+    sketch = SketchQuantis(k=200, semente=0)
+    for bloco in np.array_split(dados, 20):
+        sketch.atualizar(bloco)
+    postos = np.searchsorted(np.sort(dados), sketch.quantil(PROBABILIDADES[1:-1])) / dados.size
+    np.testing.assert_allclose(postos, PROBABILIDADES[1:-1], atol=0.02)
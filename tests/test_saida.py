@@ -0,0 +1,37 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saida import escrever_tabela, fixo, inteiro, percentual  # noqa: E402
+
+
+@pytest.mark.parametrize('casas', [0, 1, 2, 4])
+def test_fixo_igual_ao_format(casas):
+    rng = np.random.default_rng(casas)
+    valores = np.concatenate([
+        rng.normal(0, 1_000, size=2_000),
+        np.round(rng.uniform(-10, 10, size=2_000), casas + 1),  # muitos valores terminados em 5
+        [0.0, -0.0, -0.001, 0.5, 1.5, 2.5, 1.05, 2.675, 1e15, -3e17],
+    ])
+    esperado = [f'{v:.{casas}f}' for v in valores]
+    assert fixo(valores, casas).tolist() == esperado
+
+
+def test_fixo_escalar_nan_e_sufixo():
+    assert fixo(2.675, 2) == '2.67'
+    assert fixo([1.0, np.nan, np.inf], 1, sufixo=' s', vazio='---').tolist() == ['1.0 s', '---', '---']
+    assert percentual([0.1333, np.nan]).tolist() == ['13.33%', '']
+    assert inteiro([0, -12, 3_000_000]).tolist() == ['0', '-12', '3000000']
+
+
+def test_csv_igual_ao_pandas():
+    tabela = pd.DataFrame({'a': [1.5, 2.25, np.nan], 'b': [1, 2, 3]}, index=pd.Index(['x', 'y', 'z'], name='id'))
+    destino = io.StringIO()
+    escrever_tabela(tabela, destino, formato='csv', tamanho_bloco=2)
+    pd.testing.assert_frame_equal(pd.read_csv(io.StringIO(destino.getvalue()), index_col='id'), tabela)